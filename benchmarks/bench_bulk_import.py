@@ -0,0 +1,58 @@
+"""Benchmark: add_items_bulk() vs. one add_item() call per row.
+
+Usage:
+    python benchmarks/bench_bulk_import.py [--rows N] [--single-rows N]
+"""
+import argparse
+import time
+
+from common import temp_database, print_table
+from database import models
+
+
+def catalog(count):
+    """Generate synthetic catalog rows"""
+    for n in range(count):
+        yield (f"SKU {n:06d}", f"Category {n % 40}", n % 500, round(1 + (n % 97) * 0.25, 2))
+
+
+def run_single(count):
+    """Insert rows one add_item() call at a time; returns rows/sec"""
+    with temp_database():
+        for n in range(40):
+            models.add_category(f"Category {n}")
+        category_ids = {c[1]: c[0] for c in models.get_categories()}
+        start = time.perf_counter()
+        for name, category, quantity, cost_price in catalog(count):
+            models.add_item(name, category_ids[category], quantity, cost_price)
+        return count / (time.perf_counter() - start)
+
+
+def run_bulk(count):
+    """Insert rows through add_items_bulk(); returns rows/sec"""
+    with temp_database():
+        return models.add_items_bulk(catalog(count), create_categories=True)['rows_per_sec']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--single-rows', type=int, default=5000,
+                        help="Rows for the per-call path, which is much slower")
+    args = parser.parse_args()
+
+    single = run_single(args.single_rows)
+    bulk = run_bulk(args.rows)
+    print_table(
+        "Catalog import throughput",
+        ["path", "rows", "rows/sec"],
+        [
+            ["add_item() per row", f"{args.single_rows:,}", f"{single:,.0f}"],
+            ["add_items_bulk()", f"{args.rows:,}", f"{bulk:,.0f}"],
+        ],
+    )
+    print(f"\nSpeedup: {bulk / single:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: columnar report export vs. CSV, file size and write/read time.
+
+Parquet is included when pyarrow is installed.
+
+Usage:
+    python benchmarks/bench_columnar_export.py [--rows 500000]
+"""
+import argparse
+import csv
+import gzip
+import os
+import tempfile
+import time
+
+from common import temp_database, print_table
+from bench_export import seed
+from database import models
+from database.export_helpers import export_to_csv, export_to_columnar, read_columnar, have_pyarrow
+
+
+def read_csv(path):
+    """Parse a CSV export, converting the numeric columns as a loader would"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) == 6 and row[0].isdigit():
+                int(row[0]), int(row[4])
+
+
+def read_columns(path):
+    """Read every row group of a columnar export"""
+    for _ in read_columnar(path)[1]:
+        pass
+
+
+def timed(func):
+    """Return the milliseconds one call of func takes"""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    args = parser.parse_args()
+
+    formats = [
+        ("csv", "report.csv", export_to_csv, read_csv),
+        ("csv.gz", "report.csv.gz", export_to_csv, read_csv),
+        ("ndjson.gz columnar", "report.ndjson.gz", export_to_columnar, read_columns),
+    ]
+    if have_pyarrow():
+        formats.append(("parquet", "report.parquet", export_to_columnar, read_columns))
+
+    out_dir = tempfile.mkdtemp()
+    results = []
+    with temp_database():
+        seed(args.rows)
+        for name, filename, export, read in formats:
+            path = os.path.join(out_dir, filename)
+            write_ms = timed(lambda: export(models.generate_transaction_report(stream=True), path))
+            read_ms = timed(lambda: read(path))
+            results.append([name, f"{os.path.getsize(path) / 2**20:.1f}", f"{write_ms:.0f}", f"{read_ms:.0f}"])
+            os.unlink(path)
+    os.rmdir(out_dir)
+
+    print_table(
+        f"Transaction report export ({args.rows:,} rows)",
+        ["format", "file MiB", "write ms", "read ms"],
+        results,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark: pooled connections vs. a fresh sqlite3.connect per call.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [--ops N] [--items N]
+"""
+import argparse
+
+from common import temp_database, measure, print_table
+import config
+from database import models
+from database.connection import close_pool
+
+
+def run(pool_size, ops, items):
+    """Measure get_items() and add_transaction() with the given pool size"""
+    config.DB_POOL_SIZE = pool_size
+    close_pool()
+    with temp_database():
+        models.add_category("Bench", "Benchmark category")
+        category_id = models.get_categories()[0][0]
+        for n in range(items):
+            models.add_item(f"Item {n:05d}", category_id, 1000000, 1.0)
+        item_id = models.get_items()[0][0]
+
+        _, read_ops = measure(models.get_items, ops)
+        _, write_ops = measure(
+            lambda: models.add_transaction(item_id, config.TRANSACTION_TYPE_OUT, 1, "2026-01-01"), ops
+        )
+    return read_ops, write_ops
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ops', type=int, default=2000)
+    parser.add_argument('--items', type=int, default=50)
+    args = parser.parse_args()
+
+    original_size = config.DB_POOL_SIZE
+    try:
+        before = run(0, args.ops, args.items)
+        after = run(original_size, args.ops, args.items)
+    finally:
+        config.DB_POOL_SIZE = original_size
+
+    print_table(
+        f"Connection pool ({args.ops} ops, {args.items} items)",
+        ["operation", "per-call connect ops/s", "pooled ops/s", "speedup"],
+        [
+            ["get_items()", f"{before[0]:.0f}", f"{after[0]:.0f}", f"{after[0] / before[0]:.2f}x"],
+            ["add_transaction()", f"{before[1]:.0f}", f"{after[1]:.0f}", f"{after[1] / before[1]:.2f}x"],
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
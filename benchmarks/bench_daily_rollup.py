@@ -0,0 +1,89 @@
+"""Benchmark: sales report from the daily rollup vs. aggregating raw transactions.
+
+Usage:
+    python benchmarks/bench_daily_rollup.py [--rows 5000000] [--items 1000] [--days 730]
+"""
+import argparse
+import random
+import time
+
+from common import temp_database, print_table
+from database import models
+from database.connection import connection
+from database.models import reports
+
+
+RAW_SALES_QUERY = '''
+    SELECT i.name, SUM(t.quantity) as total_sold,
+           SUM(t.quantity * COALESCE(t.selling_price, 0.0)) as total_revenue
+    FROM transactions t
+    LEFT JOIN inventory i ON t.item_id = i.id
+    WHERE t.transaction_type = 'OUT' AND t.date >= ? AND t.date <= ?
+    GROUP BY i.id, i.name ORDER BY total_revenue DESC
+'''
+
+
+def day(number):
+    """ISO date of the numbered day from 2024-01-01"""
+    return time.strftime("%Y-%m-%d", time.gmtime(1704067200 + number * 86400))
+
+
+def seed(rows, items, days):
+    """Insert a synthetic history and roll it up; returns the rollup seconds"""
+    models.add_items_bulk((f"SKU {n:05d}", None, 0, 1.0) for n in range(items))
+    rng = random.Random(42)
+    with connection() as conn:
+        conn.executemany(
+            "INSERT INTO transactions (item_id, transaction_type, quantity, date, selling_price) VALUES (?, ?, ?, ?, ?)",
+            ((rng.randint(1, items), 'OUT' if rng.random() < 0.8 else 'IN', rng.randint(1, 5),
+              day(n * days // rows), 2.5) for n in range(rows)),
+        )
+    start = time.perf_counter()
+    models.rebuild_daily_rollup()
+    return time.perf_counter() - start
+
+
+def timed(query, params, repeat):
+    """Average milliseconds per run of a query"""
+    with connection() as conn:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(query, params).fetchall()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000000)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with temp_database():
+        rebuild = seed(args.rows, args.items, args.days)
+
+        last = args.days - 1
+        ranges = [
+            ("last day", day(last), day(last)),
+            ("last 30 days", day(last - 29), day(last)),
+            ("last year", day(last - 364), day(last)),
+            ("everything", day(0), day(last)),
+            ("year, partial edges", day(last - 364) + " 12:00", day(last) + " 12:00"),
+        ]
+        rows = []
+        for label, start_date, end_date in ranges:
+            raw = timed(RAW_SALES_QUERY, [start_date, end_date], args.repeat)
+            rollup = timed(*reports._sales_report_query(start_date, end_date), args.repeat)
+            rows.append([label, f"{raw:.1f}", f"{rollup:.1f}", f"{raw / rollup:.0f}x"])
+
+    print_table(
+        f"Sales report ({args.rows:,} movements, {args.items:,} items, {args.days} days)",
+        ["range", "raw ms", "rollup ms", "speedup"],
+        rows,
+    )
+    print(f"\nFull rollup rebuild: {rebuild:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: streamed CSV export of the transaction report vs. exporting a fully loaded report.
+
+Usage:
+    python benchmarks/bench_export.py [--rows 500000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from common import temp_database, print_table
+from database import models
+from database.connection import connection
+from database.export_helpers import export_to_csv
+
+
+def seed(rows):
+    """Insert rows movements for one item, spread over a year"""
+    models.add_items_bulk([("Widget", None, 0, 1.0)])
+    with connection() as conn:
+        conn.executemany(
+            "INSERT INTO transactions (item_id, transaction_type, quantity, date, notes) VALUES (1, 'IN', 1, ?, ?)",
+            ((f"2026-{n % 12 + 1:02d}-{n % 28 + 1:02d}", f"delivery {n}") for n in range(rows)),
+        )
+
+
+def profile(func):
+    """Return (milliseconds, peak MiB) of func; tracing is kept out of the timing"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    args = parser.parse_args()
+
+    out_dir = tempfile.mkdtemp()
+    results = []
+    with temp_database():
+        seed(args.rows)
+        for name, stream, filename in [
+            ("loaded list", False, "report.csv"),
+            ("stream", True, "report.csv"),
+            ("stream + gzip", True, "report.csv.gz"),
+        ]:
+            path = os.path.join(out_dir, filename)
+            ms, mib = profile(lambda: export_to_csv(models.generate_transaction_report(stream=stream), path))
+            results.append([name, f"{ms:.0f}", f"{mib:.1f}", f"{os.path.getsize(path) / 2**20:.1f}"])
+            os.unlink(path)
+    os.rmdir(out_dir)
+
+    print_table(
+        f"Transaction report CSV export ({args.rows:,} rows)",
+        ["approach", "ms", "peak MiB", "file MiB"],
+        results,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Benchmark: cost of query timing on full listings and point lookups.
+
+Usage:
+    python benchmarks/bench_instrumentation.py [--items 5000] [--repeat 2000]
+"""
+import argparse
+
+from common import temp_database, measure, print_table
+import config
+from database import models
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    original = config.DB_INSTRUMENT
+    rows = []
+    with temp_database():
+        models.add_items_bulk((f"Item {n:06d}", None, n % 50, 1.0) for n in range(args.items))
+        models.view_items()  # warm the page cache
+
+        for name, func, repeat in [
+            ("view_items()", models.view_items, max(1, args.repeat // 20)),
+            ("get_item_by_id()", lambda: models.get_item_by_id(args.items // 2), args.repeat),
+        ]:
+            timings = []
+            for instrument in (False, True):
+                config.DB_INSTRUMENT = instrument
+                func()  # open the pool's connection for this setting
+                seconds, _ = measure(func, repeat)
+                timings.append(seconds / repeat * 1e6)
+            rows.append([name, f"{timings[0]:.1f}", f"{timings[1]:.1f}",
+                         f"{(timings[1] / timings[0] - 1) * 100:+.1f}%"])
+        config.DB_INSTRUMENT = original
+
+    print_table(
+        f"Query timing overhead ({args.items:,} items)",
+        ["call", "off µs/call", "on µs/call", "overhead"],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: SQL-aggregated inventory report vs. aggregating the full listing in Python.
+
+Usage:
+    python benchmarks/bench_inventory_report.py [--items 200000] [--categories 50]
+"""
+import argparse
+import time
+import tracemalloc
+
+from common import temp_database, print_table
+import config
+from database import models
+from database.connection import connection
+from database.models.reports import _inventory_report_query
+
+
+def seed(items, categories):
+    """Insert items spread over categories, a tenth of them low on stock"""
+    for n in range(categories):
+        models.add_category(f"Category {n:03d}")
+    models.add_items_bulk(
+        (f"Item {n:07d}", f"Category {n % categories:03d}", n % 100, 1.0 + n % 7)
+        for n in range(items)
+    )
+
+
+def python_report():
+    """Load every row and aggregate in Python, as the report used to"""
+    with connection() as conn:
+        items = conn.execute(*_inventory_report_query()).fetchall()
+    categories = {}
+    low_stock = []
+    for item in items:
+        category = item[-2] or "Uncategorized"
+        count, value = categories.get(category, (0, 0))
+        categories[category] = (count + 1, value + item[5] * item[3])
+        if item[3] < config.LOW_STOCK_THRESHOLD:
+            low_stock.append(item)
+    return {'items': items, 'categories': categories, 'low_stock': low_stock}
+
+
+def profile(func):
+    """Return (milliseconds, peak MiB) of func; tracing is kept out of the timing"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=200000)
+    parser.add_argument('--categories', type=int, default=50)
+    args = parser.parse_args()
+
+    def stream_all():
+        report = models.generate_inventory_report()
+        for _ in report['items']:
+            pass
+
+    with temp_database():
+        seed(args.items, args.categories)
+        python_report()  # warm the page cache
+        rows = [
+            ["python aggregate", *profile(python_report)],
+            ["sql aggregate", *profile(models.generate_inventory_report)],
+            ["sql + stream items", *profile(stream_all)],
+        ]
+
+    print_table(
+        f"Inventory report ({args.items:,} items, {args.categories} categories)",
+        ["approach", "ms", "peak MiB"],
+        [[name, f"{ms:.0f}", f"{mib:.1f}"] for name, ms, mib in rows],
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: get_next_available_id() at 10k/100k/1M rows.
+
+Compares the original list-scan allocator, the single gap query used for
+untracked tables, and the free_ids lookup. The only gap sits near the end of
+the table, which is the worst case for the scanning approaches. The list scan
+is O(n^2) and is skipped above --legacy-limit rows.
+
+Usage:
+    python benchmarks/bench_next_id.py [--sizes 10000 100000 1000000] [--legacy-limit N]
+"""
+import argparse
+import time
+
+from common import temp_database, print_table
+from database.connection import connection, get_next_available_id
+
+
+def legacy_next_id(table_name):
+    """The original implementation: load every id, then scan a list"""
+    with connection() as conn:
+        existing_ids = [row[0] for row in conn.execute(f'SELECT id FROM {table_name} ORDER BY id')]
+    next_id = 1
+    while next_id in existing_ids:
+        next_id += 1
+    return next_id
+
+
+def timed(func, *args):
+    """Return (result, milliseconds) for one call"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(size, legacy_limit):
+    """Time each allocator on a table of the given size"""
+    with temp_database():
+        with connection() as conn:
+            conn.execute('CREATE TABLE untracked (id INTEGER PRIMARY KEY, name TEXT)')
+            rows = ((n, f"Item {n}") for n in range(1, size + 1))
+            conn.executemany('INSERT INTO inventory (id, name) VALUES (?, ?)', rows)
+            conn.execute('INSERT INTO untracked SELECT id, name FROM inventory')
+            conn.execute('DELETE FROM inventory WHERE id = ?', (size - 1,))
+            conn.execute('DELETE FROM untracked WHERE id = ?', (size - 1,))
+
+        expected = size - 1
+        free_list, free_ms = timed(get_next_available_id, 'inventory')
+        gap_query, gap_ms = timed(get_next_available_id, 'untracked')
+        assert free_list == gap_query == expected
+
+        legacy_ms = None
+        if size <= legacy_limit:
+            legacy, legacy_ms = timed(legacy_next_id, 'untracked')
+            assert legacy == expected
+    return legacy_ms, gap_ms, free_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--legacy-limit', type=int, default=20000)
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        legacy_ms, gap_ms, free_ms = run(size, args.legacy_limit)
+        rows.append([
+            f"{size:,}",
+            f"{legacy_ms:.2f}" if legacy_ms is not None else "skipped",
+            f"{gap_ms:.2f}",
+            f"{free_ms:.3f}",
+        ])
+
+    print_table(
+        "Next available id allocation",
+        ["rows", "list scan ms", "gap query ms", "free_ids ms"],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark: profit & loss report with and without the closed-period cache.
+
+Usage:
+    python benchmarks/bench_profit_loss.py [--rows 1000000] [--items 1000] [--days 730]
+"""
+import argparse
+import time
+
+from common import temp_database, print_table
+from database import models
+from database.connection import connection
+from database.models import reports
+from bench_daily_rollup import seed, day
+
+
+def timed_report(start_date, end_date, clear_cache):
+    """Milliseconds for one report, optionally from an empty cache"""
+    if clear_cache:
+        with connection() as conn:
+            reports._invalidate_profit_loss(conn.cursor())
+    start = time.perf_counter()
+    models.generate_profit_loss_report(start_date, end_date)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=730)
+    args = parser.parse_args()
+
+    with temp_database():
+        seed(args.rows, args.items, args.days)
+        # Every seeded month is closed relative to today
+        last = args.days - 1
+        ranges = [
+            ("one month", day(last - 30), day(last)),
+            ("one year", day(last - 364), day(last)),
+            ("everything", day(0), day(last)),
+        ]
+        rows = []
+        for label, start_date, end_date in ranges:
+            cold = timed_report(start_date, end_date, clear_cache=True)
+            warm = timed_report(start_date, end_date, clear_cache=False)
+            rows.append([label, f"{cold:.1f}", f"{warm:.1f}", f"{cold / warm:.0f}x"])
+
+    print_table(
+        f"Profit & loss report ({args.rows:,} movements, {args.items:,} items, {args.days} days)",
+        ["range", "cold ms (fills cache)", "cached ms", "speedup"],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark: month-end reports one after another vs. generate_reports_batch() on threads and processes.
+
+Usage:
+    python benchmarks/bench_report_batch.py [--rows 500000] [--items 100000]
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+from common import temp_database, print_table
+from bench_export import seed
+from database import models
+from database.models.reports import BATCH_REPORTS, _run_batch_report
+
+
+def sequential(output_dir):
+    """Run every report in turn, as the Reports tab does"""
+    return {'reports': [_run_batch_report(name, None, None, output_dir, 'csv') for name in BATCH_REPORTS]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--workers', type=int, help="pool size (default: one per report, up to the CPU count)")
+    args = parser.parse_args()
+
+    results = []
+    with temp_database():
+        seed(args.rows)
+        models.add_items_bulk((f"Item {n:07d}", None, n % 100, 1.0) for n in range(args.items))
+
+        for name, run in [
+            ("sequential", sequential),
+            ("threads", lambda out: models.generate_reports_batch(output_dir=out, workers=args.workers, use_threads=True)),
+            ("processes", lambda out: models.generate_reports_batch(output_dir=out, workers=args.workers)),
+        ]:
+            output_dir = tempfile.mkdtemp()
+            start = time.perf_counter()
+            batch = run(output_dir)
+            wall = time.perf_counter() - start
+            shutil.rmtree(output_dir)
+            per_report = "  ".join(f"{r['report']} {r['seconds']:.2f}" for r in batch['reports'])
+            results.append([name, f"{wall:.2f}", per_report])
+
+    print_table(
+        f"Five reports with exports ({args.rows:,} movements, {args.items:,} items)",
+        ["mode", "wall s", "per report s"],
+        results,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark: full-text search of the transaction history vs. a LIKE scan.
+
+Fills a database with items and movements with notes, then times
+models.search() over the 'transactions' scope against the LIKE query a
+substring search of the whole history would need. Also times posting
+movements with and without the search triggers, which is what keeping the
+index current costs.
+
+Usage:
+    python benchmarks/bench_search.py [--items 20000] [--transactions 500000] [--limit 1000]
+"""
+import argparse
+import random
+import time
+
+from common import temp_database, print_table
+import config
+from database import models
+
+ADJECTIVES = ["red", "blue", "green", "steel", "brass", "large", "small", "heavy", "light", "round"]
+NOUNS = ["bolt", "nut", "screw", "washer", "bracket", "hinge", "pipe", "valve", "cable", "clamp"]
+NOTES = ["damaged", "returned", "recount", "supplier", "delivery", "late", "invoice", "order", "box",
+         "pallet", "customer", "refund", "shelf", "warehouse", "urgent", "sample", "promo", "repair"]
+
+# Prefixes as typed, then narrower and wider multi-word queries
+QUERIES = ["da", "dam", "damaged", "damaged pal", "steel", "steel bolt", "bolt urgent", "k12", "zzz"]
+
+SCAN = '''
+    SELECT t.*, i.name AS item_name
+    FROM transactions t LEFT JOIN inventory i ON t.item_id = i.id
+    WHERE t.notes LIKE ? OR i.name LIKE ?
+    ORDER BY t.date DESC, t.id DESC
+    LIMIT ?
+'''
+
+
+def fill(items, transactions, seed=1):
+    """Create items and post movements with notes in batches"""
+    generator = random.Random(seed)
+    models.add_items_bulk(
+        (f"{generator.choice(ADJECTIVES)} {generator.choice(NOUNS)} "
+         f"{generator.choice('ABCDEFGHJK')}{generator.randint(1, 999)}", None, 10 ** 9, 1.0)
+        for _ in range(items))
+    item_ids = [item[0] for item in models.get_items()]
+    for start in range(0, transactions, config.BULK_CHUNK_SIZE):
+        models.add_transactions_batch([movement(generator, item_ids)
+                                       for _ in range(min(config.BULK_CHUNK_SIZE, transactions - start))])
+    return item_ids
+
+
+def movement(generator, item_ids):
+    """One movement; about half have notes"""
+    notes = " ".join(generator.sample(NOTES, 3)) if generator.random() < 0.5 else None
+    return (generator.choice(item_ids), config.TRANSACTION_TYPE_IN, 1,
+            f"2026-{generator.randint(1, 12):02d}-{generator.randint(1, 28):02d}", notes, None)
+
+
+def best_of(func, repeat):
+    """Best wall time of func in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def posting_rate(item_ids, lines, seed):
+    """Movements posted per second with add_transactions_batch()"""
+    generator = random.Random(seed)
+    movements = [movement(generator, item_ids) for _ in range(lines)]
+    start = time.perf_counter()
+    models.add_transactions_batch(movements)
+    return lines / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=20000)
+    parser.add_argument('--transactions', type=int, default=500000)
+    parser.add_argument('--limit', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with temp_database():
+        start = time.perf_counter()
+        item_ids = fill(args.items, args.transactions)
+        fill_seconds = time.perf_counter() - start
+
+        results = []
+        with models.connection() as conn:
+            for query in QUERIES:
+                pattern = f"%{query}%"
+                found = models.search(query, 'transactions', args.limit + 1)
+                results.append([
+                    repr(query),
+                    f"{min(len(found), args.limit):,}{'+' if len(found) > args.limit else ''}",
+                    f"{best_of(lambda: conn.execute(SCAN, (pattern, pattern, args.limit)).fetchall(), args.repeat):.1f}",
+                    f"{best_of(lambda: models.search(query, 'transactions', args.limit), args.repeat):.1f}",
+                ])
+        print_table(
+            f"Search {args.transactions:,} transactions, first {args.limit:,} matches "
+            f"(filled in {fill_seconds:.1f}s)",
+            ["query", "matches", "LIKE scan ms", "search() ms"],
+            results,
+        )
+
+        with_triggers = posting_rate(item_ids, config.BULK_CHUNK_SIZE, 2)
+        with models.connection() as conn:
+            for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%fts%'"
+                                        ).fetchall():
+                conn.execute(f"DROP TRIGGER {name}")
+        without_triggers = posting_rate(item_ids, config.BULK_CHUNK_SIZE, 2)
+        print_table(
+            f"Posting {config.BULK_CHUNK_SIZE:,} movements with add_transactions_batch()",
+            ["search triggers", "movements/sec"],
+            [["on", f"{with_triggers:,.0f}"], ["off", f"{without_triggers:,.0f}"]],
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: search-as-you-type over the inventory, substring scan vs. word-prefix index.
+
+The scan is what the tabs' _on_search_change handlers used to do: test the
+search term against every field of every row. The index is built once (as
+InventoryTab.refresh_inventory does on a worker thread) and then answers
+each query from its sorted vocabulary, returning the first --limit rows.
+Rows are generated in memory, so no database is involved.
+
+Usage:
+    python benchmarks/bench_search_index.py [--rows 200000] [--limit 1000] [--repeat 5]
+"""
+import argparse
+import random
+import time
+
+from common import print_table
+from utils.search_index import SearchIndex
+
+ADJECTIVES = ["red", "blue", "green", "steel", "brass", "large", "small", "heavy", "light", "round",
+              "flat", "long", "short", "wide", "narrow", "black", "white", "copper", "plastic", "rubber"]
+NOUNS = ["bolt", "nut", "screw", "washer", "bracket", "hinge", "pipe", "valve", "cable", "clamp",
+         "spring", "gear", "bearing", "seal", "filter", "hose", "panel", "switch", "relay", "fuse"]
+CATEGORIES = ["Hardware", "Plumbing", "Electrical", "Tools", "Fasteners", "Safety", "Garden", "Paint"]
+
+# Prefixes as typed, then narrower and wider multi-word queries
+QUERIES = ["s", "st", "steel", "steel b", "steel bolt", "steel bolt k12", "hardware bolt",
+           "red blue gear", "12345", "zzz"]
+
+
+def make_rows(count, seed=1):
+    """Display rows shaped like InventoryTab's: [id, name, category, quantity, cost price]"""
+    generator = random.Random(seed)
+    return [[n,
+             f"{generator.choice(ADJECTIVES)} {generator.choice(ADJECTIVES)} {generator.choice(NOUNS)} "
+             f"{generator.choice('ABCDEFGHJK')}{generator.randint(1, 999)}",
+             generator.choice(CATEGORIES), str(n % 100), 1.0]
+            for n in range(1, count + 1)]
+
+
+def scan(rows, term, limit):
+    """The old handlers' substring test over every row"""
+    term = term.lower()
+    matches = [row for row in rows
+               if term in str(row[1]).lower() or term in str(row[2]).lower() or term in str(row[0])]
+    return matches[:limit]
+
+
+def best_of(func, repeat):
+    """Best wall time of func in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--limit', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    start = time.perf_counter()
+    index = SearchIndex(fields=lambda row: (row[1], row[2]), order=lambda row: (row[1], row[0]), rows=rows)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    index.add([args.rows + 1, "green brass hinge Z1", "Hardware", "1", 1.0])
+    index.remove(args.rows + 1)
+    edit_ms = (time.perf_counter() - start) * 1000
+
+    results = []
+    for query in QUERIES:
+        found, more = index.search(query, limit=args.limit)
+        results.append([
+            repr(query),
+            f"{len(found):,}{'+' if more else ''}",
+            f"{best_of(lambda: scan(rows, query, args.limit), args.repeat):.1f}",
+            f"{best_of(lambda: index.search(query, limit=args.limit), args.repeat):.2f}",
+        ])
+
+    print_table(
+        f"Search {args.rows:,} rows, first {args.limit:,} matches "
+        f"(index built in {build_ms:,.0f} ms, one add + remove {edit_ms:.2f} ms)",
+        ["query", "index matches", "scan ms", "index ms"],
+        results,
+    )
+
+
+if __name__ == '__main__':
+    main()
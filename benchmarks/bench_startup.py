@@ -0,0 +1,74 @@
+"""Benchmark: cold and warm init_database() with the migration engine.
+
+The legacy path re-runs every create_* helper and schema upgrade on each
+start with a fresh connection per call, as main.init_database() used to.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N]
+"""
+import argparse
+import statistics
+import time
+
+from common import temp_database, print_table
+import config
+from database import models
+from database.connection import close_pool
+
+
+def legacy_init():
+    """The pre-migration startup sequence"""
+    models.init_db()
+    models.create_categories_table()
+    models.create_suppliers_table()
+    models.create_transactions_table()
+    models.create_users_table()
+    models.create_measurement_units_table()
+    models.init_default_measurement_units()
+    models.add_missing_columns()
+    models.create_indexes()
+
+
+def time_start(init, pool_size):
+    """Time one start in a fresh process-like state (no open connections)"""
+    config.DB_POOL_SIZE = pool_size
+    close_pool()
+    start = time.perf_counter()
+    init()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(init, pool_size, runs):
+    """Return (cold ms, warm ms) medians over several databases"""
+    cold, warm = [], []
+    for _ in range(runs):
+        with temp_database(init=False):
+            cold.append(time_start(init, pool_size))
+            warm.append(time_start(init, pool_size))
+    return statistics.median(cold), statistics.median(warm)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    original_size = config.DB_POOL_SIZE
+    try:
+        legacy = run(legacy_init, 0, args.runs)
+        migrated = run(models.migrate, original_size, args.runs)
+    finally:
+        config.DB_POOL_SIZE = original_size
+
+    print_table(
+        f"init_database() startup, median of {args.runs} runs",
+        ["path", "cold ms", "warm ms"],
+        [
+            ["legacy create_* sequence", f"{legacy[0]:.2f}", f"{legacy[1]:.2f}"],
+            ["migrate()", f"{migrated[0]:.2f}", f"{migrated[1]:.2f}"],
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark: stock_as_of() ledger lookups vs. replaying the transactions table.
+
+Usage:
+    python benchmarks/bench_stock_ledger.py [--rows 100000 1000000] [--items 100]
+"""
+import argparse
+import random
+import time
+
+from common import temp_database, measure, print_table
+import config
+from database import models
+from database.connection import connection
+
+
+def seed(rows, items):
+    """Post rows movements over a year, in date order, through the batch API"""
+    models.add_items_bulk((f"SKU {n:05d}", None, 0, 1.0) for n in range(items))
+    item_ids = [item[0] for item in models.get_items()]
+    rng = random.Random(42)
+    for start in range(0, rows, 50000):
+        models.add_transactions_batch(
+            (rng.choice(item_ids), config.TRANSACTION_TYPE_IN, rng.randint(1, 5),
+             day(n * 336 // rows), None, None)
+            for n in range(start, min(start + 50000, rows))
+        )
+    return item_ids
+
+
+def day(number):
+    """Date of the numbered day in a 12 x 28-day year"""
+    return f"2026-{1 + number // 28:02d}-{1 + number % 28:02d}"
+
+
+def replay_stock_as_of(item_id, date):
+    """Stock at a date by summing the item's movements up to it"""
+    with connection() as conn:
+        return conn.execute('''
+            SELECT COALESCE(SUM(CASE WHEN transaction_type = 'OUT' THEN -quantity ELSE quantity END), 0)
+            FROM transactions
+            WHERE item_id = ? AND date <= ?
+        ''', (item_id, date)).fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rows = []
+    for count in args.rows:
+        with temp_database():
+            item_ids = seed(count, args.items)
+            item_id, date = item_ids[0], "2026-12-15"
+            assert models.stock_as_of(item_id, date) == replay_stock_as_of(item_id, date)
+
+            replay, _ = measure(lambda: replay_stock_as_of(item_id, date), args.repeat)
+            ledger, _ = measure(lambda: models.stock_as_of(item_id, date), args.repeat)
+            start = time.perf_counter()
+            models.rebuild_stock_ledger()
+            rebuild = time.perf_counter() - start
+
+            replay_ms = replay / args.repeat * 1000
+            ledger_ms = ledger / args.repeat * 1000
+            rows.append([f"{count:,}", f"{replay_ms:.3f}", f"{ledger_ms:.3f}",
+                         f"{replay_ms / ledger_ms:.0f}x", f"{rebuild:.2f}"])
+
+    print_table(
+        f"Stock-at-date lookup ({args.items} items)",
+        ["movements", "replay ms", "ledger ms", "speedup", "full rebuild s"],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark: commit latency of add_transaction() under each storage profile.
+
+Usage:
+    python benchmarks/bench_storage_profiles.py [--commits N]
+"""
+import argparse
+import statistics
+import time
+
+from common import temp_database, print_table
+import config
+from database import models
+from database.connection import close_pool
+
+
+def run(profile, commits):
+    """Return per-commit latencies in milliseconds for one profile"""
+    config.DB_PROFILE = profile
+    close_pool()
+    latencies = []
+    with temp_database():
+        models.add_category("Bench", "Benchmark category")
+        category_id = models.get_categories()[0][0]
+        models.add_item("Bench item", category_id, 0, 1.0)
+        item_id = models.get_items()[0][0]
+
+        for _ in range(commits):
+            start = time.perf_counter()
+            models.add_transaction(item_id, config.TRANSACTION_TYPE_IN, 1, "2026-01-01")
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--commits', type=int, default=500)
+    args = parser.parse_args()
+
+    original_profile = config.DB_PROFILE
+    rows = []
+    try:
+        for profile in config.DB_PROFILES:
+            latencies = sorted(run(profile, args.commits))
+            rows.append([
+                profile,
+                f"{statistics.mean(latencies):.3f}",
+                f"{latencies[len(latencies) // 2]:.3f}",
+                f"{latencies[int(len(latencies) * 0.95)]:.3f}",
+                f"{1000 / statistics.mean(latencies):.0f}",
+            ])
+    finally:
+        config.DB_PROFILE = original_profile
+
+    print_table(
+        f"Commit latency per storage profile ({args.commits} commits)",
+        ["profile", "mean ms", "p50 ms", "p95 ms", "commits/s"],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
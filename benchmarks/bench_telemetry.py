@@ -0,0 +1,69 @@
+"""Benchmark: view_items() with telemetry off, on, and the old synchronous debug log.
+
+Usage:
+    python benchmarks/bench_telemetry.py [--items 1000] [--repeat 500]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from common import temp_database, measure, print_table
+from database import models
+from utils import telemetry
+
+
+def legacy_log(path):
+    """Open, append and close the log on every call, as _agent_log did"""
+    def log(message, data):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"message": message, "data": data, "timestamp": int(time.time() * 1000)}) + "\n")
+    return log
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    log_path = os.path.join(tempfile.mkdtemp(), 'telemetry.log')
+    legacy = legacy_log(log_path + '.legacy')
+
+    def view_items_legacy():
+        items = models.view_items()
+        legacy("view_items", {"rows": len(items)})
+
+    rows = []
+    with temp_database():
+        models.add_items_bulk((f"Item {n:05d}", None, n % 50, 1.0) for n in range(args.items))
+        models.view_items()  # warm the page cache
+
+        telemetry.configure(enabled=False)
+        rows.append(["telemetry off", *measure(models.view_items, args.repeat)])
+
+        telemetry.configure(enabled=True, level='DEBUG', path=log_path)
+        rows.append(["telemetry on (DEBUG)", *measure(models.view_items, args.repeat)])
+        telemetry.flush()
+
+        telemetry.configure(enabled=False)
+        rows.append(["legacy sync log", *measure(view_items_legacy, args.repeat)])
+
+    telemetry.configure()
+    for path in (log_path, log_path + '.legacy'):
+        if os.path.exists(path):
+            os.unlink(path)
+    os.rmdir(os.path.dirname(log_path))
+
+    baseline = rows[0][1]
+    print_table(
+        f"view_items() x{args.repeat} ({args.items:,} items)",
+        ["logging", "seconds", "calls/s", "overhead"],
+        [[name, f"{seconds:.3f}", f"{ops:,.0f}", f"{(seconds / baseline - 1) * 100:+.1f}%"]
+         for name, seconds, ops in rows],
+    )
+
+
+if __name__ == '__main__':
+    main()
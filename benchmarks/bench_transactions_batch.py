@@ -0,0 +1,69 @@
+"""Benchmark: add_transactions_batch() vs. one add_transaction() per line.
+
+Usage:
+    python benchmarks/bench_transactions_batch.py [--lines 1000 100000] [--items N]
+"""
+import argparse
+import random
+import time
+
+from common import temp_database, print_table
+import config
+from database import models
+
+
+def feed(item_ids, count):
+    """Generate a point-of-sale feed of OUT movements"""
+    rng = random.Random(42)
+    for _ in range(count):
+        yield (rng.choice(item_ids), config.TRANSACTION_TYPE_OUT, rng.randint(1, 3), "2026-01-01", None, 2.5)
+
+
+def setup_items(count):
+    """Create items with enough stock for any feed"""
+    models.add_items_bulk((f"SKU {n:05d}", None, 10 ** 9, 1.0) for n in range(count))
+    return [item[0] for item in models.get_items()]
+
+
+def run_per_call(lines, items):
+    """Post every line with its own add_transaction(); returns lines/sec"""
+    with temp_database():
+        movements = list(feed(setup_items(items), lines))
+        start = time.perf_counter()
+        for movement in movements:
+            models.add_transaction(*movement)
+        return lines / (time.perf_counter() - start)
+
+
+def run_batch(lines, items):
+    """Post every line in one add_transactions_batch(); returns lines/sec"""
+    with temp_database():
+        movements = list(feed(setup_items(items), lines))
+        start = time.perf_counter()
+        results = models.add_transactions_batch(movements)
+        elapsed = time.perf_counter() - start
+        assert all(result[0] for result in results)
+        return lines / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--items', type=int, default=500)
+    args = parser.parse_args()
+
+    rows = []
+    for lines in args.lines:
+        per_call = run_per_call(lines, args.items)
+        batch = run_batch(lines, args.items)
+        rows.append([f"{lines:,}", f"{per_call:,.0f}", f"{batch:,.0f}", f"{batch / per_call:.1f}x"])
+
+    print_table(
+        f"Movement posting throughput ({args.items} items)",
+        ["lines", "per-call lines/s", "batch lines/s", "speedup"],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
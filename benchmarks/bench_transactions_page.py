@@ -0,0 +1,72 @@
+"""Benchmark: keyset pages from get_transactions_page() vs. LIMIT/OFFSET paging.
+
+Usage:
+    python benchmarks/bench_transactions_page.py [--rows 200000] [--per-day 5000] [--depths 0 100 1000]
+"""
+import argparse
+
+from common import temp_database, measure, print_table
+import config
+from database import models
+from database.connection import connection
+
+
+def seed(rows, per_day):
+    """Insert rows movements, per_day of them on each date"""
+    models.add_items_bulk([("Widget", None, 0, 1.0)])
+    with connection() as conn:
+        conn.executemany(
+            "INSERT INTO transactions (item_id, transaction_type, quantity, date) VALUES (1, 'IN', 1, ?)",
+            ((f"day {n // per_day:06d}",) for n in range(rows)),
+        )
+
+
+def offset_page(page_number, limit):
+    """Fetch a page the way a LIMIT/OFFSET listing would"""
+    with connection() as conn:
+        return conn.execute('''
+            SELECT t.*, i.name as item_name
+            FROM transactions t
+            LEFT JOIN inventory i ON t.item_id = i.id
+            ORDER BY t.date DESC, t.id DESC
+            LIMIT ? OFFSET ?
+        ''', (limit, page_number * limit)).fetchall()
+
+
+def cursor_at(page_number, limit):
+    """Walk the keyset cursors to the given page"""
+    cursor = None
+    for _ in range(page_number):
+        _, cursor = models.get_transactions_page(after=cursor, limit=limit)
+    return cursor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--per-day', type=int, default=5000)
+    parser.add_argument('--depths', type=int, nargs='+', default=[0, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    limit = config.TRANSACTIONS_PAGE_SIZE
+
+    rows = []
+    with temp_database():
+        seed(args.rows, args.per_day)
+        for depth in args.depths:
+            cursor = cursor_at(depth, limit)
+            keyset, _ = measure(lambda: models.get_transactions_page(after=cursor, limit=limit), args.repeat)
+            offset, _ = measure(lambda: offset_page(depth, limit), args.repeat)
+            keyset_ms = keyset / args.repeat * 1000
+            offset_ms = offset / args.repeat * 1000
+            rows.append([depth, f"{offset_ms:.2f}", f"{keyset_ms:.2f}", f"{offset_ms / keyset_ms:.1f}x"])
+
+    print_table(
+        f"Page fetch latency ({args.rows:,} rows, {args.per_day:,} per date, {limit} per page)",
+        ["page", "offset ms", "keyset ms", "speedup"],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
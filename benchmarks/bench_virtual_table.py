@@ -0,0 +1,97 @@
+"""Benchmark: refreshing the inventory table, full reload vs. virtual scrolling.
+
+The full reload is what InventoryTab.refresh_inventory used to do: read every
+item and build one Treeview row each. The virtual table reads the row count
+and one block around the viewport. Runs without a display; when one is
+available, the Treeview inserts themselves are timed as well.
+
+Usage:
+    python benchmarks/bench_virtual_table.py [--items 100000] [--viewport 30] [--repeat 5]
+"""
+import argparse
+import time
+
+from common import temp_database, print_table
+from database import models
+from ui.tabs.inventory_tab import InventoryTab
+from ui.virtual_tree import QuerySource, Viewport
+
+
+def best_of(func, repeat):
+    """Best wall time of func in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def treeview_inserts(rows):
+    """Time inserting rows into a real Treeview, or None without a display"""
+    import tkinter as tk
+    from tkinter import ttk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    try:
+        tree = ttk.Treeview(root, columns=('ID', 'Name', 'Category', 'Quantity', 'Cost Price'), show='headings')
+        start = time.perf_counter()
+        for row in rows:
+            tree.insert('', 'end', values=row)
+        root.update_idletasks()
+        return (time.perf_counter() - start) * 1000
+    finally:
+        root.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--viewport', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with temp_database():
+        models.add_items_bulk((f"Item {n:07d}", None, n % 100, 1.0 + n % 7) for n in range(args.items))
+
+        def full_reload():
+            return [InventoryTab._display_values(item) for item in models.view_items()]
+
+        source = QuerySource(models.count_items, models.view_items_window, format=InventoryTab._display_values)
+        viewport = Viewport(source, args.viewport)
+
+        def virtual_refresh(fraction):
+            def refresh():
+                source.refresh()
+                viewport.scroll_to(fraction)
+                return viewport.rows()
+            return refresh
+
+        full_reload()  # warm the page cache
+        full_rows = full_reload()
+        rows = [
+            ["full reload", best_of(full_reload, args.repeat), len(full_rows)],
+            ["virtual, top", best_of(virtual_refresh(0.0), args.repeat), len(viewport.rows())],
+            ["virtual, 90% down", best_of(virtual_refresh(0.9), args.repeat), len(viewport.rows())],
+        ]
+        full_inserts = treeview_inserts(full_rows)
+        virtual_inserts = treeview_inserts(viewport.rows())
+
+    table = [[name, f"{ms:.1f}", f"{count:,}"] for name, ms, count in rows]
+    if full_inserts is None:
+        print("No display: Treeview insert times not measured")
+    else:
+        table[0].append(f"{full_inserts:.1f}")
+        table[1].append(f"{virtual_inserts:.1f}")
+        table[2].append(f"{virtual_inserts:.1f}")
+
+    headers = ["refresh", "query + format ms", "rows shown"]
+    if full_inserts is not None:
+        headers.append("Treeview insert ms")
+    print_table(f"Inventory table refresh ({args.items:,} items, {args.viewport}-row viewport)", headers, table)
+
+
+if __name__ == '__main__':
+    main()
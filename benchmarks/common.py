@@ -0,0 +1,56 @@
+"""Shared helpers for the benchmark scripts"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from database import models
+from database.connection import close_pool
+
+
+def init_schema():
+    """Create every table the application expects"""
+    models.migrate()
+
+
+@contextmanager
+def temp_database(init=True):
+    """Point config.DB_NAME at a throwaway database for the duration"""
+    handle = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+    handle.close()
+    original_db = config.DB_NAME
+    config.DB_NAME = handle.name
+    try:
+        if init:
+            init_schema()
+        yield handle.name
+    finally:
+        close_pool()
+        config.DB_NAME = original_db
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(handle.name + suffix):
+                os.unlink(handle.name + suffix)
+
+
+def measure(func, repeat):
+    """Call func repeat times and return (seconds, ops_per_second)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = time.perf_counter() - start
+    return elapsed, repeat / elapsed if elapsed else float('inf')
+
+
+def print_table(title, headers, rows):
+    """Print results as a fixed-width table"""
+    print(f"\n{title}")
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(v).ljust(w) for v, w in zip(row, widths)))
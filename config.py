@@ -3,6 +3,74 @@
 
 # Database Configuration
 DB_NAME = 'inventory.db'
+DB_POOL_SIZE = 5  # Max open connections shared by the model modules (0 disables pooling)
+DB_POOL_TIMEOUT = 10.0  # Seconds to wait for a free pooled connection
+DB_READ_ONLY = False  # Open pooled connections read-only (set in report worker processes)
+
+# Query timing (see database/instrumentation.py); off by default
+DB_INSTRUMENT = False  # Time every statement on new connections
+DB_SLOW_QUERY_MS = 100  # Statements slower than this are logged with their query plan
+DB_SLOW_QUERY_LOG_SIZE = 200  # Slow statements kept in memory
+
+# Storage profile applied to every connection by get_connection().
+# 'durable' fsyncs every commit, 'fast' (WAL + synchronous=NORMAL) survives
+# application crashes but may lose the last commits on power loss, and 'bulk'
+# skips fsync entirely for one-off imports.
+DB_PROFILE = 'fast'
+DB_PROFILES = {
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,  # Negative values are KiB
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,  # Milliseconds
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'bulk': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -256000,
+        'mmap_size': 1024 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+}
+
+# Rows per transaction for the bulk import/update APIs
+BULK_CHUNK_SIZE = 5000
+
+# Transactions fetched per page of history
+TRANSACTIONS_PAGE_SIZE = 100
+
+# Full-text search (models.search): when more rows match, only this many of
+# the newest are ranked, so a common word costs the same in any size of history
+SEARCH_RANK_WINDOW = 10000
+
+# Rows fetched per round trip when streaming large query results
+DB_FETCH_SIZE = 1000
+
+# Rows per row group in columnar report exports
+EXPORT_ROW_GROUP_SIZE = 50000
+
+# Items with less stock than this are reported as low stock
+LOW_STOCK_THRESHOLD = 10
+
+# Telemetry: structured JSON-lines events written by a background thread.
+# Disabled, an event call costs one comparison.
+TELEMETRY_ENABLED = False
+TELEMETRY_LEVEL = 'INFO'  # DEBUG, INFO, WARNING or ERROR
+TELEMETRY_SAMPLE_RATE = 1.0  # Fraction of DEBUG and INFO events kept; warnings and errors are always kept
+TELEMETRY_PATH = 'telemetry.log'
+TELEMETRY_QUEUE_SIZE = 10000  # Events buffered in memory; further events are dropped and counted
+TELEMETRY_FLUSH_INTERVAL = 1.0  # Seconds between writes to the log file
 
 # GUI Configuration
 MAIN_WINDOW_TITLE = "Inventory Management System"
@@ -30,6 +98,17 @@ COLUMN_WIDTH_NAME = 120
 COLUMN_WIDTH_STANDARD = 100
 COLUMN_WIDTH_WIDE = 150
 
+# Rows read per query by scrolled tables; only the rows on screen are shown
+TABLE_BLOCK_SIZE = 200
+
+# Background work started from the UI (loading, reports, exports)
+TASK_WORKERS = 2  # Threads running database work for the tabs
+TASK_POLL_MS = 50  # How often the main loop checks for finished work
+
+# Search-as-you-type in the tabs
+SEARCH_DEBOUNCE_MS = 150  # Pause in typing before a search runs
+SEARCH_RESULT_LIMIT = 1000  # Matching rows shown; the count says when there are more
+
 # Password Constraints
 MIN_PASSWORD_LENGTH = 4
 
@@ -1,72 +1,291 @@
 """Database connection and schema management module"""
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 import config
+from database.instrumentation import connection_factory
 
 
-def get_connection():
-    """Get a database connection"""
-    return sqlite3.connect(config.DB_NAME)
+def apply_profile(conn, profile=None):
+    """Apply the PRAGMAs of a storage profile from config.DB_PROFILES"""
+    settings = config.DB_PROFILES[profile or config.DB_PROFILE]
+    # busy_timeout goes first so the journal_mode switch can wait out other writers
+    conn.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout'])}")
+    conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+    conn.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+    conn.execute(f"PRAGMA cache_size = {int(settings['cache_size'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(settings['mmap_size'])}")
+    conn.execute(f"PRAGMA temp_store = {settings['temp_store']}")
+    return conn
+
+
+def get_connection(profile=None):
+    """Get a database connection configured with the storage profile"""
+    conn = sqlite3.connect(config.DB_NAME, check_same_thread=False, factory=connection_factory())
+    return apply_profile(conn, profile)
+
+
+# The connection each thread's outermost connection() block holds, whichever
+# pool it came from
+_held = threading.local()
+
+
+class ConnectionPool:
+    """Bounded, thread-aware pool of SQLite connections.
+
+    Connections are opened lazily up to ``max_size`` and handed to one thread
+    at a time. A thread that already holds a connection gets the same one back
+    from nested ``connection()`` blocks, so helpers can call each other without
+    exhausting the pool. That holds across pools too: when the shared pool is
+    replaced (e.g. instrumentation toggled) while a thread is inside a block,
+    its nested blocks keep using the connection it holds from the old pool.
+    A ``max_size`` of 0 disables pooling and opens a fresh connection for
+    every checkout. A ``read_only`` pool opens its connections with SQLite's
+    mode=ro, so they can never take the write lock. Connections are timed
+    (see database.instrumentation) when config.DB_INSTRUMENT was set as the
+    pool was created.
+    """
+
+    def __init__(self, database, max_size=None, timeout=None, read_only=False):
+        self.database = database
+        self.read_only = read_only
+        self.factory = connection_factory()
+        self.max_size = config.DB_POOL_SIZE if max_size is None else max_size
+        self.timeout = config.DB_POOL_TIMEOUT if timeout is None else timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size) if self.max_size else None
+        self._closed = False
+        self.pid = os.getpid()
+
+    def _connect(self):
+        """Open a new connection to this pool's database"""
+        if self.read_only:
+            from urllib.parse import quote
+            uri = f"file:{quote(os.path.abspath(self.database))}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=self.factory)
+        else:
+            conn = sqlite3.connect(self.database, check_same_thread=False, factory=self.factory)
+        return apply_profile(conn)
+
+    def checkout(self):
+        """Take a connection out of the pool, blocking while all are in use"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+
+        if self._slots is None:
+            return self._connect()
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError("Timed out waiting for a database connection")
+
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, conn):
+        """Return a connection to the pool, discarding any open transaction"""
+        if conn.in_transaction:
+            conn.rollback()
+
+        if self._slots is None:
+            conn.close()
+            return
+
+        with self._lock:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.append(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Context manager yielding a connection that commits on success.
+
+        The outermost block on a thread owns the transaction: it commits when
+        the block exits normally and rolls back if an exception escapes.
+        """
+        held = getattr(_held, 'conn', None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self.checkout()
+        _held.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            _held.conn = None
+            self.checkin(conn)
+
+    def close(self):
+        """Close all idle connections; checked-out ones close on checkin"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Get the shared pool for the currently configured database"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool.pid != os.getpid():
+            # Forked child: never touch connections inherited from the parent
+            _pool = None
+        if (_pool is None or _pool.database != config.DB_NAME or _pool.read_only != config.DB_READ_ONLY
+                or _pool.factory is not connection_factory()):
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(config.DB_NAME, read_only=config.DB_READ_ONLY)
+        return _pool
+
+
+def close_pool():
+    """Close the shared pool, e.g. before removing the database file"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def connection():
+    """Borrow a pooled connection for the current database.
+
+    Usage::
+
+        with connection() as conn:
+            conn.execute(...)
+    """
+    return get_pool().connection()
+
+
+class QueryStream:
+    """Lazily executed, re-iterable query result.
+
+    Each iteration borrows its own pooled connection, separate from any
+    transaction the iterating thread holds, and fetches rows in batches of
+    config.DB_FETCH_SIZE, so the whole result is never held in memory.
+
+    Usage::
+
+        for row in QueryStream("SELECT * FROM inventory"):
+            ...
+    """
+
+    def __init__(self, query, params=(), batch_size=None):
+        self.query = query
+        self.params = params
+        self.batch_size = batch_size or config.DB_FETCH_SIZE
+
+    def __iter__(self):
+        pool = get_pool()
+        conn = pool.checkout()
+        try:
+            c = conn.execute(self.query, self.params)
+            while True:
+                rows = c.fetchmany(self.batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            pool.checkin(conn)
 
 
 def update_database_schema():
     """Update existing database schema to add new columns"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # Check if measurement_unit_id column exists in inventory table
-    c.execute("PRAGMA table_info(inventory)")
-    columns = [column[1] for column in c.fetchall()]
-    
-    # Add category_id column if it doesn't exist
-    if 'category_id' not in columns:
-        c.execute('ALTER TABLE inventory ADD COLUMN category_id INTEGER')
-    
-    # Add measurement_unit_id column if it doesn't exist
-    if 'measurement_unit_id' not in columns:
-        c.execute('ALTER TABLE inventory ADD COLUMN measurement_unit_id INTEGER')
-    
-    # Add cost_price column if it doesn't exist
-    if 'cost_price' not in columns:
-        c.execute('ALTER TABLE inventory ADD COLUMN cost_price REAL DEFAULT 0.0')
-    
-    # Check if transactions table needs selling_price column
-    c.execute("PRAGMA table_info(transactions)")
-    trans_columns = [column[1] for column in c.fetchall()]
-    
-    if 'selling_price' not in trans_columns:
-        c.execute('ALTER TABLE transactions ADD COLUMN selling_price REAL DEFAULT 0.0')
-    
-    # Check if measurement_units table exists
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='measurement_units'")
-    if not c.fetchone():
-        from database.schema import create_measurement_units_table, init_default_measurement_units
-        create_measurement_units_table()
-        init_default_measurement_units()
-    
-    # Check if profit_loss_summary table exists
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='profit_loss_summary'")
-    if not c.fetchone():
-        from database.schema import create_profit_loss_table
-        create_profit_loss_table()
-    
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        c = conn.cursor()
+
+        # Check if measurement_unit_id column exists in inventory table
+        c.execute("PRAGMA table_info(inventory)")
+        columns = [column[1] for column in c.fetchall()]
+
+        # Add category_id column if it doesn't exist
+        if 'category_id' not in columns:
+            c.execute('ALTER TABLE inventory ADD COLUMN category_id INTEGER')
+
+        # Add measurement_unit_id column if it doesn't exist
+        if 'measurement_unit_id' not in columns:
+            c.execute('ALTER TABLE inventory ADD COLUMN measurement_unit_id INTEGER')
+
+        # Add cost_price column if it doesn't exist
+        if 'cost_price' not in columns:
+            c.execute('ALTER TABLE inventory ADD COLUMN cost_price REAL DEFAULT 0.0')
+
+        # Check if transactions table needs selling_price column
+        c.execute("PRAGMA table_info(transactions)")
+        trans_columns = [column[1] for column in c.fetchall()]
+
+        if 'selling_price' not in trans_columns:
+            c.execute('ALTER TABLE transactions ADD COLUMN selling_price REAL DEFAULT 0.0')
+
+        # Check if measurement_units table exists
+        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='measurement_units'")
+        if not c.fetchone():
+            from database.schema import create_measurement_units_table, init_default_measurement_units
+            create_measurement_units_table()
+            init_default_measurement_units()
+
+        # Check if profit_loss_summary table exists
+        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='profit_loss_summary'")
+        if not c.fetchone():
+            from database.schema import create_profit_loss_table
+            create_profit_loss_table()
 
 
 def get_next_available_id(table_name):
-    """Get next available ID for any table, reusing deleted IDs"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # Get all existing IDs from the specified table
-    c.execute(f'SELECT id FROM {table_name} ORDER BY id')
-    existing_ids = [row[0] for row in c.fetchall()]
-    conn.close()
-    
-    # Find first missing ID starting from 1
-    next_id = 1
-    while next_id in existing_ids:
-        next_id += 1
-    
-    return next_id
+    """Get next available ID for any table, reusing deleted IDs.
+
+    Tables tracked by the free_ids list (see schema.FREE_ID_TABLES) answer
+    with two index lookups. Other tables fall back to a single gap query that
+    stops at the first missing id.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+
+        c.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+                  (f"trg_{table_name}_free_id",))
+        if c.fetchone():
+            c.execute("SELECT MIN(id) FROM free_ids WHERE table_name = ?", (table_name,))
+            free_id = c.fetchone()[0]
+            if free_id is not None:
+                return free_id
+
+            # No gaps: continue after the highest id, as AUTOINCREMENT would
+            c.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM {table_name}')
+            return c.fetchone()[0]
+
+        # Find first missing ID starting from 1
+        c.execute(f'''
+            SELECT CASE
+                WHEN NOT EXISTS (SELECT 1 FROM {table_name} WHERE id = 1) THEN 1
+                ELSE (
+                    SELECT a.id + 1 FROM {table_name} a
+                    WHERE a.id >= 1
+                      AND NOT EXISTS (SELECT 1 FROM {table_name} b WHERE b.id = a.id + 1)
+                    ORDER BY a.id
+                    LIMIT 1
+                )
+            END
+        ''')
+        return c.fetchone()[0]
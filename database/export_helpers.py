@@ -1,8 +1,12 @@
-"""Report export helper functions for CSV and TXT formats"""
+"""Report export helper functions for CSV, TXT and columnar formats"""
 import csv
+import gzip
+import json
 import os
 from datetime import datetime
+from itertools import islice
 import config
+from database.models.reports import INVENTORY_REPORT_COLUMNS, TRANSACTION_REPORT_COLUMNS, SALES_REPORT_COLUMNS
 
 
 def generate_filename(report_type, format_type):
@@ -12,10 +16,42 @@ def generate_filename(report_type, format_type):
     return f"{clean_report_type}_{timestamp}.{format_type}"
 
 
-def export_to_csv(report_data, filepath):
-    """Export report data to CSV format"""
+def _open_csv(filepath, compress=None):
+    """Open filepath for CSV writing, gzip-compressed if asked or named *.gz"""
+    if compress is None:
+        compress = filepath.endswith('.gz')
+    if compress:
+        return gzip.open(filepath, 'wt', newline='', encoding='utf-8')
+    return open(filepath, 'w', newline='', encoding='utf-8')
+
+
+def _tracked(rows, progress=None, total=None):
+    """Yield rows, calling progress(rows_done, total) every config.DB_FETCH_SIZE rows"""
+    if progress is None:
+        yield from rows
+        return
+    done = 0
+    for row in rows:
+        yield row
+        done += 1
+        if done % config.DB_FETCH_SIZE == 0:
+            progress(done, total)
+    progress(done, total)
+
+
+def export_to_csv(report_data, filepath, compress=None, progress=None):
+    """Export report data to CSV format.
+
+    Row sections are written as they are iterated, so reports holding a
+    QueryStream (see generate_inventory_report and
+    generate_transaction_report(stream=True)) export in bounded memory.
+    The file is gzip-compressed when compress is set, or by default when
+    filepath ends in .gz. progress, if given, is called as
+    progress(rows_written, total_rows) while rows are written; total_rows is
+    None when the report does not know it.
+    """
     try:
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+        with _open_csv(filepath, compress) as csvfile:
             writer = csv.writer(csvfile)
             
             # Write header with report metadata
@@ -28,14 +64,18 @@ def export_to_csv(report_data, filepath):
             if 'items' in report_data:  # Inventory Report
                 writer.writerow(['INVENTORY ITEMS'])
                 writer.writerow(['ID', 'Name', 'Category', 'Quantity', 'Cost Price'])
-                for item in report_data.get('items', []):
-                    writer.writerow([
-                        item[0],  # ID
-                        item[1],  # Name
-                        item[7] or 'No Category',  # Category name
-                        f"{item[3]} {item[8] if item[8] else ''}",  # Quantity with unit
-                        item[9] or 0.0  # Cost price
-                    ])
+                items = _tracked(report_data.get('items', []), progress, report_data.get('total_items'))
+                column = {name: n for n, name in enumerate(INVENTORY_REPORT_COLUMNS)}
+                writer.writerows(
+                    [
+                        item[column['id']],
+                        item[column['name']],
+                        item[column['category_name']] or 'No Category',
+                        f"{item[column['quantity']]} {item[column['unit_symbol']] or ''}",  # Quantity with unit
+                        item[column['cost_price']] or 0.0
+                    ]
+                    for item in items
+                )
                 
                 writer.writerow([])  # Empty row
                 writer.writerow(['SUMMARY STATISTICS'])
@@ -45,15 +85,19 @@ def export_to_csv(report_data, filepath):
             elif 'transactions' in report_data:  # Transaction Report
                 writer.writerow(['TRANSACTIONS'])
                 writer.writerow(['ID', 'Date', 'Type', 'Item', 'Quantity', 'Notes'])
-                for transaction in report_data.get('transactions', []):
-                    writer.writerow([
+                transactions = _tracked(report_data.get('transactions', []), progress,
+                                        report_data.get('total_transactions'))
+                writer.writerows(
+                    [
                         transaction[0],  # ID
                         transaction[1],  # Date
                         transaction[2],  # Type
                         transaction[5],  # Item name
                         transaction[3],  # Quantity
                         transaction[4]  # Notes
-                    ])
+                    ]
+                    for transaction in transactions
+                )
                 
                 writer.writerow([])  # Empty row
                 writer.writerow(['SUMMARY STATISTICS'])
@@ -61,10 +105,36 @@ def export_to_csv(report_data, filepath):
                 writer.writerow(['Total IN:', report_data.get('total_in', 0)])
                 writer.writerow(['Total OUT:', report_data.get('total_out', 0)])
                 
+            elif 'category_breakdown' in report_data:  # Profit & Loss Report
+                writer.writerow(['PROFIT & LOSS BY CATEGORY'])
+                writer.writerow(['Category', 'Revenue', 'Cost', 'Profit', 'Units Sold', 'Units Purchased'])
+                for category in report_data.get('category_breakdown', []):
+                    writer.writerow([
+                        category[0],  # Category
+                        f"${category[1]:.2f}",  # Revenue
+                        f"${category[2]:.2f}",  # Cost
+                        f"${category[3]:.2f}",  # Profit
+                        category[4],  # Units sold
+                        category[5]   # Units purchased
+                    ])
+                
+                writer.writerow([])  # Empty row
+                writer.writerow(['TOP ITEMS'])
+                writer.writerow(['Item', 'Category', 'Units Sold', 'Revenue', 'Profit'])
+                for item in report_data.get('top_items', []):
+                    writer.writerow([item[0], item[1], item[2], f"${item[3]:.2f}", f"${item[4]:.2f}"])
+                
+                writer.writerow([])  # Empty row
+                writer.writerow(['SUMMARY STATISTICS'])
+                writer.writerow(['Total Revenue:', f"${report_data.get('total_revenue', 0):.2f}"])
+                writer.writerow(['Total Cost:', f"${report_data.get('total_cost', 0):.2f}"])
+                writer.writerow(['Gross Profit:', f"${report_data.get('gross_profit', 0):.2f}"])
+                writer.writerow(['Net Profit:', f"${report_data.get('net_profit', 0):.2f}"])
+                
             elif 'sales' in report_data:  # Sales Report
                 writer.writerow(['SALES SUMMARY'])
                 writer.writerow(['Item', 'Quantity Sold', 'Total Revenue'])
-                for sale in report_data.get('sales', []):
+                for sale in _tracked(report_data.get('sales', []), progress, len(report_data.get('sales', []))):
                     writer.writerow([
                         sale[0],  # Item name
                         sale[1],  # Quantity sold
@@ -115,6 +185,171 @@ def export_to_csv(report_data, filepath):
         return False, f"Error exporting: {str(e)}"
 
 
+# Columns of each report's row section, as its query selects them
+REPORT_COLUMNS = {
+    'items': INVENTORY_REPORT_COLUMNS,
+    'transactions': TRANSACTION_REPORT_COLUMNS,
+    'sales': SALES_REPORT_COLUMNS,
+}
+
+# Typed columns of each report's row section for columnar export:
+# (name, type, report column in REPORT_COLUMNS)
+COLUMNAR_SCHEMAS = {
+    'items': [
+        ('id', 'int64', 'id'),
+        ('name', 'string', 'name'),
+        ('category', 'string', 'category_name'),
+        ('quantity', 'int64', 'quantity'),
+        ('unit_symbol', 'string', 'unit_symbol'),
+        ('cost_price', 'float64', 'cost_price'),
+    ],
+    'transactions': [
+        ('id', 'int64', 'id'),
+        ('date', 'string', 'date'),
+        ('transaction_type', 'string', 'transaction_type'),
+        ('quantity', 'int64', 'quantity'),
+        ('notes', 'string', 'notes'),
+        ('item_name', 'string', 'item_name'),
+        ('category', 'string', 'category'),
+        ('unit_symbol', 'string', 'unit_symbol'),
+        ('value', 'float64', 'value'),
+    ],
+    'sales': [
+        ('item_name', 'string', 'item_name'),
+        ('total_sold', 'int64', 'total_sold'),
+        ('total_revenue', 'float64', 'total_revenue'),
+    ],
+}
+
+# Header line of the stdlib columnar format
+COLUMNAR_FORMAT = 'inventory-columnar'
+
+
+def have_pyarrow():
+    """Check whether the optional pyarrow dependency is installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def columnar_extension():
+    """File extension of the best available columnar format"""
+    return "parquet" if have_pyarrow() else "ndjson.gz"
+
+
+def _row_groups(rows, size=None):
+    """Split rows into lists of at most size rows (config.EXPORT_ROW_GROUP_SIZE)"""
+    size = size or config.EXPORT_ROW_GROUP_SIZE
+    rows = iter(rows)
+    while True:
+        group = list(islice(rows, size))
+        if not group:
+            return
+        yield group
+
+
+def _write_parquet(filepath, schema, metadata, groups):
+    """Write row groups to a Parquet file with pyarrow"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name, _ in schema],
+                             metadata={'report': json.dumps(metadata)})
+    with pq.ParquetWriter(filepath, arrow_schema, compression='zstd') as writer:
+        for columns in groups:
+            writer.write_table(pa.table(columns, schema=arrow_schema))
+
+
+def _write_ndjson(filepath, schema, metadata, groups):
+    """Write row groups to the stdlib columnar format.
+
+    A gzip-compressed NDJSON file: the first line holds the format name,
+    the report metadata and the typed column list; every further line is
+    one row group, {"rows": n, "columns": {name: [values]}}.
+    """
+    with gzip.open(filepath, 'wt', encoding='utf-8') as f:
+        header = {
+            'format': COLUMNAR_FORMAT,
+            'version': 1,
+            'report': metadata,
+            'columns': [{'name': name, 'type': type_name} for name, type_name, _ in schema],
+        }
+        f.write(json.dumps(header) + "\n")
+        for columns in groups:
+            rows = len(next(iter(columns.values())))
+            f.write(json.dumps({'rows': rows, 'columns': columns}, separators=(',', ':')) + "\n")
+
+
+def export_to_columnar(report_data, filepath, progress=None):
+    """Export the rows of a report to a typed, columnar, compressed file.
+
+    Covers the inventory, transaction and sales reports. A .parquet path is
+    written as Parquet and needs pyarrow; any other path gets the stdlib
+    gzip NDJSON format (see _write_ndjson). Rows are read from the report,
+    which may hold a QueryStream, and written in row groups of
+    config.EXPORT_ROW_GROUP_SIZE. The report's summary figures are stored
+    as metadata. progress works as for export_to_csv().
+    """
+    section = next((key for key in COLUMNAR_SCHEMAS if key in report_data), None)
+    if section is None:
+        return False, "Columnar export supports inventory, transaction and sales reports"
+
+    parquet = filepath.endswith('.parquet')
+    if parquet and not have_pyarrow():
+        return False, "Parquet export needs pyarrow; install it or export to .ndjson.gz"
+
+    schema = COLUMNAR_SCHEMAS[section]
+    metadata = {key: value for key, value in report_data.items()
+                if key != section and isinstance(value, (str, int, float))}
+    metadata['section'] = section
+    total = report_data.get({'items': 'total_items', 'transactions': 'total_transactions'}.get(section))
+
+    position = {column: n for n, column in enumerate(REPORT_COLUMNS[section])}
+    fields = [(name, position[column]) for name, _, column in schema]
+    rows = _tracked(report_data[section], progress, total)
+    groups = ({name: [row[n] for row in group] for name, n in fields}
+              for group in _row_groups(rows))
+
+    try:
+        if parquet:
+            _write_parquet(filepath, schema, metadata, groups)
+        else:
+            _write_ndjson(filepath, schema, metadata, groups)
+        return True, f"Report exported successfully to {filepath}"
+    except Exception as e:
+        return False, f"Error exporting: {str(e)}"
+
+
+def read_columnar(filepath):
+    """Read a columnar export back.
+
+    Returns (metadata, row_groups): the report metadata dict and an iterator
+    of {column: [values]} dicts, one per row group.
+    """
+    if filepath.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(filepath)
+        metadata = json.loads(parquet_file.schema_arrow.metadata[b'report'])
+        groups = (parquet_file.read_row_group(n).to_pydict() for n in range(parquet_file.num_row_groups))
+        return metadata, groups
+
+    f = gzip.open(filepath, 'rt', encoding='utf-8')
+    header = json.loads(f.readline())
+    if header.get('format') != COLUMNAR_FORMAT:
+        f.close()
+        raise ValueError(f"{filepath} is not a columnar report export")
+
+    def groups():
+        with f:
+            for line in f:
+                yield json.loads(line)['columns']
+
+    return header['report'], groups()
+
+
 def export_to_txt(report_content, filepath):
     """Export report content to TXT format"""
     try:
@@ -0,0 +1,126 @@
+"""Bulk import helpers for loading inventory items and stock movements from CSV"""
+import argparse
+import csv
+import sys
+import time
+import config
+from database import models
+from database.models.inventory import _bulk_result
+
+
+def read_items_csv(filepath):
+    """Stream item rows from a CSV file with a header row.
+
+    Recognised columns: id, name, category, quantity, cost_price. Blank
+    values are passed on as None so bulk updates keep the current value;
+    numbers stay text for the bulk APIs to convert, so a malformed one
+    skips its row instead of stopping the import.
+    """
+    with open(filepath, newline='', encoding='utf-8') as csvfile:
+        for record in csv.DictReader(csvfile):
+            yield {key.strip().lower(): (value.strip() or None) if value is not None else None
+                   for key, value in record.items() if key}
+
+
+def import_items_csv(filepath, mode='insert', chunk_size=None, create_categories=False):
+    """Import a CSV of items using add/update/upsert_items_bulk"""
+    bulk = {
+        'insert': models.add_items_bulk,
+        'update': models.update_items_bulk,
+        'upsert': models.upsert_items_bulk,
+    }[mode]
+    return bulk(read_items_csv(filepath), chunk_size=chunk_size, create_categories=create_categories)
+
+
+def read_movements_csv(filepath):
+    """Stream stock movements from a CSV file with a header row.
+
+    Recognised columns: item_id or item (the item name), transaction_type,
+    quantity, date, notes, selling_price. Yields (row, error) pairs: row is
+    a dict for add_transactions_batch(), or None when the line has a
+    malformed number, which error then describes. An unknown item name is
+    passed on as item_id None so the line is rejected with "Item not found".
+    """
+    with models.connection() as conn:
+        item_ids = dict(conn.execute("SELECT name, id FROM inventory"))
+
+    with open(filepath, newline='', encoding='utf-8') as csvfile:
+        for record in csv.DictReader(csvfile):
+            row = {key.strip().lower(): (value.strip() or None) if value is not None else None
+                   for key, value in record.items() if key}
+            if row.get('transaction_type') is not None:
+                row['transaction_type'] = row['transaction_type'].upper()
+            if row.get('item_id') is None:
+                row['item_id'] = item_ids.get(row.get('item'))
+            try:
+                for field, convert in (('item_id', int), ('quantity', int), ('selling_price', float)):
+                    if isinstance(row.get(field), str):
+                        value = row[field]
+                        row[field] = convert(value)
+            except ValueError:
+                yield None, f"Invalid {field}: {value!r}"
+            else:
+                yield row, None
+
+
+def post_movements_csv(filepath, chunk_size=None):
+    """Post a CSV of stock movements with add_transactions_batch.
+
+    Lines are posted in chunks of chunk_size (config.BULK_CHUNK_SIZE), one
+    transaction each; rejected lines are skipped and reported. Returns the
+    same summary as models.add_items_bulk().
+    """
+    chunk_size = chunk_size or config.BULK_CHUNK_SIZE
+    started = time.perf_counter()
+    posted = 0
+    skipped = []
+    chunk = []
+    row_numbers = []
+
+    def flush():
+        nonlocal posted
+        results = models.add_transactions_batch(chunk, all_or_nothing=False)
+        for row_number, (success, message, _) in zip(row_numbers, results):
+            if success:
+                posted += 1
+            else:
+                skipped.append((row_number, message))
+        chunk.clear()
+        row_numbers.clear()
+
+    for row_number, (row, error) in enumerate(read_movements_csv(filepath)):
+        if error:
+            skipped.append((row_number, error))
+            continue
+        chunk.append(row)
+        row_numbers.append(row_number)
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+
+    return _bulk_result(posted, skipped, started)
+
+
+def main(argv=None):
+    """Command line entry point: python -m database.import_helpers items.csv"""
+    parser = argparse.ArgumentParser(description="Bulk import inventory items from CSV")
+    parser.add_argument('csv_file', help="CSV with columns name, category, quantity, cost_price (and id for updates)")
+    parser.add_argument('--mode', choices=['insert', 'update', 'upsert'], default='insert')
+    parser.add_argument('--chunk-size', type=int, default=None)
+    parser.add_argument('--create-categories', action='store_true',
+                        help="Create categories that don't exist yet instead of skipping the row")
+    args = parser.parse_args(argv)
+
+    models.migrate()
+    result = import_items_csv(args.csv_file, args.mode, args.chunk_size, args.create_categories)
+
+    print(f"Imported {result['rows']} rows in {result['seconds']:.2f}s "
+          f"({result['rows_per_sec']:.0f} rows/sec)")
+    for row_number, reason in result['skipped']:
+        print(f"Skipped row {row_number + 1}: {reason}", file=sys.stderr)
+    return 0 if not result['skipped'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,338 @@
+"""Opt-in query timing for database connections.
+
+With config.DB_INSTRUMENT set, get_connection() and the connection pool
+open InstrumentedConnection objects. Every statement run through them is
+timed from execute() until its last row is fetched, and recorded with its
+row count under the model function that ran it. Statements slower than
+config.DB_SLOW_QUERY_MS are also kept in a slow-query log together with
+their EXPLAIN QUERY PLAN.
+
+Usage::
+
+    config.DB_INSTRUMENT = True
+    models.view_items()
+    for stats in query_stats():
+        print(stats['caller'], stats['p95'], stats['sql'])
+"""
+import json
+import math
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+import config
+from utils import telemetry
+
+
+class Histogram:
+    """Latency histogram with logarithmic buckets.
+
+    Bucket bounds grow by a factor of 2**0.25 from one microsecond, so a
+    percentile is accurate to within 19% whatever the spread of latencies,
+    and memory stays bounded however many samples are added.
+    """
+
+    GROWTH = 2 ** 0.25
+    BASE_MS = 0.001
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        """Record one sample in milliseconds"""
+        bucket = 0 if ms <= self.BASE_MS else math.ceil(math.log(ms / self.BASE_MS, self.GROWTH))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def merge(self, other):
+        """Add every sample of another histogram to this one"""
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile, in milliseconds"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.BASE_MS * self.GROWTH ** bucket, self.max_ms)
+        return self.max_ms
+
+
+class _QueryStats:
+    """Timings of one statement run by one caller"""
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.rows = 0
+
+
+_lock = threading.Lock()
+_stats = {}  # (caller, sql) -> _QueryStats
+_slow = deque(maxlen=config.DB_SLOW_QUERY_LOG_SIZE)
+
+# Frames in these modules are plumbing, not the caller a statement is charged to
+_PLUMBING = (__name__, 'database.connection')
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+def _caller():
+    """Name the first function on the stack outside the connection plumbing"""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals.get('__name__') in _PLUMBING:
+        frame = frame.f_back
+    if frame is None:
+        return "<unknown>"
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__')}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _explain(conn, sql, params):
+    """Return the EXPLAIN QUERY PLAN of a statement as indented lines"""
+    words = sql.split(None, 1)
+    if not words or words[0].upper() not in _EXPLAINABLE:
+        return None
+    try:
+        # The base class method, so the EXPLAIN itself is not timed
+        plan = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    except sqlite3.Error:
+        return None
+    depth = {0: -1}
+    lines = []
+    for node, parent, _, detail in plan:
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + detail)
+    return "\n".join(lines)
+
+
+def _record(conn, sql, params, caller, ms, rows, plan=None):
+    """Add one finished statement to the statistics and the slow-query log"""
+    with _lock:
+        stats = _stats.get((caller, sql))
+        if stats is None:
+            stats = _stats[(caller, sql)] = _QueryStats()
+        stats.histogram.add(ms)
+        stats.rows += rows
+
+    if ms < config.DB_SLOW_QUERY_MS:
+        return
+    if plan is None and conn is not None:
+        plan = _explain(conn, sql, params)
+    entry = {
+        'ts': time.time(),
+        'caller': caller,
+        'sql': sql,
+        'params': repr(params)[:200],
+        'ms': round(ms, 3),
+        'rows': rows,
+        'plan': plan,
+    }
+    with _lock:
+        _slow.append(entry)
+    telemetry.event("db.slow_query", telemetry.WARNING, **entry)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement until its rows are exhausted"""
+
+    _pending = None  # [sql, params, caller, ms, rows, plan] of the open statement
+
+    def _begin(self, sql, params, started):
+        elapsed = (time.perf_counter() - started) * 1000
+        sql = " ".join(sql.split())
+        plan = None
+        if elapsed >= config.DB_SLOW_QUERY_MS:
+            # Explain while this thread still owns the connection
+            plan = _explain(self.connection, sql, params)
+        self._pending = [sql, params, _caller(), elapsed, 0, plan]
+        if self.description is None:
+            self._pending[4] = max(self.rowcount, 0)
+            self._finish()
+
+    def _finish(self, explain=True):
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            sql, params, caller, ms, rows, plan = pending
+            _record(self.connection if explain else None, sql, params, caller, ms, rows, plan)
+
+    def _fetched(self, started, rows):
+        if self._pending is not None:
+            self._pending[3] += (time.perf_counter() - started) * 1000
+            self._pending[4] += rows
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._begin(sql, parameters, started)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._begin(sql, (), started)
+
+    def executescript(self, sql_script):
+        self._finish()
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._begin(sql_script, (), started)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(started, len(rows))
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows))
+        self._finish()
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._finish()
+            raise
+        self._fetched(started, 1)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # The connection may belong to another thread by now: record the
+        # timing, but only explain from the thread that ran the statement
+        self._finish(explain=False)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, including the execute() shortcuts, are timed"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connection_factory():
+    """Connection class for sqlite3.connect(), per config.DB_INSTRUMENT"""
+    return InstrumentedConnection if config.DB_INSTRUMENT else sqlite3.Connection
+
+
+def _summarize(caller, sql, histogram, rows):
+    return {
+        'caller': caller,
+        'sql': sql,
+        'count': histogram.count,
+        'rows': rows,
+        'total_ms': round(histogram.total_ms, 3),
+        'p50': round(histogram.percentile(50), 3),
+        'p95': round(histogram.percentile(95), 3),
+        'p99': round(histogram.percentile(99), 3),
+        'max_ms': round(histogram.max_ms, 3),
+    }
+
+
+def query_stats(group_by='statement'):
+    """Get timings per statement, or per caller with group_by='caller'.
+
+    Returns dicts with caller, sql (None when grouped by caller), count,
+    rows, total_ms, p50, p95, p99 and max_ms, slowest total first.
+    """
+    if group_by not in ('statement', 'caller'):
+        raise ValueError(f"Unknown grouping: {group_by}")
+
+    with _lock:
+        if group_by == 'statement':
+            results = [_summarize(caller, sql, stats.histogram, stats.rows)
+                       for (caller, sql), stats in _stats.items()]
+        else:
+            merged = {}
+            for (caller, _), stats in _stats.items():
+                histogram, rows = merged.get(caller, (Histogram(), 0))
+                histogram.merge(stats.histogram)
+                merged[caller] = (histogram, rows + stats.rows)
+            results = [_summarize(caller, None, histogram, rows)
+                       for caller, (histogram, rows) in merged.items()]
+
+    results.sort(key=lambda stats: stats['total_ms'], reverse=True)
+    return results
+
+
+def query_percentiles(caller=None):
+    """Get count, p50, p95 and p99 over all statements, or one caller's"""
+    histogram = Histogram()
+    with _lock:
+        for (stats_caller, _), stats in _stats.items():
+            if caller is None or stats_caller == caller:
+                histogram.merge(stats.histogram)
+    return {
+        'count': histogram.count,
+        'p50': round(histogram.percentile(50), 3),
+        'p95': round(histogram.percentile(95), 3),
+        'p99': round(histogram.percentile(99), 3),
+    }
+
+
+def slow_queries():
+    """Get the slow-query log, oldest first"""
+    with _lock:
+        return list(_slow)
+
+
+def dump_slow_queries(filepath):
+    """Write the slow-query log as JSON lines; returns the number written"""
+    entries = slow_queries()
+    with open(filepath, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return len(entries)
+
+
+def reset_query_stats():
+    """Forget all timings and the slow-query log"""
+    with _lock:
+        _stats.clear()
+        _slow.clear()
@@ -1,12 +1,54 @@
-"""Database models package - modular schema definitions"""
+"""Database models package - modular schema definitions
+
+The model functions are re-exported here, but each module is only imported
+the first time one of its names is looked up (see __getattr__), so importing
+the package does not load the reports, search and ledger code up front.
+"""
+import importlib
+
+# Modules whose public names are re-exported, in lookup order
+_SUBMODULES = ('categories', 'inventory', 'suppliers', 'transactions', 'ledger', 'users',
+               'reports', 'fulltext', 'schema', 'migrations')
+
+# Names re-exported from outside the package
+_EXTERNAL = {
+    'get_connection': 'database.connection',
+    'connection': 'database.connection',
+    'close_pool': 'database.connection',
+    'get_next_available_id': 'database.connection',
+    'query_stats': 'database.instrumentation',
+    'query_percentiles': 'database.instrumentation',
+    'slow_queries': 'database.instrumentation',
+    'dump_slow_queries': 'database.instrumentation',
+    'reset_query_stats': 'database.instrumentation',
+}
+
+
+def __getattr__(name):
+    """Import the module providing name on first use and cache the name here"""
+    if name in _EXTERNAL:
+        value = getattr(importlib.import_module(_EXTERNAL[name]), name)
+    elif name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    elif name.startswith('_'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    else:
+        for submodule in _SUBMODULES:
+            module = importlib.import_module(f'{__name__}.{submodule}')
+            # Like 'import *': only the names in a module's __all__, if it has one
+            public = getattr(module, '__all__', None)
+            if name in public if public is not None else hasattr(module, name):
+                value = getattr(module, name)
+                break
+        else:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
-from .categories import *
-from .inventory import *
-from .suppliers import *
-from .transactions import *
-from .users import *
-from .reports import *
-from .schema import *
 
 __all__ = [
     'get_categories',
@@ -15,22 +57,50 @@ __all__ = [
     'delete_category',
     'get_items',
     'add_item',
+    'add_items_bulk',
+    'update_items_bulk',
+    'upsert_items_bulk',
     'get_item_by_id', 
     'update_item',
     'delete_item',
     'view_items',
+    'count_items',
+    'view_items_window',
+    'view_item',
     'get_suppliers',
     'add_supplier',
     'update_supplier',
     'delete_supplier',
-    'get_transactions',
+    'get_transactions', 'get_transactions_page',
+    'count_transactions',
+    'get_transactions_window',
+    'get_transactions_cursor',
     'add_transaction',
+    'add_transactions_batch',
+    'stock_as_of',
+    'get_stock_ledger',
+    'rebuild_stock_ledger',
+    'check_stock_ledger',
     'generate_transaction_report',
     'generate_sales_report',
+    'rebuild_daily_rollup',
+    'generate_profit_loss_report',
     'generate_inventory_report',
     'generate_user_activity_report',
     'generate_supplier_report',
+    'generate_reports_batch',
+    'search',
+    'rebuild_search_index',
     'get_users',
     'get_connection',
-    'init_db'
+    'connection',
+    'close_pool',
+    'query_stats',
+    'query_percentiles',
+    'slow_queries',
+    'dump_slow_queries',
+    'reset_query_stats',
+    'init_db',
+    'migrate',
+    'get_schema_version'
 ]
@@ -1,69 +1,55 @@
 """Categories database model and operations"""
-import sqlite3
-import config
-
-
-def get_connection():
-    """Get database connection"""
-    return sqlite3.connect(config.DB_NAME)
+from database.connection import connection
 
 
 def add_category(name, description=None):
     """Add a new category"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    c.execute('''
-        INSERT INTO categories (name, description)
-        VALUES (?, ?)
-    ''', (name, description))
+    with connection() as conn:
+        c = conn.cursor()
     
-    conn.commit()
-    conn.close()
+        c.execute('''
+            INSERT INTO categories (name, description)
+            VALUES (?, ?)
+        ''', (name, description))
 
 
 def get_categories():
     """Get all categories"""
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
     
-    c.execute("SELECT * FROM categories ORDER BY name")
-    categories = c.fetchall()
-    conn.close()
+        c.execute("SELECT * FROM categories ORDER BY name")
+        categories = c.fetchall()
+
     return categories
 
 
 def update_category(category_id, name=None, description=None):
     """Update category"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # Build dynamic update query
-    updates = []
-    values = []
+    with connection() as conn:
+        c = conn.cursor()
     
-    if name is not None:
-        updates.append("name = ?")
-        values.append(name)
+        # Build dynamic update query
+        updates = []
+        values = []
     
-    if description is not None:
-        updates.append("description = ?")
-        values.append(description)
+        if name is not None:
+            updates.append("name = ?")
+            values.append(name)
     
-    if updates:
-        values.append(category_id)
-        query = f"UPDATE categories SET {', '.join(updates)} WHERE id = ?"
-        c.execute(query, values)
-        conn.commit()
+        if description is not None:
+            updates.append("description = ?")
+            values.append(description)
     
-    conn.close()
+        if updates:
+            values.append(category_id)
+            query = f"UPDATE categories SET {', '.join(updates)} WHERE id = ?"
+            c.execute(query, values)
 
 
 def delete_category(category_id):
     """Delete category"""
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
     
-    c.execute("DELETE FROM categories WHERE id = ?", (category_id,))
-    conn.commit()
-    conn.close()
+        c.execute("DELETE FROM categories WHERE id = ?", (category_id,))
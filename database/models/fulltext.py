@@ -0,0 +1,131 @@
+"""Full-text search over items, suppliers and transactions (SQLite FTS5)"""
+import re
+import config
+from database.connection import connection
+from database.models.schema import SEARCH_TABLES
+
+SEARCH_SCOPES = ('items', 'suppliers', 'transactions')
+
+_WORD = re.compile(r'\w+')
+
+# Per scope: the search table, how ties in rank are broken, and the rows
+# returned for its matches (in the shape of the scope's listing function)
+_SCOPE_QUERIES = {
+    'items': ('inventory_fts', 'rowid', '''
+        SELECT
+            m.rank,
+            i.id,
+            i.name,
+            i.category_id,
+            i.quantity,
+            i.price,
+            i.measurement_unit_id,
+            c.name AS category_name,
+            mu.unit_name,
+            mu.unit_symbol,
+            i.cost_price
+        FROM matches m
+        JOIN inventory i ON i.id = m.rowid
+        LEFT JOIN categories c ON i.category_id = c.id
+        LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
+    '''),
+    'suppliers': ('suppliers_fts', 'rowid', '''
+        SELECT m.rank, s.*
+        FROM matches m
+        JOIN suppliers s ON s.id = m.rowid
+    '''),
+    # Equally good matches newest first
+    'transactions': ('transactions_fts', 'rowid DESC', '''
+        SELECT m.rank, t.*, i.name AS item_name
+        FROM matches m
+        JOIN transactions t ON t.id = m.rowid
+        LEFT JOIN inventory i ON t.item_id = i.id
+    '''),
+}
+
+
+def _match_expression(query):
+    """FTS5 query requiring a word starting with each word of query, or None.
+
+    Each word is quoted, so text typed by a user is never read as FTS5
+    syntax (AND, NEAR, column filters, unbalanced quotes).
+    """
+    terms = _WORD.findall(query or "")
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _oldest_ranked(c, table, expression, limit):
+    """Lowest rowid worth ranking for a search returning limit rows.
+
+    bm25 costs about the same for every match, so a word in most rows
+    would be slow to rank. Reading matches in rowid order stops early,
+    so finding where the newest SEARCH_RANK_WINDOW of them begin is cheap.
+    """
+    if limit is None:
+        return 0
+    c.execute(f"SELECT rowid FROM {table} WHERE {table} MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+              (expression, max(config.SEARCH_RANK_WINDOW, limit) - 1))
+    row = c.fetchone()
+    return 0 if row is None else row[0]
+
+
+def search(query, scope=None, limit=None):
+    """Find the items, suppliers and transactions matching query, best first.
+
+    Every word of query must start a word of the row: an item's name or
+    category, a supplier's name, contact, email or phone, or a
+    transaction's notes or item name. Matches are ranked by bm25, with
+    names weighing most; with a limit, only the newest SEARCH_RANK_WINDOW
+    matches of a scope are ranked. scope is one of SEARCH_SCOPES or a list
+    of them (default all of them).
+
+    Returns up to limit (scope, row) pairs; rows are shaped like those of
+    view_items(), get_suppliers() and get_transactions_window().
+    """
+    if scope is None:
+        scopes = SEARCH_SCOPES
+    else:
+        scopes = (scope,) if isinstance(scope, str) else tuple(scope)
+    unknown = [name for name in scopes if name not in _SCOPE_QUERIES]
+    if unknown:
+        raise ValueError(f"Unknown search scope(s): {', '.join(unknown)}")
+
+    expression = _match_expression(query)
+    if expression is None or limit == 0:
+        return []
+
+    found = []
+    with connection() as conn:
+        c = conn.cursor()
+        for name in scopes:
+            table, tie_break, select = _SCOPE_QUERIES[name]
+            oldest = _oldest_ranked(c, table, expression, limit)
+            # Rank and cut the matches in the index before reading any rows
+            c.execute(f'''
+                WITH matches AS MATERIALIZED (
+                    SELECT rowid, rank FROM {table} WHERE {table} MATCH ? AND rowid >= ?
+                    ORDER BY rank, {tie_break} LIMIT ?
+                )
+                {select}
+                ORDER BY m.rank, m.{tie_break}
+            ''', (expression, oldest, -1 if limit is None else limit))
+            found.extend((row[0], position, name, row[1:]) for position, row in enumerate(c.fetchall()))
+
+    # bm25 scores from different tables are only roughly comparable, but
+    # each scope keeps its own order
+    found.sort(key=lambda match: match[:2])
+    return [(name, row) for _, _, name, row in found[:limit]]
+
+
+def rebuild_search_index():
+    """Index every item, supplier and transaction again.
+
+    The triggers keep the search tables current; this is for databases
+    changed with the triggers missing, e.g. restored from an old backup.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        for table, _, _, _ in SEARCH_TABLES:
+            c.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
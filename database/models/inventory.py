@@ -1,160 +1,397 @@
 """Inventory database model and operations"""
-import sqlite3
+import time
+from itertools import islice
 import config
-
-# region agent log
-import os as _agent_os
-_DEBUG_LOG_PATH = _agent_os.path.join(_agent_os.path.dirname(_agent_os.path.abspath(__file__)), "..", "..", "debug-31c49c.log")
-
-def _agent_log(hypothesisId: str, location: str, message: str, data: dict | None = None, runId: str = "pre-fix"):
-    try:
-        import json, time
-        payload = {
-            "sessionId": "31c49c",
-            "runId": runId,
-            "hypothesisId": hypothesisId,
-            "location": location,
-            "message": message,
-            "data": data or {},
-            "timestamp": int(time.time() * 1000),
-        }
-        with open(_DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
-    except Exception:
-        pass
-# endregion
-
-
-def get_connection():
-    """Get database connection"""
-    return sqlite3.connect(config.DB_NAME)
+from database.connection import connection
+from database.models.ledger import _post_adjustments
+from utils import telemetry
 
 
 def add_item(name, category_id, quantity, cost_price):
-    """Add a new inventory item"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    c.execute('''
-        INSERT INTO inventory (name, category_id, quantity, price, cost_price)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (name, category_id, quantity, 0.0, cost_price))
+    """Add a new inventory item; returns its id"""
+    with connection() as conn:
+        c = conn.cursor()
     
-    conn.commit()
-    conn.close()
+        c.execute('''
+            INSERT INTO inventory (name, category_id, quantity, price, cost_price)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (name, category_id, quantity, 0.0, cost_price))
+        return c.lastrowid
 
 
 def get_items():
     """Get all inventory items"""
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
     
-    c.execute('''
-        SELECT i.*, c.name, mu.unit_name, mu.unit_symbol
-        FROM inventory i
-        LEFT JOIN categories c ON i.category_id = c.id
-        LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
-        ORDER BY i.name
-    ''')
+        c.execute('''
+            SELECT i.*, c.name, mu.unit_name, mu.unit_symbol
+            FROM inventory i
+            LEFT JOIN categories c ON i.category_id = c.id
+            LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
+            ORDER BY i.name
+        ''')
     
-    items = c.fetchall()
-    conn.close()
+        items = c.fetchall()
+
     return items
 
 
 def get_item_by_id(item_id):
     """Get item by ID"""
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
     
-    c.execute('''
-        SELECT i.*, c.name, mu.unit_name, mu.unit_symbol
-        FROM inventory i
-        LEFT JOIN categories c ON i.category_id = c.id
-        LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
-        WHERE i.id = ?
-    ''', (item_id,))
+        c.execute('''
+            SELECT i.*, c.name, mu.unit_name, mu.unit_symbol
+            FROM inventory i
+            LEFT JOIN categories c ON i.category_id = c.id
+            LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
+            WHERE i.id = ?
+        ''', (item_id,))
     
-    item = c.fetchone()
-    conn.close()
+        item = c.fetchone()
+
     return item
 
 
 def update_item(item_id, name=None, category_id=None, quantity=None, cost_price=None):
-    """Update inventory item"""
-    conn = get_connection()
-    c = conn.cursor()
+    """Update inventory item; a new quantity is recorded as a ledger adjustment"""
+    with connection() as conn:
+        c = conn.cursor()
     
-    # Build dynamic update query
-    updates = []
-    values = []
+        # Build dynamic update query
+        updates = []
+        values = []
     
-    if name is not None:
-        updates.append("name = ?")
-        values.append(name)
+        if name is not None:
+            updates.append("name = ?")
+            values.append(name)
     
-    if category_id is not None:
-        updates.append("category_id = ?")
-        values.append(category_id)
+        if category_id is not None:
+            updates.append("category_id = ?")
+            values.append(category_id)
     
-    if quantity is not None:
-        updates.append("quantity = ?")
-        values.append(quantity)
+        if quantity is not None:
+            updates.append("quantity = ?")
+            values.append(quantity)
     
-    if cost_price is not None:
-        updates.append("cost_price = ?")
-        values.append(cost_price)
+        if cost_price is not None:
+            updates.append("cost_price = ?")
+            values.append(cost_price)
     
-    if updates:
-        updates.append("updated_at = CURRENT_TIMESTAMP")
-        values.append(item_id)
+        if updates:
+            updates.append("updated_at = CURRENT_TIMESTAMP")
+            values.append(item_id)
         
-        query = f"UPDATE inventory SET {', '.join(updates)} WHERE id = ?"
-        c.execute(query, values)
-        conn.commit()
-    
-    conn.close()
+            previous = None
+            if quantity is not None:
+                c.execute("SELECT quantity FROM inventory WHERE id = ?", (item_id,))
+                previous = c.fetchone()
+        
+            query = f"UPDATE inventory SET {', '.join(updates)} WHERE id = ?"
+            c.execute(query, values)
+            if previous is not None:
+                _post_adjustments(c, [(item_id, quantity - previous[0])])
 
 
 def delete_item(item_id):
-    """Delete inventory item"""
-    conn = get_connection()
-    c = conn.cursor()
+    """Delete inventory item and its stock ledger rows"""
+    with connection() as conn:
+        c = conn.cursor()
     
-    c.execute("DELETE FROM inventory WHERE id = ?", (item_id,))
-    conn.commit()
-    conn.close()
+        c.execute("DELETE FROM inventory WHERE id = ?", (item_id,))
+        # The id may be reused, so the new item must not inherit this history
+        c.execute("DELETE FROM stock_ledger WHERE item_id = ?", (item_id,))
+        c.execute("DELETE FROM stock_adjustments WHERE item_id = ?", (item_id,))
 
 
 def view_items():
     """Get all inventory items with category and unit info"""
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
     
-    c.execute('''
-        SELECT
-            i.id,
-            i.name,
-            i.category_id,
-            i.quantity,
-            i.price,
-            i.measurement_unit_id,
-            c.name AS category_name,
-            mu.unit_name,
-            mu.unit_symbol,
-            i.cost_price
-        FROM inventory i
-        LEFT JOIN categories c ON i.category_id = c.id
-        LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
-        ORDER BY i.name
-    ''')
+        c.execute('''
+            SELECT
+                i.id,
+                i.name,
+                i.category_id,
+                i.quantity,
+                i.price,
+                i.measurement_unit_id,
+                c.name AS category_name,
+                mu.unit_name,
+                mu.unit_symbol,
+                i.cost_price
+            FROM inventory i
+            LEFT JOIN categories c ON i.category_id = c.id
+            LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
+            ORDER BY i.name
+        ''')
     
-    items = c.fetchall()
-    _agent_log(
-        "H-view-items",
-        "database/models/inventory.py:view_items",
-        "Fetched inventory items",
-        {"rows": len(items), "cols_first_row": (len(items[0]) if items else 0)},
-    )
-    conn.close()
+        items = c.fetchall()
+    
+    telemetry.event("inventory.view_items", telemetry.DEBUG, rows=len(items))
+
     return items
+
+
+def count_items():
+    """Get the number of inventory items"""
+    with connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM inventory").fetchone()[0]
+
+
+def view_items_window(offset, limit):
+    """Get view_items() rows by position, for scrolling through large inventories.
+
+    Rows are in (name, id) order. The offset is skipped on the name index
+    alone, before any join, so a window deep into the list costs little
+    more than the first one.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            SELECT
+                i.id,
+                i.name,
+                i.category_id,
+                i.quantity,
+                i.price,
+                i.measurement_unit_id,
+                c.name AS category_name,
+                mu.unit_name,
+                mu.unit_symbol,
+                i.cost_price
+            FROM (SELECT id FROM inventory ORDER BY name, id LIMIT ? OFFSET ?) page
+            JOIN inventory i ON i.id = page.id
+            LEFT JOIN categories c ON i.category_id = c.id
+            LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
+            ORDER BY i.name, i.id
+        ''', (limit, offset))
+        return c.fetchall()
+
+
+def view_item(item_id):
+    """Get one item as a view_items() row, or None if it does not exist"""
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            SELECT
+                i.id,
+                i.name,
+                i.category_id,
+                i.quantity,
+                i.price,
+                i.measurement_unit_id,
+                c.name AS category_name,
+                mu.unit_name,
+                mu.unit_symbol,
+                i.cost_price
+            FROM inventory i
+            LEFT JOIN categories c ON i.category_id = c.id
+            LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
+            WHERE i.id = ?
+        ''', (item_id,))
+        return c.fetchone()
+
+
+ITEM_FIELDS = ('name', 'category', 'quantity', 'cost_price')
+
+
+def _chunks(rows, size):
+    """Yield lists of up to size rows from any iterable"""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Numeric fields of a bulk row and how text values (e.g. from CSV) are read
+_NUMERIC_FIELDS = (('id', int), ('quantity', int), ('cost_price', float))
+
+
+def _normalize_item(row):
+    """Turn a mapping or (name, category, quantity, cost_price) tuple into a dict.
+
+    Numeric fields given as text are converted; raises ValueError for a
+    value that is not a number.
+    """
+    row = dict(row) if isinstance(row, dict) else dict(zip(ITEM_FIELDS, row))
+    for field, convert in _NUMERIC_FIELDS:
+        if isinstance(row.get(field), str):
+            try:
+                row[field] = convert(row[field])
+            except ValueError:
+                raise ValueError(f"Invalid {field}: {row[field]!r}") from None
+    return row
+
+
+class _CategoryResolver:
+    """Resolve category names to ids from a single lookup map"""
+
+    def __init__(self, create_missing):
+        self.create_missing = create_missing
+        with connection() as conn:
+            self.ids = {name: category_id for category_id, name in conn.execute("SELECT id, name FROM categories")}
+
+    def resolve(self, conn, row):
+        """Return the category id for a row, or raise ValueError"""
+        if row.get('category_id') is not None:
+            return row['category_id']
+
+        name = row.get('category')
+        if not name:
+            return None
+        if name not in self.ids:
+            if not self.create_missing:
+                raise ValueError(f"Category not found: {name}")
+            cursor = conn.execute("INSERT INTO categories (name) VALUES (?)", (name,))
+            self.ids[name] = cursor.lastrowid
+        return self.ids[name]
+
+
+def _bulk_result(rows, skipped, started):
+    """Build the summary returned by the bulk APIs, skipped rows in row order"""
+    seconds = time.perf_counter() - started
+    return {
+        'rows': rows,
+        'skipped': sorted(skipped),
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds else 0.0,
+    }
+
+
+def _bulk_write(rows, chunk_size, create_categories, write_chunk):
+    """Resolve categories and hand each chunk to write_chunk in its own transaction.
+
+    write_chunk(conn, rows, skipped) gets (row_number, row) pairs, appends
+    the rows it cannot write to skipped and returns the number written.
+    """
+    started = time.perf_counter()
+    resolver = _CategoryResolver(create_categories)
+    written = 0
+    skipped = []
+    row_number = 0
+
+    for chunk in _chunks(rows, chunk_size or config.BULK_CHUNK_SIZE):
+        with connection() as conn:
+            resolved = []
+            for row in chunk:
+                try:
+                    row = _normalize_item(row)
+                    row['category_id'] = resolver.resolve(conn, row)
+                except ValueError as e:
+                    skipped.append((row_number, str(e)))
+                else:
+                    resolved.append((row_number, row))
+                row_number += 1
+            written += write_chunk(conn, resolved, skipped)
+
+    return _bulk_result(written, skipped, started)
+
+
+def _insert_chunk(conn, rows, skipped):
+    """Insert resolved item rows"""
+    cursor = conn.executemany('''
+        INSERT INTO inventory (name, category_id, quantity, price, cost_price)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(row['name'], row['category_id'], row.get('quantity') or 0, 0.0, row.get('cost_price') or 0.0)
+          for _, row in rows])
+    return cursor.rowcount
+
+
+def _update_chunk(conn, rows, skipped):
+    """Update resolved item rows by id; None fields keep their current value.
+
+    Rows without an id or with an unknown one are skipped. Changed
+    quantities are recorded as ledger adjustments.
+    """
+    ids = list({row['id'] for _, row in rows if row.get('id') is not None})
+    previous = {}
+    # Stay under SQLite's default limit on bound parameters
+    for start in range(0, len(ids), 900):
+        batch = ids[start:start + 900]
+        placeholders = ", ".join("?" * len(batch))
+        previous.update(conn.execute(f"SELECT id, quantity FROM inventory WHERE id IN ({placeholders})", batch))
+
+    found = []
+    for row_number, row in rows:
+        if row.get('id') is None:
+            skipped.append((row_number, "Missing id"))
+        elif row['id'] not in previous:
+            skipped.append((row_number, f"Item not found: {row['id']}"))
+        else:
+            found.append(row)
+    if not found:
+        return 0
+
+    cursor = conn.executemany('''
+        UPDATE inventory SET
+            name = COALESCE(?, name),
+            category_id = COALESCE(?, category_id),
+            quantity = COALESCE(?, quantity),
+            cost_price = COALESCE(?, cost_price),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    ''', [(row.get('name'), row['category_id'], row.get('quantity'), row.get('cost_price'), row['id'])
+          for row in found])
+
+    current = dict(previous)
+    for row in found:
+        if row.get('quantity') is not None:
+            current[row['id']] = row['quantity']
+    _post_adjustments(conn.cursor(), [(item_id, current[item_id] - quantity)
+                                      for item_id, quantity in previous.items()])
+    return cursor.rowcount
+
+
+def _upsert_chunk(conn, rows, skipped):
+    """Update items whose name already exists and insert the rest"""
+    names = list({row['name'] for _, row in rows})
+    existing = {}
+    # Stay under SQLite's default limit on bound parameters
+    for start in range(0, len(names), 900):
+        batch = names[start:start + 900]
+        placeholders = ", ".join("?" * len(batch))
+        for item_id, name in conn.execute(
+                f"SELECT id, name FROM inventory WHERE name IN ({placeholders})", batch):
+            existing.setdefault(name, item_id)
+
+    updates = [(row_number, dict(row, id=existing[row['name']]))
+               for row_number, row in rows if row['name'] in existing]
+    inserts = [(row_number, row) for row_number, row in rows if row['name'] not in existing]
+    return _update_chunk(conn, updates, skipped) + _insert_chunk(conn, inserts, skipped)
+
+
+def add_items_bulk(rows, chunk_size=None, create_categories=False):
+    """Insert many inventory items with executemany in chunked transactions.
+
+    rows may be any iterable of dicts (name, category or category_id,
+    quantity, cost_price) or (name, category, quantity, cost_price) tuples;
+    it is consumed lazily. Numbers may be given as text. Rows with a
+    malformed number are skipped, and so are rows with an unknown category
+    unless create_categories is set. Returns a dict with rows, skipped
+    [(row_number, reason)], seconds and rows_per_sec.
+    """
+    return _bulk_write(rows, chunk_size, create_categories, _insert_chunk)
+
+
+def update_items_bulk(rows, chunk_size=None, create_categories=False):
+    """Update many inventory items by id in chunked transactions.
+
+    Each row is a dict with an 'id' plus any fields to change; rows with no
+    id or an unknown one are skipped. Returns the same summary as
+    add_items_bulk(), counting the rows actually updated.
+    """
+    return _bulk_write(rows, chunk_size, create_categories, _update_chunk)
+
+
+def upsert_items_bulk(rows, chunk_size=None, create_categories=False):
+    """Update items matched by name and insert new ones, in chunked transactions.
+
+    Returns the same summary as add_items_bulk().
+    """
+    return _bulk_write(rows, chunk_size, create_categories, _upsert_chunk)
@@ -0,0 +1,274 @@
+"""Per-item stock ledger: running balances and stock-at-date lookups"""
+from datetime import datetime
+import config
+from database.connection import connection
+from database.models.reports import _is_whole_day, _next_day
+
+
+# Stock change of a transactions row
+_CHANGE = f"CASE WHEN t.transaction_type = '{config.TRANSACTION_TYPE_OUT}' THEN -t.quantity ELSE t.quantity END"
+
+# Every change of stock: movements, and edits of inventory.quantity recorded
+# in stock_adjustments. Adjustments take the negated adjustment id as their
+# ledger transaction_id, so the two never collide.
+_MOVEMENTS = f'''
+    SELECT t.id, t.item_id, t.date, {_CHANGE} AS quantity_change FROM transactions t
+    UNION ALL
+    SELECT -a.id, a.item_id, a.date, a.quantity_change FROM stock_adjustments a
+'''
+
+
+def _expected_ledger(where=""):
+    """SQL for the ledger as it should be, optionally for some items only.
+
+    Balances are anchored on the current inventory.quantity: each
+    movement's balance is today's stock minus every later change, so stock
+    set when an item was created counts as opening stock. where filters
+    the changes, aliased m.
+    """
+    return f'''
+        SELECT id AS transaction_id, item_id, date, quantity_change,
+               current_quantity - COALESCE(SUM(quantity_change) OVER (
+                   PARTITION BY item_id ORDER BY date DESC, id DESC
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ), 0) AS balance
+        FROM (
+            SELECT m.id, m.item_id, m.date, m.quantity_change, i.quantity AS current_quantity
+            FROM ({_MOVEMENTS}) m
+            JOIN inventory i ON i.id = m.item_id
+            {where}
+        )
+    '''
+
+
+def _latest_entry(c, item_id):
+    """Get the (date, balance) of an item's newest ledger row"""
+    c.execute('''
+        SELECT date, balance FROM stock_ledger
+        WHERE item_id = ?
+        ORDER BY date DESC, transaction_id DESC
+        LIMIT 1
+    ''', (item_id,))
+    return c.fetchone()
+
+
+def _post_to_ledger(c, after_id):
+    """Add ledger rows for every transaction with an id above after_id.
+
+    Called by the posting functions inside their write transaction, after
+    inventory.quantity has been updated.
+    """
+    c.execute(f'''
+        SELECT t.id, t.item_id, t.date, {_CHANGE}
+        FROM transactions t
+        WHERE t.id > ?
+        ORDER BY t.id
+    ''', (after_id,))
+    _post_changes(c, c.fetchall())
+
+
+def _post_adjustments(c, changes):
+    """Record edits of inventory.quantity as ledger adjustments.
+
+    changes are (item_id, quantity_change) pairs, already applied to
+    inventory.quantity in the caller's write transaction. They are summed
+    into one adjustment per item, dated now to the microsecond so that
+    later adjustments of an item always sort after earlier ones.
+    """
+    totals = {}
+    for item_id, change in changes:
+        totals[item_id] = totals.get(item_id, 0) + change
+    rows = [(item_id, change) for item_id, change in totals.items() if change]
+    if not rows:
+        return
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+    c.execute("SELECT COALESCE(MAX(id), 0) FROM stock_adjustments")
+    after_id = c.fetchone()[0]
+    c.executemany("INSERT INTO stock_adjustments (item_id, date, quantity_change) VALUES (?, ?, ?)",
+                  [(item_id, now, change) for item_id, change in rows])
+    c.execute('''
+        SELECT -id, item_id, date, quantity_change
+        FROM stock_adjustments
+        WHERE id > ?
+        ORDER BY id
+    ''', (after_id,))
+    _post_changes(c, c.fetchall())
+
+
+def _post_changes(c, changes):
+    """Add ledger rows for (transaction_id, item_id, date, quantity_change) rows.
+
+    Changes dated on or after an item's newest ledger row are appended with
+    a running balance; a single back-dated change is slotted in and the
+    later balances are shifted, and items with several back-dated changes
+    are rebuilt.
+    """
+    by_item = {}
+    for transaction_id, item_id, date, change in changes:
+        by_item.setdefault(item_id, []).append((transaction_id, date, change))
+
+    rows = []
+    rebuild = []
+    for item_id, movements in by_item.items():
+        latest = _latest_entry(c, item_id)
+
+        if latest is None or all(date >= latest[0] for _, date, _ in movements):
+            if latest is None:
+                # First movements: whatever stock the item had before is opening stock
+                c.execute("SELECT quantity FROM inventory WHERE id = ?", (item_id,))
+                balance = c.fetchone()[0] - sum(change for _, _, change in movements)
+            else:
+                balance = latest[1]
+            for transaction_id, date, change in sorted(movements, key=lambda m: (m[1], m[0])):
+                balance += change
+                rows.append((transaction_id, item_id, date, change, balance))
+            continue
+
+        if len(movements) > 1:
+            rebuild.append(item_id)
+            continue
+
+        transaction_id, date, change = movements[0]
+        # New transaction ids are the highest, so the movement goes after
+        # every row on its date
+        c.execute('''
+            SELECT balance FROM stock_ledger
+            WHERE item_id = ? AND date <= ?
+            ORDER BY date DESC, transaction_id DESC
+            LIMIT 1
+        ''', (item_id, date))
+        previous = c.fetchone()
+        if previous is None:
+            c.execute('''
+                SELECT balance - quantity_change FROM stock_ledger
+                WHERE item_id = ?
+                ORDER BY date, transaction_id
+                LIMIT 1
+            ''', (item_id,))
+            previous = c.fetchone()
+
+        c.execute("UPDATE stock_ledger SET balance = balance + ? WHERE item_id = ? AND date > ?",
+                  (change, item_id, date))
+        rows.append((transaction_id, item_id, date, change, previous[0] + change))
+
+    c.executemany('''
+        INSERT INTO stock_ledger (transaction_id, item_id, date, quantity_change, balance)
+        VALUES (?, ?, ?, ?, ?)
+    ''', rows)
+    if rebuild:
+        rebuild_stock_ledger(rebuild)
+
+
+def stock_as_of(item_id, date):
+    """Get an item's stock at the end of the given date.
+
+    A date without a time of day includes changes made later that day.
+    Answered from the ledger with one index seek. Returns None for an
+    unknown item.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+
+        if _is_whole_day(date):
+            condition, bound = "date < ?", _next_day(date)
+        else:
+            condition, bound = "date <= ?", date
+        c.execute(f'''
+            SELECT balance FROM stock_ledger
+            WHERE item_id = ? AND {condition}
+            ORDER BY date DESC, transaction_id DESC
+            LIMIT 1
+        ''', (item_id, bound))
+        row = c.fetchone()
+        if row:
+            return row[0]
+
+        # Before the first movement: opening stock
+        c.execute('''
+            SELECT balance - quantity_change FROM stock_ledger
+            WHERE item_id = ?
+            ORDER BY date, transaction_id
+            LIMIT 1
+        ''', (item_id,))
+        row = c.fetchone()
+        if row:
+            return row[0]
+
+        # No movements at all
+        c.execute("SELECT quantity FROM inventory WHERE id = ?", (item_id,))
+        row = c.fetchone()
+
+    return row[0] if row else None
+
+
+def get_stock_ledger(item_id):
+    """Get an item's ledger rows (transaction_id, date, quantity_change, balance), oldest first"""
+    with connection() as conn:
+        c = conn.cursor()
+
+        c.execute('''
+            SELECT transaction_id, date, quantity_change, balance
+            FROM stock_ledger
+            WHERE item_id = ?
+            ORDER BY date, transaction_id
+        ''', (item_id,))
+
+        ledger = c.fetchall()
+
+    return ledger
+
+
+def rebuild_stock_ledger(item_ids=None):
+    """Rebuild the ledger from the transactions table in one set-based pass.
+
+    Rebuilds every item, or only item_ids. Returns the number of ledger
+    rows written.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+
+        if item_ids is None:
+            c.execute("DELETE FROM stock_ledger")
+            c.execute(f"INSERT INTO stock_ledger {_expected_ledger()}")
+            return c.rowcount
+
+        written = 0
+        item_ids = list(item_ids)
+        # Stay under SQLite's default limit on bound parameters
+        for start in range(0, len(item_ids), 900):
+            batch = item_ids[start:start + 900]
+            placeholders = ", ".join("?" * len(batch))
+            c.execute(f"DELETE FROM stock_ledger WHERE item_id IN ({placeholders})", batch)
+            c.execute(f"INSERT INTO stock_ledger {_expected_ledger(f'WHERE m.item_id IN ({placeholders})')}", batch)
+            written += c.rowcount
+        return written
+
+
+def check_stock_ledger(repair=False):
+    """Find items whose ledger disagrees with transactions and current stock.
+
+    Catches movements missing from the ledger, rows for deleted items and
+    drift from edits of inventory.quantity that bypassed update_item() and
+    the bulk APIs, which record theirs as adjustments. With repair, the
+    affected items are rebuilt. Returns the sorted list of item ids that
+    were inconsistent.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+
+        c.execute(f'''
+            WITH expected AS ({_expected_ledger()}),
+            actual AS (
+                SELECT transaction_id, item_id, date, quantity_change, balance FROM stock_ledger
+            )
+            SELECT item_id FROM (SELECT * FROM expected EXCEPT SELECT * FROM actual)
+            UNION
+            SELECT item_id FROM (SELECT * FROM actual EXCEPT SELECT * FROM expected)
+            ORDER BY item_id
+        ''')
+        item_ids = [row[0] for row in c.fetchall()]
+
+        if repair and item_ids:
+            rebuild_stock_ledger(item_ids)
+
+    return item_ids
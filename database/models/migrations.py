@@ -0,0 +1,151 @@
+"""Versioned schema migrations keyed on PRAGMA user_version"""
+from database.connection import connection
+from database.models import schema, reports
+from database.models.fulltext import rebuild_search_index
+
+
+def _create_base_tables(conn):
+    """Create the original tables and default measurement units"""
+    # The create_* helpers borrow the same pooled connection, so they run
+    # inside the migration transaction
+    schema.init_db()
+    schema.create_categories_table()
+    schema.create_suppliers_table()
+    schema.create_transactions_table(movement_tables=False)
+    schema.create_users_table()
+    schema.create_measurement_units_table()
+    schema.init_default_measurement_units()
+
+
+def _add_missing_columns(conn):
+    """Upgrade tables created by older releases"""
+    schema.add_missing_columns()
+
+
+def _create_indexes(conn, indexes):
+    """Create (index name, table (columns)) indexes"""
+    for index_name, definition in indexes:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {definition}")
+
+
+def _create_report_indexes(conn):
+    """Add secondary indexes for the report and listing queries"""
+    _create_indexes(conn, [
+        ('idx_transactions_date_type_item', 'transactions (date, transaction_type, item_id)'),
+        ('idx_transactions_type_date', 'transactions (transaction_type, date, item_id, quantity, selling_price)'),
+        ('idx_transactions_item_date', 'transactions (item_id, date)'),
+        ('idx_inventory_name', 'inventory (name)'),
+        ('idx_inventory_category', 'inventory (category_id)'),
+    ])
+
+
+def _create_paging_index(conn):
+    """Index transactions by date for keyset paging of the history"""
+    _create_indexes(conn, [('idx_transactions_date', 'transactions (date)')])
+
+
+def _create_low_stock_index(conn):
+    """Index inventory by quantity for the low-stock listing"""
+    _create_indexes(conn, [('idx_inventory_quantity', 'inventory (quantity)')])
+
+
+def _create_free_ids(conn):
+    """Track deleted ids so get_next_available_id() is an index lookup"""
+    schema.create_free_ids_table()
+
+
+def _create_stock_ledger(conn):
+    """Add the stock ledger and fill it from the existing history"""
+    schema.create_stock_ledger_table()
+    # The ledger as of this version: transactions only, balances anchored
+    # on the current stock
+    conn.execute('''
+        INSERT INTO stock_ledger
+        SELECT id, item_id, date, quantity_change,
+               current_quantity - COALESCE(SUM(quantity_change) OVER (
+                   PARTITION BY item_id ORDER BY date DESC, id DESC
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ), 0)
+        FROM (
+            SELECT t.id, t.item_id, t.date,
+                   CASE WHEN t.transaction_type = 'OUT' THEN -t.quantity ELSE t.quantity END AS quantity_change,
+                   i.quantity AS current_quantity
+            FROM transactions t
+            JOIN inventory i ON i.id = t.item_id
+        )
+    ''')
+
+
+def _create_daily_rollup(conn):
+    """Add the daily per-item rollup and fill it from the existing history"""
+    schema.create_daily_rollup_table()
+    reports._fill_daily_rollup(conn.cursor())
+
+
+def _create_profit_loss_cache(conn):
+    """Add the closed-period profit & loss cache"""
+    schema.create_profit_loss_tables()
+
+
+def _create_search_tables(conn):
+    """Add the full-text search tables and index the existing rows"""
+    schema.create_search_tables()
+    rebuild_search_index()
+
+
+def _create_stock_adjustments(conn):
+    """Keep edits of inventory.quantity in the stock ledger"""
+    schema.create_stock_adjustments_table()
+
+
+# Numbered migrations, applied in order. Never edit or renumber a released
+# migration; append a new one instead. A migration must not depend on
+# schema helpers that later changes may extend, so each one spells out
+# what it creates.
+MIGRATIONS = [
+    (1, "Create base tables", _create_base_tables),
+    (2, "Add columns missing from older databases", _add_missing_columns),
+    (3, "Create secondary indexes", _create_report_indexes),
+    (4, "Track free ids for reuse", _create_free_ids),
+    (5, "Index transactions by date for paging", _create_paging_index),
+    (6, "Materialize the per-item stock ledger", _create_stock_ledger),
+    (7, "Roll up movements per item and day", _create_daily_rollup),
+    (8, "Cache profit & loss of closed periods", _create_profit_loss_cache),
+    (9, "Index inventory by quantity for low-stock reports", _create_low_stock_index),
+    (10, "Full-text search over items, suppliers and transaction notes", _create_search_tables),
+    (11, "Record stock level edits as ledger adjustments", _create_stock_adjustments),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version():
+    """Get the migration version recorded in the database"""
+    with connection() as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate():
+    """Apply pending migrations in a single transaction.
+
+    A database that is already current costs one PRAGMA read. Returns the
+    list of migration versions that were applied.
+    """
+    with connection() as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return []
+
+        # Take the write lock before re-reading the version so two processes
+        # starting together don't both apply the same migrations
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        current = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        applied = []
+        for version, description, apply in MIGRATIONS:
+            if version > current:
+                apply(conn)
+                applied.append(version)
+
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return applied
@@ -1,20 +1,185 @@
 """Reports database model and operations"""
-import sqlite3
-from datetime import datetime
+import os
+import sys
+import time
+from datetime import datetime, timedelta
 import config
+from database.connection import connection, QueryStream
 
+__all__ = [
+    'rebuild_daily_rollup',
+    'generate_transaction_report',
+    'generate_sales_report',
+    'generate_profit_loss_report',
+    'generate_inventory_report',
+    'generate_supplier_report',
+    'generate_reports_batch',
+    'print_batch_summary',
+    'BATCH_REPORTS',
+    'TRANSACTION_REPORT_COLUMNS',
+    'SALES_REPORT_COLUMNS',
+    'INVENTORY_REPORT_COLUMNS',
+]
 
-def get_connection():
-    """Get database connection"""
-    return sqlite3.connect(config.DB_NAME)
 
+def _date_conditions(column, start_date=None, end_date=None):
+    """Build WHERE conditions and params for an optional date range.
 
-def generate_transaction_report(start_date=None, end_date=None):
-    """Generate transaction report"""
-    conn = get_connection()
-    c = conn.cursor()
+    A date-only end_date covers that whole day, as in the rollup-based
+    totals, so movements with a time later that day are included.
+    """
+    conditions = []
+    params = []
+    if start_date:
+        conditions.append(f"{column} >= ?")
+        params.append(start_date)
+    
+    if end_date and _is_whole_day(end_date):
+        conditions.append(f"{column} < ?")
+        params.append(_next_day(end_date))
+    elif end_date:
+        conditions.append(f"{column} <= ?")
+        params.append(end_date)
+    
+    return conditions, params
+
+
+# Per-item movement totals aggregated from transactions t joined to inventory i;
+# the figures kept in daily_item_rollup
+_RAW_TOTALS = f'''
+    SUM(CASE WHEN t.transaction_type = '{config.TRANSACTION_TYPE_IN}' THEN t.quantity ELSE 0 END) AS qty_in,
+    SUM(CASE WHEN t.transaction_type = '{config.TRANSACTION_TYPE_OUT}' THEN t.quantity ELSE 0 END) AS qty_out,
+    SUM(CASE WHEN t.transaction_type = '{config.TRANSACTION_TYPE_OUT}'
+        THEN t.quantity * COALESCE(t.selling_price, 0.0) ELSE 0.0 END) AS revenue,
+    SUM(CASE WHEN t.transaction_type = '{config.TRANSACTION_TYPE_OUT}'
+        THEN t.quantity * COALESCE(i.cost_price, 0.0) ELSE 0.0 END) AS cost
+'''
+
+
+def _is_whole_day(bound):
+    """Check whether a date bound covers whole days (no time of day)"""
+    return len(bound) <= 10
+
+
+def _next_day(day):
+    """The day after a YYYY-MM-DD date, as YYYY-MM-DD"""
+    return (datetime.strptime(day[:10], "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def _daily_totals_source(start_date=None, end_date=None):
+    """Build a subquery of per-item totals for a date range.
+
+    Whole days are read from daily_item_rollup. A bound carrying a time of
+    day only covers part of its day, so that day is aggregated from the raw
+    transactions instead. The subquery has the columns item_id, qty_in,
+    qty_out, revenue and cost, possibly several rows per item.
+    """
+    start_partial = bool(start_date) and not _is_whole_day(start_date)
+    end_partial = bool(end_date) and not _is_whole_day(end_date)
     
-    # Build query with date filters
+    if start_partial and end_partial and start_date[:10] == end_date[:10]:
+        # Both bounds inside one day: nothing for the rollup to answer
+        parts, params = [], []
+        raw_ranges = [(start_date, end_date, False)]
+    else:
+        raw_ranges = []
+        rollup_conditions, rollup_params = [], []
+        if start_date:
+            rollup_conditions.append("day > ?" if start_partial else "day >= ?")
+            rollup_params.append(start_date[:10])
+        if end_date:
+            rollup_conditions.append("day < ?" if end_partial else "day <= ?")
+            rollup_params.append(end_date[:10])
+        
+        if start_partial:
+            raw_ranges.append((start_date, _next_day(start_date), True))
+        if end_partial:
+            raw_ranges.append((end_date[:10], end_date, False))
+        
+        parts = ["SELECT item_id, qty_in, qty_out, revenue, cost FROM daily_item_rollup"
+                 + (" WHERE " + " AND ".join(rollup_conditions) if rollup_conditions else "")]
+        params = rollup_params
+    
+    for low, high, exclusive in raw_ranges:
+        parts.append(f'''
+            SELECT t.item_id, {_RAW_TOTALS}
+            FROM transactions t
+            LEFT JOIN inventory i ON t.item_id = i.id
+            WHERE t.date >= ? AND t.date {"<" if exclusive else "<="} ?
+            GROUP BY t.item_id
+        ''')
+        params += [low, high]
+    
+    return " UNION ALL ".join(parts), params
+
+
+def _post_to_rollup(c, after_id):
+    """Add every transaction with an id above after_id to the daily rollup.
+
+    Called by the posting functions inside their write transaction; a whole
+    batch becomes one upsert per (day, item). A movement dated inside a
+    closed period drops that period's cached profit & loss.
+    """
+    c.execute("SELECT MIN(substr(date, 1, 10)) FROM transactions WHERE id > ?", (after_id,))
+    first_day = c.fetchone()[0]
+    if first_day is None:
+        return
+    _invalidate_profit_loss(c, first_day)
+    
+    c.execute(f'''
+        INSERT INTO daily_item_rollup (day, item_id, qty_in, qty_out, revenue, cost)
+        SELECT substr(t.date, 1, 10), t.item_id, {_RAW_TOTALS}
+        FROM transactions t
+        LEFT JOIN inventory i ON t.item_id = i.id
+        WHERE t.id > ?
+        GROUP BY substr(t.date, 1, 10), t.item_id
+        ON CONFLICT (day, item_id) DO UPDATE SET
+            qty_in = qty_in + excluded.qty_in,
+            qty_out = qty_out + excluded.qty_out,
+            revenue = revenue + excluded.revenue,
+            cost = cost + excluded.cost
+    ''', (after_id,))
+
+
+def _fill_daily_rollup(c):
+    """Aggregate the whole transactions table into an empty daily rollup"""
+    c.execute(f'''
+        INSERT INTO daily_item_rollup (day, item_id, qty_in, qty_out, revenue, cost)
+        SELECT substr(t.date, 1, 10), t.item_id, {_RAW_TOTALS}
+        FROM transactions t
+        LEFT JOIN inventory i ON t.item_id = i.id
+        GROUP BY substr(t.date, 1, 10), t.item_id
+    ''')
+    return c.rowcount
+
+
+def rebuild_daily_rollup():
+    """Recompute daily_item_rollup from the transactions table.
+
+    Cost of goods is valued at today's cost_price, since the history does
+    not record the cost at posting time. Cached profit & loss periods are
+    dropped. Returns the number of rows written.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute("DELETE FROM daily_item_rollup")
+        _invalidate_profit_loss(c)
+        return _fill_daily_rollup(c)
+
+
+def _transaction_totals_query(start_date=None, end_date=None):
+    """Build the IN/OUT quantity totals of generate_transaction_report"""
+    source, params = _daily_totals_source(start_date, end_date)
+    return f"SELECT COALESCE(SUM(qty_in), 0), COALESCE(SUM(qty_out), 0) FROM ({source})", params
+
+
+# Columns of the transaction report's rows, in order
+TRANSACTION_REPORT_COLUMNS = ('id', 'date', 'transaction_type', 'quantity', 'notes', 'item_name', 'category',
+                              'unit_symbol', 'value')
+
+
+def _transaction_report_query(start_date=None, end_date=None):
+    """Build the query behind generate_transaction_report"""
     query = '''
         SELECT 
             t.id,
@@ -32,24 +197,118 @@ def generate_transaction_report(start_date=None, end_date=None):
         LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
     '''
     
-    params = []
-    if start_date:
-        query += " WHERE t.date >= ?"
-        params.append(start_date)
-    
-    if end_date:
-        query += " AND t.date <= ?"
-        params.append(end_date)
+    conditions, params = _date_conditions("t.date", start_date, end_date)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
     
     query += " ORDER BY t.date DESC, t.created_at DESC"
-    
-    c.execute(query, params)
-    transactions = c.fetchall()
-    conn.close()
-    
+    return query, params
+
+
+# Columns of the sales report's rows, in order
+SALES_REPORT_COLUMNS = ('item_name', 'total_sold', 'total_revenue')
+
+
+def _sales_report_query(start_date=None, end_date=None):
+    """Build the query behind generate_sales_report"""
+    source, params = _daily_totals_source(start_date, end_date)
+    # Aggregate per item first so names are joined once per item, not per day
+    query = f'''
+        SELECT 
+            i.name as item_name,
+            s.total_sold,
+            s.total_revenue
+        FROM (
+            SELECT item_id, SUM(qty_out) as total_sold, SUM(revenue) as total_revenue
+            FROM ({source})
+            WHERE qty_out > 0
+            GROUP BY item_id
+        ) s
+        LEFT JOIN inventory i ON s.item_id = i.id
+        ORDER BY s.total_revenue DESC
+    '''
+    return query, params
+
+
+# Columns of the inventory report's item and low-stock rows, in order. They
+# are listed rather than i.*, whose order differs on databases upgraded by
+# add_missing_columns() (which also never gain created_at).
+INVENTORY_REPORT_COLUMNS = ('id', 'name', 'category_id', 'quantity', 'price', 'cost_price',
+                            'measurement_unit_id', 'category_name', 'unit_symbol')
+
+_INVENTORY_REPORT_SELECT = '''
+            i.id, i.name, i.category_id, i.quantity, i.price, i.cost_price, i.measurement_unit_id,
+            c.name as category_name,
+            mu.unit_symbol
+'''
+
+
+def _inventory_report_query():
+    """Build the query behind generate_inventory_report"""
+    return f'''
+        SELECT {_INVENTORY_REPORT_SELECT}
+        FROM inventory i
+        LEFT JOIN categories c ON i.category_id = c.id
+        LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
+        ORDER BY i.name
+    ''', []
+
+
+def _inventory_categories_query():
+    """Build the per-category totals of generate_inventory_report"""
+    return '''
+        SELECT
+            COALESCE(c.name, 'Uncategorized') as category,
+            COUNT(*) as item_count,
+            SUM(COALESCE(i.cost_price, 0) * i.quantity) as value,
+            SUM(i.quantity) as quantity
+        FROM inventory i
+        LEFT JOIN categories c ON i.category_id = c.id
+        GROUP BY 1
+        ORDER BY 1
+    ''', []
+
+
+def _low_stock_query(threshold=None):
+    """Build the low-stock listing of generate_inventory_report, emptiest first"""
+    threshold = config.LOW_STOCK_THRESHOLD if threshold is None else threshold
+    return f'''
+        SELECT {_INVENTORY_REPORT_SELECT}
+        FROM inventory i
+        LEFT JOIN categories c ON i.category_id = c.id
+        LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
+        WHERE i.quantity < ?
+        ORDER BY i.quantity, i.name
+    ''', [threshold]
+
+
+def generate_transaction_report(start_date=None, end_date=None, stream=False):
+    """Generate transaction report.
+
+    With stream, 'transactions' is a QueryStream fetched in batches when
+    iterated, for exports of long histories, and the count comes from SQL.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        if stream:
+            transactions = QueryStream(*_transaction_report_query(start_date, end_date))
+            conditions, params = _date_conditions("date", start_date, end_date)
+            c.execute("SELECT COUNT(*) FROM transactions"
+                      + (" WHERE " + " AND ".join(conditions) if conditions else ""), params)
+            total_transactions = c.fetchone()[0]
+        else:
+            c.execute(*_transaction_report_query(start_date, end_date))
+            transactions = c.fetchall()
+            total_transactions = len(transactions)
+
+        c.execute(*_transaction_totals_query(start_date, end_date))
+        total_in, total_out = c.fetchone()
+
     return {
         'transactions': transactions,
-        'total_transactions': len(transactions),
+        'total_transactions': total_transactions,
+        'total_in': total_in,
+        'total_out': total_out,
         'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         'filter_period': f"{start_date or 'All'} to {end_date or 'Present'}"
     }
@@ -57,35 +316,11 @@ def generate_transaction_report(start_date=None, end_date=None):
 
 def generate_sales_report(start_date=None, end_date=None):
     """Generate sales report"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # Build query with date filters
-    query = '''
-        SELECT 
-            i.name,
-            SUM(t.quantity) as total_sold,
-            SUM(t.quantity * COALESCE(t.selling_price, 0.0)) as total_revenue
-        FROM transactions t
-        LEFT JOIN inventory i ON t.item_id = i.id
-        WHERE t.transaction_type = 'OUT'
-    '''
-    
-    params = []
-    if start_date:
-        query += " AND t.date >= ?"
-        params.append(start_date)
-    
-    if end_date:
-        query += " AND t.date <= ?"
-        params.append(end_date)
-    
-    query += " GROUP BY i.id, i.name ORDER BY total_revenue DESC"
-    
-    c.execute(query, params)
-    sales_data = c.fetchall()
-    conn.close()
-    
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(*_sales_report_query(start_date, end_date))
+        sales_data = c.fetchall()
+
     total_sales = sum(sale[2] for sale in sales_data) if sales_data else 0
     total_items_sold = sum(sale[1] for sale in sales_data) if sales_data else 0
     average_sale = total_sales / len(sales_data) if sales_data else 0
@@ -100,50 +335,222 @@ def generate_sales_report(start_date=None, end_date=None):
     }
 
 
-def generate_inventory_report(start_date=None, end_date=None):
-    """Generate inventory report"""
-    conn = get_connection()
-    c = conn.cursor()
+def _invalidate_profit_loss(c, from_day=None):
+    """Drop cached profit & loss periods ending on or after from_day, or all"""
+    condition, params = ("WHERE period_end >= ?", [from_day]) if from_day else ("", [])
+    c.execute(f"DELETE FROM profit_loss_items WHERE summary_id IN (SELECT id FROM profit_loss_summary {condition})",
+              params)
+    c.execute(f"DELETE FROM profit_loss_summary {condition}", params)
+
+
+def _next_month(day):
+    """First day of the month after day"""
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _closed_months(first_day, last_day, today):
+    """List the (start, end) dates of whole months in [first_day, last_day] that ended before today"""
+    months = []
+    month_start = first_day if first_day.day == 1 else _next_month(first_day)
+    while True:
+        month_end = _next_month(month_start) - timedelta(days=1)
+        if month_end > last_day or month_end >= today:
+            return months
+        months.append((month_start, month_end))
+        month_start = month_end + timedelta(days=1)
+
+
+def _cache_profit_loss_period(c, period_start, period_end):
+    """Persist one closed period from the daily rollup unless it is cached"""
+    c.execute("SELECT 1 FROM profit_loss_summary WHERE period_start = ? AND period_end = ?",
+              (period_start, period_end))
+    if c.fetchone():
+        return
     
     c.execute('''
-        SELECT 
-            i.*,
-            c.name as category_name,
-            mu.unit_symbol
-        FROM inventory i
-        LEFT JOIN categories c ON i.category_id = c.id
-        LEFT JOIN measurement_units mu ON i.measurement_unit_id = mu.id
-        ORDER BY i.name
-    ''')
+        INSERT OR IGNORE INTO profit_loss_summary (period_start, period_end, created_at, notes)
+        VALUES (?, ?, ?, 'Closed period, cached from daily_item_rollup')
+    ''', (period_start, period_end, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    if c.rowcount == 0:
+        return
+    summary_id = c.lastrowid
     
-    items = c.fetchall()
-    conn.close()
+    c.execute('''
+        INSERT INTO profit_loss_items (summary_id, item_id, units_sold, units_purchased, revenue, cost)
+        SELECT ?, item_id, SUM(qty_out), SUM(qty_in), SUM(revenue), SUM(cost)
+        FROM daily_item_rollup
+        WHERE day >= ? AND day <= ?
+        GROUP BY item_id
+    ''', (summary_id, period_start, period_end))
+    c.execute('''
+        UPDATE profit_loss_summary
+        SET (total_revenue, total_cost, gross_profit, net_profit, items_sold, items_purchased) = (
+            SELECT COALESCE(SUM(revenue), 0.0), COALESCE(SUM(cost), 0.0),
+                   COALESCE(SUM(revenue) - SUM(cost), 0.0), COALESCE(SUM(revenue) - SUM(cost), 0.0),
+                   COALESCE(SUM(units_sold), 0), COALESCE(SUM(units_purchased), 0)
+            FROM profit_loss_items
+            WHERE summary_id = ?
+        )
+        WHERE id = ?
+    ''', (summary_id, summary_id))
+
+
+def _profit_loss_source(c, start_date, end_date, today):
+    """Build a subquery of per-item totals for a profit & loss range.
+
+    Whole months that closed before today are read from (and if needed
+    first written to) the profit & loss cache; the remaining head and tail
+    of the range come from the daily rollup. Returns (sql, params, months).
+    """
+    first_day = datetime.strptime(start_date[:10], "%Y-%m-%d").date()
+    last_day = datetime.strptime(end_date[:10], "%Y-%m-%d").date()
+    if not _is_whole_day(start_date):
+        first_day += timedelta(days=1)
+    if not _is_whole_day(end_date):
+        last_day -= timedelta(days=1)
+    
+    months = _closed_months(first_day, last_day, today)
+    if not months:
+        return (*_daily_totals_source(start_date, end_date), 0)
     
-    # Calculate statistics
-    total_items = len(items)
-    total_value = sum(item[4] * item[3] for item in items)  # cost_price * quantity
+    cached_start, cached_end = months[0][0].isoformat(), months[-1][1].isoformat()
+    for month_start, month_end in months:
+        _cache_profit_loss_period(c, month_start.isoformat(), month_end.isoformat())
     
-    # Group by category
-    categories = {}
-    low_stock = []
+    parts = ['''
+        SELECT item_id, units_purchased AS qty_in, units_sold AS qty_out, revenue, cost
+        FROM profit_loss_items
+        WHERE summary_id IN (
+            SELECT id FROM profit_loss_summary WHERE period_start >= ? AND period_end <= ?
+        )
+    ''']
+    params = [cached_start, cached_end]
     
-    for item in items:
-        category = item[7] or "Uncategorized"  # category_name
-        if category not in categories:
-            categories[category] = {'count': 0, 'value': 0}
+    if start_date[:10] < cached_start:
+        head_end = months[0][0] - timedelta(days=1)
+        source, source_params = _daily_totals_source(start_date, head_end.isoformat())
+        parts.append(source)
+        params += source_params
+    if end_date[:10] > cached_end:
+        tail_start = months[-1][1] + timedelta(days=1)
+        source, source_params = _daily_totals_source(tail_start.isoformat(), end_date)
+        parts.append(source)
+        params += source_params
+    
+    return " UNION ALL ".join(parts), params, len(months)
+
+
+def generate_profit_loss_report(start_date=None, end_date=None, top_n=10):
+    """Generate profit and loss report.
+
+    Revenue is what OUT movements sold for and cost is their cost of goods
+    at the item's cost_price. No operating expenses are tracked, so net
+    profit equals gross profit. Closed months are persisted to
+    profit_loss_summary and reused, so a year-to-date report only
+    aggregates the open month.
+    """
+    today = datetime.now().date()
+    
+    with connection() as conn:
+        c = conn.cursor()
+        
+        if not start_date:
+            c.execute("SELECT MIN(day) FROM daily_item_rollup")
+            start_date = c.fetchone()[0] or today.isoformat()
+        end_date = end_date or today.isoformat()
+        
+        source, params, cached_periods = _profit_loss_source(c, start_date, end_date, today)
+        items = f'''
+            WITH items AS (
+                SELECT item_id, SUM(qty_in) AS purchased, SUM(qty_out) AS sold,
+                       SUM(revenue) AS revenue, SUM(cost) AS cost
+                FROM ({source})
+                GROUP BY item_id
+            )
+        '''
         
-        categories[category]['count'] += 1
-        categories[category]['value'] += item[4] * item[3]  # cost_price * quantity
+        c.execute(items + '''
+            SELECT 
+                COALESCE(cat.name, 'Uncategorized') as category,
+                SUM(items.revenue) as revenue,
+                SUM(items.cost) as cost,
+                SUM(items.revenue - items.cost) as profit,
+                SUM(items.sold) as sold,
+                SUM(items.purchased) as purchased
+            FROM items
+            LEFT JOIN inventory i ON items.item_id = i.id
+            LEFT JOIN categories cat ON i.category_id = cat.id
+            GROUP BY 1
+            ORDER BY profit DESC
+        ''', params)
+        category_breakdown = c.fetchall()
         
-        # Check for low stock (less than 10)
-        if item[3] < 10:  # quantity
-            low_stock.append(item)
+        c.execute(items + '''
+            SELECT 
+                COALESCE(i.name, 'Deleted item') as name,
+                COALESCE(cat.name, 'Uncategorized') as category,
+                items.sold,
+                items.revenue,
+                items.revenue - items.cost as profit
+            FROM items
+            LEFT JOIN inventory i ON items.item_id = i.id
+            LEFT JOIN categories cat ON i.category_id = cat.id
+            WHERE items.sold > 0
+            ORDER BY profit DESC
+            LIMIT ?
+        ''', params + [top_n])
+        top_items = c.fetchall()
     
+    total_revenue = sum(row[1] for row in category_breakdown)
+    total_cost = sum(row[2] for row in category_breakdown)
+    gross_profit = total_revenue - total_cost
+    
+    return {
+        'period_start': start_date,
+        'period_end': end_date,
+        'total_revenue': total_revenue,
+        'total_cost': total_cost,
+        'gross_profit': gross_profit,
+        'net_profit': gross_profit,
+        'items_sold': sum(row[4] for row in category_breakdown),
+        'items_purchased': sum(row[5] for row in category_breakdown),
+        'category_breakdown': category_breakdown,
+        'top_items': top_items,
+        'cached_periods': cached_periods,
+        'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'filter_period': f"{start_date} to {end_date}"
+    }
+
+
+def generate_inventory_report(start_date=None, end_date=None):
+    """Generate inventory report.
+
+    Totals are aggregated in SQL and low stock is read through the quantity
+    index, so only summary rows are loaded. 'items' is a QueryStream over
+    every item ordered by name: it runs when iterated and fetches in batches.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+
+        c.execute(*_inventory_categories_query())
+        category_rows = c.fetchall()
+
+        c.execute(*_low_stock_query())
+        low_stock = c.fetchall()
+
+    total_items = sum(row[1] for row in category_rows)
+    total_value = sum(row[2] for row in category_rows)  # cost_price * quantity
+
     return {
-        'items': items,
+        'items': QueryStream(*_inventory_report_query()),
         'total_items': total_items,
         'total_value': total_value,
-        'categories': [(cat, data['count'], data['value']) for cat, data in categories.items()],
+        'summary': {
+            'total_items': total_items,
+            'total_quantity': sum(row[3] for row in category_rows),
+            'total_value': total_value
+        },
+        'categories': [row[:3] for row in category_rows],
         'low_stock': low_stock,
         'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         'filter_period': f"{start_date or 'All'} to {end_date or 'Present'}"
@@ -152,16 +559,155 @@ def generate_inventory_report(start_date=None, end_date=None):
 
 def generate_supplier_report(start_date=None, end_date=None):
     """Generate supplier report"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    c.execute("SELECT * FROM suppliers ORDER BY name")
-    suppliers = c.fetchall()
-    conn.close()
+    with connection() as conn:
+        c = conn.cursor()
     
+        c.execute("SELECT * FROM suppliers ORDER BY name")
+        suppliers = c.fetchall()
+
     return {
         'suppliers': suppliers,
         'total_suppliers': len(suppliers),
         'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         'filter_period': f"{start_date or 'All'} to {end_date or 'Present'}"
     }
+
+
+# Reports generate_reports_batch() can run; profit & loss is left out
+# because it writes its period cache, which read-only workers cannot
+BATCH_REPORTS = ('inventory', 'transactions', 'sales', 'suppliers', 'users')
+
+
+def _init_report_worker(database):
+    """Point a report worker process at the database with read-only connections"""
+    config.DB_NAME = database
+    config.DB_READ_ONLY = True
+
+
+def _run_batch_report(name, start_date, end_date, output_dir, export_format):
+    """Generate one report and write its export; runs inside a worker"""
+    from database import export_helpers
+    from database.models.users import generate_user_activity_report
+
+    started = time.perf_counter()
+    try:
+        if name == 'inventory':
+            data = generate_inventory_report(start_date, end_date)
+        elif name == 'transactions':
+            data = generate_transaction_report(start_date, end_date, stream=True)
+        elif name == 'sales':
+            data = generate_sales_report(start_date, end_date)
+        elif name == 'suppliers':
+            data = generate_supplier_report(start_date, end_date)
+        else:
+            data = generate_user_activity_report(start_date, end_date)
+        data['report_type'] = name
+
+        # Reports without a columnar layout are still written as CSV
+        if export_format == 'columnar' and name in ('inventory', 'transactions', 'sales'):
+            extension, export = export_helpers.columnar_extension(), export_helpers.export_to_columnar
+        else:
+            extension, export = "csv", export_helpers.export_to_csv
+        filepath = os.path.join(output_dir, export_helpers.generate_filename(f"{name}_report", extension))
+        success, message = export(data, filepath)
+    except Exception as e:
+        filepath, success, message = None, False, f"Error generating report: {str(e)}"
+
+    return {
+        'report': name,
+        'path': filepath,
+        'success': success,
+        'message': message,
+        'seconds': time.perf_counter() - started
+    }
+
+
+def generate_reports_batch(reports=None, start_date=None, end_date=None, output_dir=".",
+                           export_format="csv", workers=None, use_threads=False):
+    """Generate several reports concurrently and write all their exports.
+
+    reports is a list of BATCH_REPORTS names (default: all of them).
+    By default each report runs in a worker process whose connections are
+    opened read-only, so on a WAL database the workers read in parallel
+    without blocking each other or the application's writers. use_threads
+    runs them on a thread pool instead, each thread on its own pooled
+    connection. export_format is 'csv' or 'columnar'.
+
+    Returns {'reports': [...], 'wall_seconds': ..., 'total_seconds': ...}
+    with one {'report', 'path', 'success', 'message', 'seconds'} per report,
+    in the order requested; total_seconds is the sum of the per-report
+    times.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    reports = list(reports or BATCH_REPORTS)
+    unknown = [name for name in reports if name not in BATCH_REPORTS]
+    if unknown:
+        raise ValueError(f"Unknown report(s): {', '.join(unknown)}")
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or min(len(reports), os.cpu_count() or 1)
+
+    if use_threads:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_report_worker,
+                                       initargs=(config.DB_NAME,))
+
+    started = time.perf_counter()
+    with executor:
+        futures = [executor.submit(_run_batch_report, name, start_date, end_date, output_dir, export_format)
+                   for name in reports]
+        results = [future.result() for future in futures]
+
+    return {
+        'reports': results,
+        'wall_seconds': time.perf_counter() - started,
+        'total_seconds': sum(result['seconds'] for result in results)
+    }
+
+
+def print_batch_summary(batch):
+    """Print per-report timings of a generate_reports_batch() result; returns the exit code"""
+    for result in batch['reports']:
+        status = result['path'] if result['success'] else result['message']
+        print(f"{result['report']:<14}{result['seconds']:8.2f}s  {status}")
+    print(f"{'wall time':<14}{batch['wall_seconds']:8.2f}s  (reports took {batch['total_seconds']:.2f}s in total)")
+    return 0 if all(result['success'] for result in batch['reports']) else 1
+
+
+def main(argv=None):
+    """Command line entry point for batch report generation.
+
+    Usage::
+
+        python -m database.models.reports --start 2026-01-01 --end 2026-01-31 --output-dir exports
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate several reports concurrently and export them.")
+    parser.add_argument('reports', nargs='*', metavar='report', help=f"reports to run: {', '.join(BATCH_REPORTS)} (default: all)")
+    parser.add_argument('--start', help="start date (YYYY-MM-DD)")
+    parser.add_argument('--end', help="end date (YYYY-MM-DD)")
+    parser.add_argument('--output-dir', default=".", help="directory for the exports")
+    parser.add_argument('--format', choices=('csv', 'columnar'), default='csv', help="export format")
+    parser.add_argument('--workers', type=int, help="number of workers (default: one per report)")
+    parser.add_argument('--threads', action='store_true', help="use threads instead of processes")
+    parser.add_argument('--db', default=config.DB_NAME, help="database file")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.reports if name not in BATCH_REPORTS]
+    if unknown:
+        parser.error(f"unknown report(s): {', '.join(unknown)}")
+
+    config.DB_NAME = args.db
+    batch = generate_reports_batch(args.reports, args.start, args.end, args.output_dir,
+                                   args.format, args.workers, args.threads)
+
+    return print_batch_summary(batch)
+
+
+if __name__ == '__main__':
+    # Run the package's copy of this module so worker processes can find
+    # _run_batch_report by its importable name
+    from database.models import reports
+    sys.exit(reports.main())
@@ -1,5 +1,4 @@
 """Database schema definitions and initialization"""
-import sqlite3
 import sys
 import os
 from datetime import datetime
@@ -7,260 +6,570 @@ from datetime import datetime
 # Add parent directory to path for config import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 import config
-
-
-def get_connection():
-    """Get database connection"""
-    return sqlite3.connect(config.DB_NAME)
+from database.connection import connection
 
 
 def create_categories_table():
     """Create categories table"""
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
     
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS categories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                description TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
 
 
 def create_suppliers_table():
     """Create suppliers table"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS suppliers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            contact TEXT,
-            email TEXT,
-            phone TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+    with connection() as conn:
+        c = conn.cursor()
     
-    conn.commit()
-    conn.close()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS suppliers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                contact TEXT,
+                email TEXT,
+                phone TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
 
 
-def create_transactions_table():
-    """Create transactions table"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            item_id INTEGER NOT NULL,
-            transaction_type TEXT NOT NULL CHECK (transaction_type IN ('IN', 'OUT')),
-            quantity INTEGER NOT NULL,
-            date TEXT NOT NULL,
-            notes TEXT,
-            selling_price REAL DEFAULT 0.0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (item_id) REFERENCES inventory (id)
-        )
-    ''')
+def create_transactions_table(movement_tables=True):
+    """Create transactions table.
+
+    With movement_tables, also create the tables every posted movement
+    writes to, for databases set up without migrate(). Migration 1 creates
+    the table alone; later migrations add the others.
+    """
+    with connection() as conn:
+        c = conn.cursor()
     
-    conn.commit()
-    conn.close()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_id INTEGER NOT NULL,
+                transaction_type TEXT NOT NULL CHECK (transaction_type IN ('IN', 'OUT')),
+                quantity INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                notes TEXT,
+                selling_price REAL DEFAULT 0.0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (item_id) REFERENCES inventory (id)
+            )
+        ''')
+
+    if not movement_tables:
+        return
+
+    # Every posted movement also writes its ledger row and daily rollup, and
+    # may drop cached profit & loss periods; stock edits post adjustments
+    create_stock_ledger_table()
+    create_stock_adjustments_table()
+    create_daily_rollup_table()
+    create_profit_loss_tables()
 
 
 def create_users_table():
     """Create users table"""
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
     
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            password TEXT NOT NULL,
-            email TEXT,
-            role TEXT NOT NULL DEFAULT 'user',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL UNIQUE,
+                password TEXT NOT NULL,
+                email TEXT,
+                role TEXT NOT NULL DEFAULT 'user',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
 
 
 def create_measurement_units_table():
     """Create measurement units table"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS measurement_units (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            unit_name TEXT NOT NULL UNIQUE,
-            unit_symbol TEXT NOT NULL UNIQUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+    with connection() as conn:
+        c = conn.cursor()
     
-    conn.commit()
-    conn.close()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS measurement_units (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                unit_name TEXT NOT NULL UNIQUE,
+                unit_symbol TEXT NOT NULL UNIQUE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
 
 
 def init_db():
     """Initialize all database tables"""
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
     
-    # Create inventory table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS inventory (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            category_id INTEGER,
-            quantity INTEGER DEFAULT 0,
-            price REAL DEFAULT 0.0,
-            cost_price REAL DEFAULT 0.0,
-            measurement_unit_id INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (category_id) REFERENCES categories (id),
-            FOREIGN KEY (measurement_unit_id) REFERENCES measurement_units (id)
-        )
-    ''')
+        # Create inventory table
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS inventory (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                category_id INTEGER,
+                quantity INTEGER DEFAULT 0,
+                price REAL DEFAULT 0.0,
+                cost_price REAL DEFAULT 0.0,
+                measurement_unit_id INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES categories (id),
+                FOREIGN KEY (measurement_unit_id) REFERENCES measurement_units (id)
+            )
+        ''')
     
-    # Create categories table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+        # Create categories table
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS categories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                description TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
     
-    # Create suppliers table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS suppliers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            contact TEXT,
-            email TEXT,
-            phone TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+        # Create suppliers table
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS suppliers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                contact TEXT,
+                email TEXT,
+                phone TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
     
-    # Create transactions table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            item_id INTEGER NOT NULL,
-            transaction_type TEXT NOT NULL CHECK (transaction_type IN ('IN', 'OUT')),
-            quantity INTEGER NOT NULL,
-            date TEXT NOT NULL,
-            notes TEXT,
-            selling_price REAL DEFAULT 0.0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (item_id) REFERENCES inventory (id)
-        )
-    ''')
+        # Create transactions table
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_id INTEGER NOT NULL,
+                transaction_type TEXT NOT NULL CHECK (transaction_type IN ('IN', 'OUT')),
+                quantity INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                notes TEXT,
+                selling_price REAL DEFAULT 0.0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (item_id) REFERENCES inventory (id)
+            )
+        ''')
     
-    # Create users table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            password TEXT NOT NULL,
-            email TEXT,
-            role TEXT NOT NULL DEFAULT 'user',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+        # Create users table
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL UNIQUE,
+                password TEXT NOT NULL,
+                email TEXT,
+                role TEXT NOT NULL DEFAULT 'user',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
     
-    # Create measurement_units table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS measurement_units (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            unit_name TEXT NOT NULL UNIQUE,
-            unit_symbol TEXT NOT NULL UNIQUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+        # Create measurement_units table
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS measurement_units (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                unit_name TEXT NOT NULL UNIQUE,
+                unit_symbol TEXT NOT NULL UNIQUE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
 
 
 def init_default_measurement_units():
     """Initialize default measurement units"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # Check if units already exist
-    c.execute("SELECT COUNT(*) FROM measurement_units")
-    if c.fetchone()[0] > 0:
-        conn.close()
-        return
+    with connection() as conn:
+        c = conn.cursor()
     
-    # Insert default units
-    default_units = [
-        ('Pieces', 'pcs'),
-        ('Kilograms', 'kg'),
-        ('Liters', 'L'),
-        ('Meters', 'm'),
-        ('Boxes', 'box'),
-        ('Bottles', 'btl'),
-        ('Pairs', 'pairs'),
-        ('Sets', 'sets')
-    ]
+        # Check if units already exist
+        c.execute("SELECT COUNT(*) FROM measurement_units")
+        if c.fetchone()[0] > 0:
+            return
     
-    c.executemany('''
-        INSERT INTO measurement_units (unit_name, unit_symbol) 
-        VALUES (?, ?)
-    ''', default_units)
+        # Insert default units
+        default_units = [
+            ('Pieces', 'pcs'),
+            ('Kilograms', 'kg'),
+            ('Liters', 'L'),
+            ('Meters', 'm'),
+            ('Boxes', 'box'),
+            ('Bottles', 'btl'),
+            ('Pairs', 'pairs'),
+            ('Sets', 'sets')
+        ]
     
-    conn.commit()
-    conn.close()
+        c.executemany('''
+            INSERT INTO measurement_units (unit_name, unit_symbol) 
+            VALUES (?, ?)
+        ''', default_units)
+
+
+# Secondary indexes for the hot report and listing predicates. Migrations
+# create them from their own fixed lists; keep this one their union.
+INDEXES = [
+    # Transaction report: date range, newest first
+    ('idx_transactions_date_type_item', 'transactions (date, transaction_type, item_id)'),
+    # Sales report: OUT movements in a date range, covering the summed columns
+    ('idx_transactions_type_date', 'transactions (transaction_type, date, item_id, quantity, selling_price)'),
+    # Per-item history
+    ('idx_transactions_item_date', 'transactions (item_id, date)'),
+    # Keyset paging of the history; the implicit rowid breaks ties within a date
+    ('idx_transactions_date', 'transactions (date)'),
+    # Item listings sorted by name and category lookups
+    ('idx_inventory_name', 'inventory (name)'),
+    ('idx_inventory_category', 'inventory (category_id)'),
+    # Low-stock listing
+    ('idx_inventory_quantity', 'inventory (quantity)'),
+]
+
+# Columns added after the first release: (table, column, definition)
+ADDED_COLUMNS = [
+    ('inventory', 'category_id', 'INTEGER'),  # Replaces the legacy 'category' text column
+    ('inventory', 'cost_price', 'REAL DEFAULT 0.0'),
+    ('inventory', 'measurement_unit_id', 'INTEGER'),
+    ('inventory', 'updated_at', 'TIMESTAMP'),
+    ('transactions', 'selling_price', 'REAL DEFAULT 0.0'),
+    ('transactions', 'created_at', 'TIMESTAMP'),
+]
+
+
+# Tables whose deleted ids are recorded in free_ids for reuse
+FREE_ID_TABLES = ['inventory', 'categories', 'suppliers', 'transactions', 'users', 'measurement_units']
+
+
+def create_free_ids_table():
+    """Create the free-list of deleted ids and the triggers that maintain it"""
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS free_ids (
+                table_name TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                PRIMARY KEY (table_name, id)
+            ) WITHOUT ROWID
+        ''')
+        
+        for table in FREE_ID_TABLES:
+            c.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_free_id AFTER DELETE ON {table}
+                BEGIN
+                    INSERT OR IGNORE INTO free_ids (table_name, id) VALUES ('{table}', OLD.id);
+                END
+            ''')
+            c.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_claim_id AFTER INSERT ON {table}
+                BEGIN
+                    DELETE FROM free_ids WHERE table_name = '{table}' AND id = NEW.id;
+                END
+            ''')
+            
+            # Seed the gaps that already exist below the highest id
+            c.execute(f'''
+                WITH RECURSIVE
+                    gaps(gap_start, gap_end) AS (
+                        SELECT id + 1, next_id - 1 FROM (
+                            SELECT id, LEAD(id) OVER (ORDER BY id) AS next_id
+                            FROM (SELECT 0 AS id UNION ALL SELECT id FROM {table} WHERE id > 0)
+                        )
+                        WHERE next_id > id + 1
+                    ),
+                    missing(id, gap_end) AS (
+                        SELECT gap_start, gap_end FROM gaps
+                        UNION ALL
+                        SELECT id + 1, gap_end FROM missing WHERE id < gap_end
+                    )
+                INSERT OR IGNORE INTO free_ids (table_name, id)
+                SELECT '{table}', id FROM missing
+            ''')
+
+
+def create_indexes():
+    """Create secondary indexes"""
+    with connection() as conn:
+        c = conn.cursor()
+        for index_name, definition in INDEXES:
+            c.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {definition}")
+
+
+def add_missing_columns():
+    """Add columns that databases from older releases are missing"""
+    with connection() as conn:
+        c = conn.cursor()
+        existing = {}
+        for table, column, definition in ADDED_COLUMNS:
+            if table not in existing:
+                c.execute(f"PRAGMA table_info({table})")
+                existing[table] = {row[1] for row in c.fetchall()}
+            
+            if column not in existing[table]:
+                c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                existing[table].add(column)
+
+
+def create_stock_ledger_table():
+    """Create the per-item stock ledger.
+
+    One row per movement with the item's stock right after it, ordered by
+    (date, transaction_id). stock_as_of() reads a single row from it.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS stock_ledger (
+                transaction_id INTEGER PRIMARY KEY,
+                item_id INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                quantity_change INTEGER NOT NULL,
+                balance INTEGER NOT NULL
+            )
+        ''')
+        # The rowid (transaction_id) orders movements within a date
+        c.execute("CREATE INDEX IF NOT EXISTS idx_stock_ledger_item_date ON stock_ledger (item_id, date)")
+
+
+def create_stock_adjustments_table():
+    """Create the log of direct edits of inventory.quantity.
+
+    update_item() and the bulk APIs add a row for every stock level they
+    change, so the ledger can keep those edits as adjustments instead of
+    reading them as opening stock.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS stock_adjustments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_id INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                quantity_change INTEGER NOT NULL
+            )
+        ''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_stock_adjustments_item ON stock_adjustments (item_id)")
+
+
+def create_daily_rollup_table():
+    """Create the daily per-item rollup.
+
+    The posting functions add each movement to its (day, item) row in the
+    same transaction, so the rollup is never behind the transactions table.
+    cost is the cost of goods sold, valued at the item's cost_price when the
+    movement posts.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        
+        # Keyed on day first so report date ranges read one contiguous range
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS daily_item_rollup (
+                day TEXT NOT NULL,
+                item_id INTEGER NOT NULL,
+                qty_in INTEGER NOT NULL DEFAULT 0,
+                qty_out INTEGER NOT NULL DEFAULT 0,
+                revenue REAL NOT NULL DEFAULT 0.0,
+                cost REAL NOT NULL DEFAULT 0.0,
+                PRIMARY KEY (day, item_id)
+            ) WITHOUT ROWID
+        ''')
+
+
+def create_profit_loss_tables():
+    """Create the profit & loss cache for closed periods.
+
+    profit_loss_summary holds the totals of each closed month and
+    profit_loss_items its per-item figures, so the category breakdown and
+    top items of a cached month never touch the rollup again.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS profit_loss_summary (
+                id INTEGER PRIMARY KEY,
+                period_start TEXT NOT NULL,
+                period_end TEXT NOT NULL,
+                total_revenue REAL DEFAULT 0.0,
+                total_cost REAL DEFAULT 0.0,
+                gross_profit REAL DEFAULT 0.0,
+                net_profit REAL DEFAULT 0.0,
+                items_sold INTEGER DEFAULT 0,
+                items_purchased INTEGER DEFAULT 0,
+                created_at TEXT NOT NULL,
+                notes TEXT
+            )
+        ''')
+        c.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_profit_loss_summary_period
+            ON profit_loss_summary (period_start, period_end)
+        ''')
+        
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS profit_loss_items (
+                summary_id INTEGER NOT NULL,
+                item_id INTEGER NOT NULL,
+                units_sold INTEGER NOT NULL DEFAULT 0,
+                units_purchased INTEGER NOT NULL DEFAULT 0,
+                revenue REAL NOT NULL DEFAULT 0.0,
+                cost REAL NOT NULL DEFAULT 0.0,
+                PRIMARY KEY (summary_id, item_id)
+            ) WITHOUT ROWID
+        ''')
+
+
+# Full-text search tables: (table, content table or view, columns, bm25 column weights).
+# Items are found by their category's name and transactions by their item's
+# name too, so those two index views that join the name in.
+SEARCH_TABLES = [
+    ('inventory_fts', 'inventory_search', ('name', 'category'), (4.0, 1.0)),
+    ('suppliers_fts', 'suppliers', ('name', 'contact', 'email', 'phone'), (4.0, 2.0, 1.0, 1.0)),
+    ('transactions_fts', 'transactions_search', ('item', 'notes'), (2.0, 1.0)),
+]
+
+
+def _fts_rows(table, values, source=None, delete=False):
+    """Statement adding (or with delete=True, removing) rows of a search table.
+
+    values are SQL expressions for the rowid and each column; with source
+    (a FROM ... clause) there is one row per source row. A removed row must
+    be given exactly the values it was added with.
+    """
+    columns = next(columns for name, _, columns, _ in SEARCH_TABLES if name == table)
+    targets = ", ".join(([table] if delete else []) + ["rowid", *columns])
+    values = ", ".join((["'delete'"] if delete else []) + list(values))
+    if source:
+        return f"INSERT INTO {table} ({targets}) SELECT {values} {source};"
+    return f"INSERT INTO {table} ({targets}) VALUES ({values});"
+
+
+def create_search_tables():
+    """Create the FTS5 search tables and the triggers that keep them current.
+
+    The tables are external-content: they hold only the index, and read
+    nothing back from the tables they cover. Triggers update them in the
+    same transaction as each insert, update and delete, including renamed
+    categories and items reaching the items and transactions they name.
+    Rows that already exist are indexed by search.rebuild_search_index().
+    """
+    with connection() as conn:
+        c = conn.cursor()
+
+        c.execute('''
+            CREATE VIEW IF NOT EXISTS inventory_search AS
+            SELECT i.id, i.name, c.name AS category
+            FROM inventory i LEFT JOIN categories c ON c.id = i.category_id
+        ''')
+        c.execute('''
+            CREATE VIEW IF NOT EXISTS transactions_search AS
+            SELECT t.id, i.name AS item, t.notes
+            FROM transactions t LEFT JOIN inventory i ON i.id = t.item_id
+        ''')
+
+        for table, content, columns, weights in SEARCH_TABLES:
+            # Prefix indexes make the 2 and 3 letter prefixes typed first cheap
+            c.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5 (
+                    {", ".join(columns)},
+                    content='{content}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            ''')
+            c.execute(f"INSERT INTO {table} ({table}, rank) VALUES ('rank', 'bm25({', '.join(map(str, weights))})')")
+
+        category = "(SELECT name FROM categories WHERE id = {}.category_id)"
+        item = "(SELECT name FROM inventory WHERE id = {}.item_id)"
+        triggers = {
+            'trg_suppliers_fts_insert': ('AFTER INSERT ON suppliers', [
+                _fts_rows('suppliers_fts', ['NEW.id', 'NEW.name', 'NEW.contact', 'NEW.email', 'NEW.phone']),
+            ]),
+            'trg_suppliers_fts_delete': ('AFTER DELETE ON suppliers', [
+                _fts_rows('suppliers_fts', ['OLD.id', 'OLD.name', 'OLD.contact', 'OLD.email', 'OLD.phone'],
+                          delete=True),
+            ]),
+            'trg_suppliers_fts_update': ('AFTER UPDATE OF name, contact, email, phone ON suppliers', [
+                _fts_rows('suppliers_fts', ['OLD.id', 'OLD.name', 'OLD.contact', 'OLD.email', 'OLD.phone'],
+                          delete=True),
+                _fts_rows('suppliers_fts', ['NEW.id', 'NEW.name', 'NEW.contact', 'NEW.email', 'NEW.phone']),
+            ]),
+
+            'trg_transactions_fts_insert': ('AFTER INSERT ON transactions', [
+                _fts_rows('transactions_fts', ['NEW.id', item.format('NEW'), 'NEW.notes']),
+            ]),
+            'trg_transactions_fts_delete': ('AFTER DELETE ON transactions', [
+                _fts_rows('transactions_fts', ['OLD.id', item.format('OLD'), 'OLD.notes'], delete=True),
+            ]),
+            'trg_transactions_fts_update': ('AFTER UPDATE OF item_id, notes ON transactions', [
+                _fts_rows('transactions_fts', ['OLD.id', item.format('OLD'), 'OLD.notes'], delete=True),
+                _fts_rows('transactions_fts', ['NEW.id', item.format('NEW'), 'NEW.notes']),
+            ]),
+
+            # An item's transactions outlive it, and a new item may reuse its id
+            'trg_inventory_fts_insert': ('AFTER INSERT ON inventory', [
+                _fts_rows('inventory_fts', ['NEW.id', 'NEW.name', category.format('NEW')]),
+                _fts_rows('transactions_fts', ['id', 'NULL', 'notes'],
+                          'FROM transactions WHERE item_id = NEW.id', delete=True),
+                _fts_rows('transactions_fts', ['id', 'NEW.name', 'notes'], 'FROM transactions WHERE item_id = NEW.id'),
+            ]),
+            'trg_inventory_fts_delete': ('AFTER DELETE ON inventory', [
+                _fts_rows('inventory_fts', ['OLD.id', 'OLD.name', category.format('OLD')], delete=True),
+                _fts_rows('transactions_fts', ['id', 'OLD.name', 'notes'],
+                          'FROM transactions WHERE item_id = OLD.id', delete=True),
+                _fts_rows('transactions_fts', ['id', 'NULL', 'notes'], 'FROM transactions WHERE item_id = OLD.id'),
+            ]),
+            # Stock changes update inventory all the time; only these columns matter
+            'trg_inventory_fts_update': ('AFTER UPDATE OF name, category_id ON inventory '
+                                         'WHEN OLD.name IS NOT NEW.name OR OLD.category_id IS NOT NEW.category_id', [
+                _fts_rows('inventory_fts', ['OLD.id', 'OLD.name', category.format('OLD')], delete=True),
+                _fts_rows('inventory_fts', ['NEW.id', 'NEW.name', category.format('NEW')]),
+            ]),
+            'trg_inventory_fts_rename': ('AFTER UPDATE OF name ON inventory WHEN OLD.name IS NOT NEW.name', [
+                _fts_rows('transactions_fts', ['id', 'OLD.name', 'notes'],
+                          'FROM transactions WHERE item_id = OLD.id', delete=True),
+                _fts_rows('transactions_fts', ['id', 'NEW.name', 'notes'], 'FROM transactions WHERE item_id = NEW.id'),
+            ]),
+
+            'trg_categories_fts_insert': ('AFTER INSERT ON categories', [
+                _fts_rows('inventory_fts', ['id', 'name', 'NULL'],
+                          'FROM inventory WHERE category_id = NEW.id', delete=True),
+                _fts_rows('inventory_fts', ['id', 'name', 'NEW.name'], 'FROM inventory WHERE category_id = NEW.id'),
+            ]),
+            'trg_categories_fts_delete': ('AFTER DELETE ON categories', [
+                _fts_rows('inventory_fts', ['id', 'name', 'OLD.name'],
+                          'FROM inventory WHERE category_id = OLD.id', delete=True),
+                _fts_rows('inventory_fts', ['id', 'name', 'NULL'], 'FROM inventory WHERE category_id = OLD.id'),
+            ]),
+            'trg_categories_fts_rename': ('AFTER UPDATE OF name ON categories WHEN OLD.name IS NOT NEW.name', [
+                _fts_rows('inventory_fts', ['id', 'name', 'OLD.name'],
+                          'FROM inventory WHERE category_id = OLD.id', delete=True),
+                _fts_rows('inventory_fts', ['id', 'name', 'NEW.name'], 'FROM inventory WHERE category_id = NEW.id'),
+            ]),
+        }
+        for name, (event, statements) in triggers.items():
+            body = "\n                    ".join(statements)
+            c.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {name} {event}
+                BEGIN
+                    {body}
+                END
+            ''')
+
 
 
 def update_database_schema():
-    """Update existing database schema"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # Add category_id column if it doesn't exist (migrate from legacy 'category' text column)
-    try:
-        c.execute("ALTER TABLE inventory ADD COLUMN category_id INTEGER")
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-
-    # Add cost_price column if it doesn't exist
-    try:
-        c.execute("ALTER TABLE inventory ADD COLUMN cost_price REAL DEFAULT 0.0")
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    
-    # Add measurement_unit_id column if it doesn't exist
-    try:
-        c.execute("ALTER TABLE inventory ADD COLUMN measurement_unit_id INTEGER")
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    
-    # Add selling_price column to transactions if it doesn't exist
-    try:
-        c.execute("ALTER TABLE transactions ADD COLUMN selling_price REAL DEFAULT 0.0")
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    
-    conn.close()
+    """Update existing database schema (applies any pending migrations)"""
+    from database.models.migrations import migrate
+    return migrate()
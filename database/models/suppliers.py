@@ -1,77 +1,64 @@
 """Suppliers database model and operations"""
-import sqlite3
 import config
-
-
-def get_connection():
-    """Get database connection"""
-    return sqlite3.connect(config.DB_NAME)
+from database.connection import connection
 
 
 def add_supplier(name, contact=None, email=None, phone=None):
     """Add a new supplier"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    c.execute('''
-        INSERT INTO suppliers (name, contact, email, phone)
-        VALUES (?, ?, ?)
-    ''', (name, contact, email, phone))
+    with connection() as conn:
+        c = conn.cursor()
     
-    conn.commit()
-    conn.close()
+        c.execute('''
+            INSERT INTO suppliers (name, contact, email, phone)
+            VALUES (?, ?, ?)
+        ''', (name, contact, email, phone))
 
 
 def get_suppliers():
     """Get all suppliers"""
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
     
-    c.execute("SELECT * FROM suppliers ORDER BY name")
-    suppliers = c.fetchall()
-    conn.close()
+        c.execute("SELECT * FROM suppliers ORDER BY name")
+        suppliers = c.fetchall()
+
     return suppliers
 
 
 def update_supplier(supplier_id, name=None, contact=None, email=None, phone=None):
     """Update supplier"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # Build dynamic update query
-    updates = []
-    values = []
+    with connection() as conn:
+        c = conn.cursor()
     
-    if name is not None:
-        updates.append("name = ?")
-        values.append(name)
+        # Build dynamic update query
+        updates = []
+        values = []
     
-    if contact is not None:
-        updates.append("contact = ?")
-        values.append(contact)
+        if name is not None:
+            updates.append("name = ?")
+            values.append(name)
     
-    if email is not None:
-        updates.append("email = ?")
-        values.append(email)
+        if contact is not None:
+            updates.append("contact = ?")
+            values.append(contact)
     
-    if phone is not None:
-        updates.append("phone = ?")
-        values.append(phone)
+        if email is not None:
+            updates.append("email = ?")
+            values.append(email)
     
-    if updates:
-        values.append(supplier_id)
-        query = f"UPDATE suppliers SET {', '.join(updates)} WHERE id = ?"
-        c.execute(query, values)
-        conn.commit()
+        if phone is not None:
+            updates.append("phone = ?")
+            values.append(phone)
     
-    conn.close()
+        if updates:
+            values.append(supplier_id)
+            query = f"UPDATE suppliers SET {', '.join(updates)} WHERE id = ?"
+            c.execute(query, values)
 
 
 def delete_supplier(supplier_id):
     """Delete supplier"""
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
     
-    c.execute("DELETE FROM suppliers WHERE id = ?", (supplier_id,))
-    conn.commit()
-    conn.close()
+        c.execute("DELETE FROM suppliers WHERE id = ?", (supplier_id,))
@@ -1,64 +1,291 @@
 """Transactions database model and operations"""
-import sqlite3
 import config
+from database.connection import connection
+from database.models.ledger import _post_to_ledger
+from database.models.reports import _post_to_rollup
 
 
-def get_connection():
-    """Get database connection"""
-    return sqlite3.connect(config.DB_NAME)
+def _movement_error(transaction_type, quantity):
+    """Why a movement's type or quantity is invalid, or None if both are valid"""
+    if not isinstance(quantity, int) or quantity <= 0:
+        return "Invalid quantity"
+    if transaction_type not in (config.TRANSACTION_TYPE_IN, config.TRANSACTION_TYPE_OUT):
+        return "Invalid transaction type"
+    return None
 
 
 def add_transaction(item_id, transaction_type, quantity, date, notes=None, selling_price=None):
-    """Add a new transaction"""
-    conn = get_connection()
-    c = conn.cursor()
-    
-    # Get current item quantity
-    c.execute("SELECT quantity FROM inventory WHERE id = ?", (item_id,))
-    item = c.fetchone()
-    
-    if not item:
-        conn.close()
-        return False, "Item not found"
-    
-    current_quantity = item[0]
-    
-    # Update inventory based on transaction type
-    if transaction_type == config.TRANSACTION_TYPE_OUT:
-        if quantity > current_quantity:
-            conn.close()
-            return False, "Insufficient inventory"
-        new_quantity = current_quantity - quantity
-    else:  # IN transaction
-        new_quantity = current_quantity + quantity
+    """Add a new transaction and apply it to the item's stock atomically.
+
+    Returns (success, message, new_quantity); new_quantity is None when the
+    movement was rejected.
+    """
+    error = _movement_error(transaction_type, quantity)
+    if error:
+        return False, error, None
     
-    # Add transaction
-    c.execute('''
-        INSERT INTO transactions (item_id, transaction_type, quantity, date, notes, selling_price)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (item_id, transaction_type, quantity, date, notes, selling_price))
+    delta = -quantity if transaction_type == config.TRANSACTION_TYPE_OUT else quantity
     
-    # Update inventory quantity
-    c.execute("UPDATE inventory SET quantity = ? WHERE id = ?", (new_quantity, item_id))
+    with connection() as conn:
+        c = conn.cursor()
+        
+        # Take the write lock up front so no other writer can move this stock
+        # between the check below and the insert
+        if not conn.in_transaction:
+            c.execute("BEGIN IMMEDIATE")
+        
+        # Update inventory only if the movement keeps stock non-negative
+        c.execute('''
+            UPDATE inventory SET quantity = quantity + ?
+            WHERE id = ? AND quantity + ? >= 0
+        ''', (delta, item_id, delta))
+        
+        if c.rowcount == 0:
+            c.execute("SELECT 1 FROM inventory WHERE id = ?", (item_id,))
+            if not c.fetchone():
+                return False, "Item not found", None
+            return False, "Insufficient inventory", None
+        
+        # Add transaction
+        c.execute('''
+            INSERT INTO transactions (item_id, transaction_type, quantity, date, notes, selling_price)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (item_id, transaction_type, quantity, date, notes, selling_price))
+        previous_id = c.lastrowid - 1
+        _post_to_ledger(c, previous_id)
+        _post_to_rollup(c, previous_id)
+        
+        c.execute("SELECT quantity FROM inventory WHERE id = ?", (item_id,))
+        new_quantity = c.fetchone()[0]
     
-    conn.commit()
-    conn.close()
-    return True, "Transaction added successfully"
+    return True, "Transaction added successfully", new_quantity
 
 
 def get_transactions():
-    """Get all transactions"""
-    conn = get_connection()
-    c = conn.cursor()
+    """Get the most recent page of transactions"""
+    transactions, _ = get_transactions_page()
+    return transactions
+
+
+def _transaction_filters(filters):
+    """Build WHERE conditions for get_transactions_page() filters"""
+    filters = filters or {}
+    conditions = []
+    params = []
+
+    if filters.get('item_id') is not None:
+        conditions.append("t.item_id = ?")
+        params.append(filters['item_id'])
+    if filters.get('transaction_type'):
+        conditions.append("t.transaction_type = ?")
+        params.append(filters['transaction_type'])
+    if filters.get('start_date'):
+        conditions.append("t.date >= ?")
+        params.append(filters['start_date'])
+    if filters.get('end_date'):
+        conditions.append("t.date <= ?")
+        params.append(filters['end_date'])
+    if filters.get('after_id') is not None:
+        conditions.append("t.id > ?")
+        params.append(filters['after_id'])
+
+    return conditions, params
+
+
+def get_transactions_page(after=None, limit=None, filters=None):
+    """Get one page of transactions, newest first.
+
+    Pages are ordered by (date, id) descending. Pass the cursor returned
+    with one page as ``after`` to get the next; each page is an index seek,
+    so deep pages cost the same as the first. filters may hold item_id,
+    transaction_type, start_date, end_date and after_id (only ids above it).
+
+    Returns (transactions, next_after); next_after is None on the last page.
+    """
+    limit = limit or config.TRANSACTIONS_PAGE_SIZE
+    conditions, params = _transaction_filters(filters)
+
+    def fetch(c, extra_conditions, extra_params, count):
+        where = conditions + extra_conditions
+        query = '''
+            SELECT t.*, i.name as item_name
+            FROM transactions t
+            LEFT JOIN inventory i ON t.item_id = i.id
+        '''
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY t.date DESC, t.id DESC LIMIT ?"
+        c.execute(query, params + extra_params + [count])
+        return c.fetchall()
+
+    # One extra row tells us whether another page follows
+    with connection() as conn:
+        c = conn.cursor()
+
+        if after is None:
+            transactions = fetch(c, [], [], limit + 1)
+        else:
+            # SQLite only seeks on the leading column of a (date, id) row
+            # comparison, so split it: the rest of the cursor's date, then
+            # older dates. Both are range seeks on the date index.
+            after_date, after_id = after
+            transactions = fetch(c, ["t.date = ?", "t.id < ?"], [after_date, after_id], limit + 1)
+            if len(transactions) <= limit:
+                transactions += fetch(c, ["t.date < ?"], [after_date], limit + 1 - len(transactions))
+
+    next_after = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        last = transactions[-1]
+        next_after = (last[4], last[0])  # (date, id)
+
+    return transactions, next_after
+
+
+def get_transactions_cursor(offset, filters=None):
+    """Get the get_transactions_page() cursor of the page starting at position offset.
+
+    For jumping into the middle of the history: the rows before offset are
+    skipped on the date index alone, and later pages follow the cursor.
+    Returns None for offset 0 (the first page needs no cursor) or when
+    fewer than offset rows match.
+    """
+    if offset <= 0:
+        return None
+    conditions, params = _transaction_filters(filters)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+    with connection() as conn:
+        row = conn.execute(f'''
+            SELECT t.date, t.id FROM transactions t{where}
+            ORDER BY t.date DESC, t.id DESC LIMIT 1 OFFSET ?
+        ''', params + [offset - 1]).fetchone()
+    return tuple(row) if row else None
+
+
+def count_transactions(filters=None):
+    """Get the number of transactions matching get_transactions_page() filters"""
+    conditions, params = _transaction_filters(filters)
+    query = "SELECT COUNT(*) FROM transactions t"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+
+    with connection() as conn:
+        return conn.execute(query, params).fetchone()[0]
+
+
+def get_transactions_window(offset, limit, filters=None):
+    """Get transactions by position in the history, newest first.
+
+    Rows and order match get_transactions_page(), but any position can be
+    read directly, as a scrolled table needs. Without filters the offset
+    is skipped on the date index alone, before the join.
+    """
+    conditions, params = _transaction_filters(filters)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(f'''
+            SELECT t.*, i.name as item_name
+            FROM (SELECT t.id FROM transactions t{where}
+                  ORDER BY t.date DESC, t.id DESC LIMIT ? OFFSET ?) page
+            JOIN transactions t ON t.id = page.id
+            LEFT JOIN inventory i ON t.item_id = i.id
+            ORDER BY t.date DESC, t.id DESC
+        ''', params + [limit, offset])
+        return c.fetchall()
+
+
+MOVEMENT_FIELDS = ('item_id', 'transaction_type', 'quantity', 'date', 'notes', 'selling_price')
+
+
+def _normalize_movement(movement):
+    """Turn a mapping or add_transaction-style tuple into a dict"""
+    if isinstance(movement, dict):
+        row = {field: movement.get(field) for field in MOVEMENT_FIELDS}
+    else:
+        row = dict(zip(MOVEMENT_FIELDS, movement))
+        for field in MOVEMENT_FIELDS:
+            row.setdefault(field, None)
+    return row
+
+
+def _load_stock(c, item_ids):
+    """Get {item_id: quantity} for the given items"""
+    stock = {}
+    item_ids = list(item_ids)
+    # Stay under SQLite's default limit on bound parameters
+    for start in range(0, len(item_ids), 900):
+        batch = item_ids[start:start + 900]
+        placeholders = ", ".join("?" * len(batch))
+        c.execute(f"SELECT id, quantity FROM inventory WHERE id IN ({placeholders})", batch)
+        stock.update(c.fetchall())
+    return stock
+
+
+def add_transactions_batch(movements, all_or_nothing=True):
+    """Post many stock movements in one transaction.
+
+    movements is an iterable of dicts or (item_id, transaction_type,
+    quantity, date, notes, selling_price) tuples. Lines are checked in
+    order against the current stock, then all accepted lines are inserted
+    and each item's stock is updated once with the aggregated change.
+
+    With all_or_nothing, any rejected line rejects the whole batch;
+    otherwise the valid lines are posted and the rest are reported.
+    Returns one (success, message, new_quantity) per line, as
+    add_transaction() does.
+    """
+    lines = [_normalize_movement(movement) for movement in movements]
     
-    c.execute('''
-        SELECT t.*, i.name as item_name
-        FROM transactions t
-        LEFT JOIN inventory i ON t.item_id = i.id
-        ORDER BY t.date DESC
-        LIMIT 100
-    ''')
+    with connection() as conn:
+        c = conn.cursor()
+        
+        # Hold the write lock from the stock check until the updates land
+        if not conn.in_transaction:
+            c.execute("BEGIN IMMEDIATE")
+        
+        stock = _load_stock(c, {line['item_id'] for line in lines})
+        
+        results = []
+        accepted = []
+        deltas = {}
+        for line in lines:
+            item_id = line['item_id']
+            quantity = line['quantity']
+            if item_id not in stock:
+                results.append((False, "Item not found", None))
+                continue
+            error = _movement_error(line['transaction_type'], quantity)
+            if error:
+                results.append((False, error, None))
+                continue
+            
+            delta = -quantity if line['transaction_type'] == config.TRANSACTION_TYPE_OUT else quantity
+            if stock[item_id] + delta < 0:
+                results.append((False, "Insufficient inventory", None))
+                continue
+            
+            stock[item_id] += delta
+            deltas[item_id] = deltas.get(item_id, 0) + delta
+            accepted.append(line)
+            results.append((True, "Transaction added successfully", stock[item_id]))
+        
+        if all_or_nothing and len(accepted) < len(lines):
+            return [result if not result[0] else (False, "Batch rejected", None) for result in results]
+        
+        c.execute("SELECT COALESCE(MAX(id), 0) FROM transactions")
+        last_id = c.fetchone()[0]
+        
+        c.executemany('''
+            INSERT INTO transactions (item_id, transaction_type, quantity, date, notes, selling_price)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [tuple(line[field] for field in MOVEMENT_FIELDS) for line in accepted])
+        
+        c.executemany("UPDATE inventory SET quantity = quantity + ? WHERE id = ?",
+                      [(delta, item_id) for item_id, delta in deltas.items() if delta])
+        _post_to_ledger(c, last_id)
+        _post_to_rollup(c, last_id)
     
-    transactions = c.fetchall()
-    conn.close()
-    return transactions
+    return results
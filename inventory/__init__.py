@@ -0,0 +1 @@
+"""Headless command line interface: python -m inventory"""
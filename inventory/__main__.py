@@ -0,0 +1,4 @@
+import sys
+from inventory.cli import main
+
+sys.exit(main())
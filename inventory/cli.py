@@ -0,0 +1,161 @@
+"""Command line interface for scripted and scheduled jobs.
+
+Reuses the database.models functions and never imports tkinter or any ui
+module, so it starts quickly and runs on headless servers::
+
+    python -m inventory init-db
+    python -m inventory import items.csv --mode upsert
+    python -m inventory post-movements movements.csv
+    python -m inventory report sales --start 2026-01-01 --end 2026-01-31
+    python -m inventory export --output-dir exports --format columnar
+    python -m inventory stats
+"""
+import argparse
+import os
+import sys
+import config
+from database import models
+
+REPORTS = {
+    'inventory': models.generate_inventory_report,
+    'transactions': models.generate_transaction_report,
+    'sales': models.generate_sales_report,
+    'profit_loss': models.generate_profit_loss_report,
+    'suppliers': models.generate_supplier_report,
+    'users': models.generate_user_activity_report,
+}
+
+
+def _print_bulk_result(result, verb):
+    """Print the summary of a bulk import and return the exit code"""
+    print(f"{verb} {result['rows']} rows in {result['seconds']:.2f}s "
+          f"({result['rows_per_sec']:.0f} rows/sec)")
+    for row_number, reason in result['skipped']:
+        print(f"Skipped row {row_number + 1}: {reason}", file=sys.stderr)
+    return 0 if not result['skipped'] else 1
+
+
+def cmd_init_db(args):
+    """Create or upgrade the database schema"""
+    applied = models.migrate()
+    print(f"Schema version {models.get_schema_version()}"
+          + (f" (applied migrations {', '.join(map(str, applied))})" if applied else " (up to date)"))
+    return 0
+
+
+def cmd_import(args):
+    """Bulk import inventory items from CSV"""
+    from database.import_helpers import import_items_csv
+
+    result = import_items_csv(args.csv_file, args.mode, args.chunk_size, args.create_categories)
+    return _print_bulk_result(result, "Imported")
+
+
+def cmd_post_movements(args):
+    """Post stock movements from CSV"""
+    from database.import_helpers import post_movements_csv
+
+    result = post_movements_csv(args.csv_file, args.chunk_size)
+    return _print_bulk_result(result, "Posted")
+
+
+def cmd_report(args):
+    """Print the summary figures of one report"""
+    data = REPORTS[args.name](args.start, args.end)
+    print(f"{args.name.replace('_', ' ').title()} report")
+    for key, value in data.items():
+        if isinstance(value, float):
+            print(f"  {key.replace('_', ' ')}: {value:.2f}")
+        elif isinstance(value, (str, int)):
+            print(f"  {key.replace('_', ' ')}: {value}")
+    return 0
+
+
+def cmd_export(args):
+    """Generate reports concurrently and write their exports"""
+    batch = models.generate_reports_batch(args.reports, args.start, args.end, args.output_dir,
+                                          args.format, args.workers, args.threads)
+    return models.reports.print_batch_summary(batch)
+
+
+def cmd_stats(args):
+    """Print row counts, stock figures and database size"""
+    with models.connection() as conn:
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ('inventory', 'categories', 'suppliers', 'transactions', 'users')}
+        stock_value, stock_units = conn.execute(
+            "SELECT COALESCE(SUM(quantity * COALESCE(cost_price, 0)), 0), COALESCE(SUM(quantity), 0) FROM inventory"
+        ).fetchone()
+        low_stock = conn.execute("SELECT COUNT(*) FROM inventory WHERE quantity < ?",
+                                 (config.LOW_STOCK_THRESHOLD,)).fetchone()[0]
+        last_movement = conn.execute("SELECT MAX(date) FROM transactions").fetchone()[0]
+
+    size = sum(os.path.getsize(config.DB_NAME + suffix)
+               for suffix in ('', '-wal') if os.path.exists(config.DB_NAME + suffix))
+
+    print(f"Database: {config.DB_NAME} ({size / 2**20:.1f} MiB, schema version {models.get_schema_version()})")
+    for table, count in counts.items():
+        print(f"  {table}: {count}")
+    print(f"  units in stock: {stock_units}")
+    print(f"  stock value: {stock_value:.2f}")
+    print(f"  low stock items: {low_stock}")
+    print(f"  last movement: {last_movement or 'none'}")
+    return 0
+
+
+def build_parser():
+    """Build the argument parser with one subcommand per job"""
+    parser = argparse.ArgumentParser(prog="python -m inventory", description="Inventory Management System, headless")
+    parser.add_argument('--db', default=config.DB_NAME, help="database file (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('init-db', help="create or upgrade the database schema").set_defaults(func=cmd_init_db)
+
+    command = commands.add_parser('import', help="bulk import items from CSV")
+    command.add_argument('csv_file', help="CSV with columns name, category, quantity, cost_price (and id for updates)")
+    command.add_argument('--mode', choices=['insert', 'update', 'upsert'], default='insert')
+    command.add_argument('--chunk-size', type=int, default=None)
+    command.add_argument('--create-categories', action='store_true',
+                         help="Create categories that don't exist yet instead of skipping the row")
+    command.set_defaults(func=cmd_import)
+
+    command = commands.add_parser('post-movements', help="post stock movements from CSV")
+    command.add_argument('csv_file', help="CSV with columns item_id or item, transaction_type, quantity, date, "
+                                          "notes, selling_price")
+    command.add_argument('--chunk-size', type=int, default=None)
+    command.set_defaults(func=cmd_post_movements)
+
+    command = commands.add_parser('report', help="print the summary of a report")
+    command.add_argument('name', choices=sorted(REPORTS))
+    command.add_argument('--start', help="start date (YYYY-MM-DD)")
+    command.add_argument('--end', help="end date (YYYY-MM-DD)")
+    command.set_defaults(func=cmd_report)
+
+    command = commands.add_parser('export', help="generate reports concurrently and export them")
+    command.add_argument('reports', nargs='*', metavar='report', help=f"any of {', '.join(models.reports.BATCH_REPORTS)} (default: all)")
+    command.add_argument('--start', help="start date (YYYY-MM-DD)")
+    command.add_argument('--end', help="end date (YYYY-MM-DD)")
+    command.add_argument('--output-dir', default=".", help="directory for the exports")
+    command.add_argument('--format', choices=('csv', 'columnar'), default='csv')
+    command.add_argument('--workers', type=int, help="number of workers (default: one per report)")
+    command.add_argument('--threads', action='store_true', help="use threads instead of processes")
+    command.set_defaults(func=cmd_export)
+
+    commands.add_parser('stats', help="show row counts, stock figures and database size").set_defaults(func=cmd_stats)
+
+    return parser
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'export':
+        unknown = [name for name in args.reports if name not in models.reports.BATCH_REPORTS]
+        if unknown:
+            parser.error(f"unknown report(s): {', '.join(unknown)}")
+
+    config.DB_NAME = args.db
+    if args.func is not cmd_init_db:
+        models.migrate()
+    return args.func(args)
@@ -1,73 +1,138 @@
-import tkinter as tk
-from tkinter import messagebox, simpledialog
 import sys
 import os
+import time
+from contextlib import contextmanager
 import config
-from database import models
-from auth import auth
-from ui.login import LoginWindow
-from ui.windows import InventoryManagementGUI
+from utils import telemetry
 
 # Add current directory to Python path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# region agent log
-_DEBUG_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "debug-31c49c.log")
-
-def _agent_log(hypothesisId: str, location: str, message: str, data: dict | None = None, runId: str = "pre-fix"):
-    try:
-        import json, time
-        payload = {
-            "sessionId": "31c49c",
-            "runId": runId,
-            "hypothesisId": hypothesisId,
-            "location": location,
-            "message": message,
-            "data": data or {},
-            "timestamp": int(time.time() * 1000),
-        }
-        with open(_DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
-    except Exception:
-        pass
-
-
 def _install_excepthook():
+    """Record unhandled exceptions as telemetry before the default hook prints them"""
     def _hook(exc_type, exc, tb):
         try:
             import traceback
-            _agent_log(
-                "H-exception",
-                "main.py:sys.excepthook",
-                "Unhandled exception",
-                {"type": getattr(exc_type, "__name__", str(exc_type)), "message": str(exc), "traceback": "".join(traceback.format_tb(tb))},
+            telemetry.event(
+                "app.unhandled_exception",
+                telemetry.ERROR,
+                type=getattr(exc_type, "__name__", str(exc_type)),
+                message=str(exc),
+                traceback="".join(traceback.format_tb(tb)),
             )
+            telemetry.flush()
         finally:
             sys.__excepthook__(exc_type, exc, tb)
 
     sys.excepthook = _hook
-# endregion
+
+
+class StartupProfile:
+    """Phase and import timings printed by --profile-startup.
+
+    Heavy modules (tkinter, the database models, the UI) are imported inside
+    the phase that first needs them. Within a phase every import statement
+    or importlib.import_module() call that loads new modules is timed, so
+    the lazily loaded models, tabs and export code are broken down too;
+    imports taking at least IMPORT_THRESHOLD_MS are listed under their
+    phase, indented by nesting, with the time including their own imports.
+    """
+
+    IMPORT_THRESHOLD_MS = 1.0
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        """Time a startup phase and, when enabled, the imports it runs"""
+        imports = []
+        restore = self._time_imports(imports) if self.enabled else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if restore:
+                restore()
+            self.phases.append((name, seconds, [entry for entry in imports if entry[2] is not None]))
+
+    @staticmethod
+    def _time_imports(imports):
+        """Record [depth, module, seconds] for imports that load modules; returns the undo"""
+        import builtins
+        import importlib.util
+        original_import = builtins.__import__
+        original_import_module = importlib.import_module
+        depth = 0
+
+        def timed(load, module):
+            nonlocal depth
+            entry = [depth, module, None]
+            imports.append(entry)
+            loaded = len(sys.modules)
+            start = time.perf_counter()
+            depth += 1
+            try:
+                return load()
+            finally:
+                depth -= 1
+                if len(sys.modules) > loaded:
+                    entry[2] = time.perf_counter() - start
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            module = name
+            if level:
+                try:
+                    module = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+                except (ImportError, ValueError):
+                    pass
+            return timed(lambda: original_import(name, globals, locals, fromlist, level), module)
+
+        def timed_import_module(name, package=None):
+            return timed(lambda: original_import_module(name, package), name)
+
+        builtins.__import__ = timed_import
+        importlib.import_module = timed_import_module
+
+        def restore():
+            builtins.__import__ = original_import
+            importlib.import_module = original_import_module
+        return restore
+
+    def report(self, milestone):
+        """Print the phases and slow imports timed so far and the time since startup"""
+        if not self.enabled:
+            return
+        print(f"Startup profile ({milestone}):", file=sys.stderr)
+        for name, seconds, imports in self.phases:
+            print(f"  {name:<28}{seconds * 1000:8.1f} ms", file=sys.stderr)
+            for depth, module, module_seconds in imports:
+                if module_seconds * 1000 >= self.IMPORT_THRESHOLD_MS:
+                    label = "  " * depth + module
+                    print(f"    {label:<26}{module_seconds * 1000:8.1f} ms", file=sys.stderr)
+        print(f"  {'total since launch':<28}{(time.perf_counter() - self.started) * 1000:8.1f} ms", file=sys.stderr)
+        self.phases = []
 
 
 def init_database():
-    """Initialize all database tables"""
-    models.init_db()
-    models.create_categories_table()
-    models.create_suppliers_table()
-    models.create_transactions_table()
-    models.create_users_table()
-    models.create_measurement_units_table()
-    models.init_default_measurement_units()
-    models.update_database_schema()  # Update existing database
+    """Initialize all database tables (applies pending schema migrations)"""
+    from database import models
+    models.migrate()
 
 
 def create_first_admin():
     """Create first admin user if no users exist. Returns True if first admin was created."""
+    from auth import auth
     users = auth.get_all_users()
     if users:
         return False  # Users already exist
     
     # Create first admin user
+    import tkinter as tk
+    from tkinter import messagebox, simpledialog
     setup_root = tk.Tk()
     setup_root.iconbitmap("ui/images/favicon.ico")
     setup_root.geometry(config.SETUP_WINDOW_GEOMETRY)
@@ -95,36 +160,54 @@ def create_first_admin():
     return True  # First admin was created
 
 
-def main():
+def main(profile_startup=False):
     """Main application entry point"""
+    profile = StartupProfile(profile_startup)
     _install_excepthook()
-    _agent_log("H-flow", "main.py:main", "Starting application")
+    telemetry.event("app.start")
     # Initialize database
-    init_database()
-    _agent_log("H-flow", "main.py:main", "Database initialized")
+    with profile.phase("import database.models"):
+        from database import models  # noqa: F401
+    with profile.phase("schema check/migrate"):
+        init_database()
+    telemetry.event("app.database_ready")
     
     # Create first admin user if needed
-    first_admin_created = create_first_admin()
-    _agent_log("H-flow", "main.py:main", "First-admin check completed", {"created": bool(first_admin_created)})
+    with profile.phase("import auth"):
+        from auth import auth  # noqa: F401
+    with profile.phase("first-admin check"):
+        first_admin_created = create_first_admin()
+    telemetry.event("app.first_admin_checked", created=bool(first_admin_created))
     
     # Show login window (either immediately or after admin creation)
-    root = tk.Tk()
-    login_window = LoginWindow(root)
+    with profile.phase("import tkinter + ui.login"):
+        import tkinter as tk
+        from ui.login import LoginWindow
+    with profile.phase("build login window"):
+        root = tk.Tk()
+        login_window = LoginWindow(root)
+        root.update_idletasks()
+    profile.report("login window ready")
     root.mainloop()
-    _agent_log("H-flow", "main.py:main", "Login window closed", {"authenticated": bool(login_window.authenticated_user)})
+    telemetry.event("app.login_closed", authenticated=bool(login_window.authenticated_user))
     
     # If login successful, show main application
     if login_window.authenticated_user:
-        main_root = tk.Tk()
-        app = InventoryManagementGUI(main_root, login_window.authenticated_user)
+        with profile.phase("import ui.windows"):
+            from ui.windows import InventoryManagementGUI
+        with profile.phase("build main window"):
+            main_root = tk.Tk()
+            app = InventoryManagementGUI(main_root, login_window.authenticated_user)
+            main_root.update_idletasks()
+        profile.report("main window ready")
         main_root.mainloop()
 
 
 if __name__ == "__main__":
     _install_excepthook()
-    _agent_log("H-flow", "main.py:__main__", "Entered __main__", {"argv": sys.argv})
+    telemetry.event("app.launch", argv=sys.argv)
     try:
-        main()
+        main(profile_startup="--profile-startup" in sys.argv[1:])
     except Exception as e:
-        _agent_log("H-exception", "main.py:__main__", "Exception bubbled to __main__", {"type": type(e).__name__, "message": str(e)})
+        telemetry.event("app.exception", telemetry.ERROR, type=type(e).__name__, message=str(e))
         raise
@@ -28,7 +28,8 @@ class TestAuthentication(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test database"""
-        # Restore original config
+        # Release pooled connections and restore original config
+        models.close_pool()
         config.DB_NAME = self.original_db
         
         # Remove test database
@@ -0,0 +1,140 @@
+import unittest
+import os
+import tempfile
+from database import models
+from database import import_helpers
+import config
+
+
+class TestBulkImport(unittest.TestCase):
+    """Test bulk item insert, update, upsert and CSV import"""
+    
+    def setUp(self):
+        """Set up test database"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+        models.add_category("Drinks")
+        models.add_category("Snacks")
+    
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+    
+    def items_by_name(self):
+        """Return {name: (category_name, quantity, cost_price)}"""
+        return {item[1]: (item[6], item[3], item[9]) for item in models.view_items()}
+    
+    def ids_by_name(self):
+        """Return {name: id}"""
+        return {item[1]: item[0] for item in models.view_items()}
+    
+    def import_csv(self, importer, text, **kwargs):
+        """Run importer on a temporary CSV file holding text"""
+        csv_file = tempfile.NamedTemporaryFile('w', delete=False, suffix='.csv', newline='')
+        csv_file.write(text)
+        csv_file.close()
+        try:
+            return importer(csv_file.name, **kwargs)
+        finally:
+            os.unlink(csv_file.name)
+    
+    def test_add_items_bulk_streams_chunks(self):
+        """Test inserting from a generator across several chunks"""
+        rows = (("Item %03d" % n, "Drinks", n, 1.5) for n in range(25))
+        result = models.add_items_bulk(rows, chunk_size=10)
+        
+        self.assertEqual(result['rows'], 25)
+        self.assertEqual(result['skipped'], [])
+        self.assertGreater(result['rows_per_sec'], 0)
+        items = self.items_by_name()
+        self.assertEqual(len(items), 25)
+        self.assertEqual(items["Item 007"], ("Drinks", 7, 1.5))
+    
+    def test_unknown_category_skipped_or_created(self):
+        """Test rows with unknown categories"""
+        rows = [
+            {'name': "Cola", 'category': "Drinks", 'quantity': 5, 'cost_price': 0.5},
+            {'name': "Soap", 'category': "Household", 'quantity': 2, 'cost_price': 1.0},
+        ]
+        result = models.add_items_bulk(rows)
+        self.assertEqual(result['rows'], 1)
+        self.assertEqual(result['skipped'], [(1, "Category not found: Household")])
+        
+        result = models.add_items_bulk(rows[1:], create_categories=True)
+        self.assertEqual(result['rows'], 1)
+        self.assertIn("Household", [category[1] for category in models.get_categories()])
+        self.assertEqual(self.items_by_name()["Soap"], ("Household", 2, 1.0))
+    
+    def test_update_and_upsert(self):
+        """Test bulk update by id and upsert by name"""
+        models.add_items_bulk([("Cola", "Drinks", 5, 0.5), ("Chips", "Snacks", 8, 0.8)])
+        cola_id = next(item[0] for item in models.view_items() if item[1] == "Cola")
+        
+        models.update_items_bulk([{'id': cola_id, 'quantity': 50}])
+        self.assertEqual(self.items_by_name()["Cola"], ("Drinks", 50, 0.5))
+        
+        result = models.upsert_items_bulk([("Chips", "Snacks", 10, 0.9), ("Juice", "Drinks", 3, 1.2)])
+        self.assertEqual(result['rows'], 2)
+        items = self.items_by_name()
+        self.assertEqual(len(items), 3)
+        self.assertEqual(items["Chips"], ("Snacks", 10, 0.9))
+        self.assertEqual(items["Juice"], ("Drinks", 3, 1.2))
+    
+    def test_import_items_csv(self):
+        """Test importing items from a CSV file"""
+        csv_file = tempfile.NamedTemporaryFile('w', delete=False, suffix='.csv', newline='')
+        csv_file.write("name,category,quantity,cost_price\nCola,Drinks,5,0.5\nChips,Snacks,8,\n")
+        csv_file.close()
+        try:
+            result = import_helpers.import_items_csv(csv_file.name)
+        finally:
+            os.unlink(csv_file.name)
+        
+        self.assertEqual(result['rows'], 2)
+        items = self.items_by_name()
+        self.assertEqual(items["Cola"], ("Drinks", 5, 0.5))
+        self.assertEqual(items["Chips"], ("Snacks", 8, 0.0))
+
+    def test_update_counts_rows_written(self):
+        """Test that rows without an id or with an unknown one are skipped, not counted"""
+        models.add_items_bulk([("Cola", "Drinks", 5, 0.5)])
+        cola_id = self.ids_by_name()["Cola"]
+        
+        result = models.update_items_bulk([{'id': cola_id, 'quantity': 7}, {'id': None, 'quantity': 1},
+                                           {'id': 99, 'quantity': 1}])
+        self.assertEqual(result['rows'], 1)
+        self.assertEqual(result['skipped'], [(1, "Missing id"), (2, "Item not found: 99")])
+        self.assertEqual(self.items_by_name()["Cola"], ("Drinks", 7, 0.5))
+    
+    def test_malformed_csv_rows_skipped(self):
+        """Test that a malformed number skips its row and the rest of the file is imported"""
+        result = self.import_csv(import_helpers.import_items_csv,
+                                 "name,category,quantity,cost_price\nCola,Drinks,5,0.5\n"
+                                 "Chips,Snacks,lots,0.8\nJuice,Drinks,3,cheap\nWater,Drinks,2,0.2\n",
+                                 chunk_size=1)
+        self.assertEqual(result['rows'], 2)
+        self.assertEqual(result['skipped'], [(1, "Invalid quantity: 'lots'"), (2, "Invalid cost_price: 'cheap'")])
+        self.assertEqual(sorted(self.items_by_name()), ["Cola", "Water"])
+        
+        result = self.import_csv(import_helpers.post_movements_csv,
+                                 "item,transaction_type,quantity,date,selling_price\n"
+                                 "Cola,IN,1,2026-01-01,\nCola,OUT,two,2026-01-02,\n"
+                                 "Cola,OUT,1,2026-01-03,x\nNope,IN,1,2026-01-04,\nWater,IN,4,2026-01-05,\n",
+                                 chunk_size=2)
+        self.assertEqual(result['rows'], 2)
+        self.assertEqual(result['skipped'], [(1, "Invalid quantity: 'two'"), (2, "Invalid selling_price: 'x'"),
+                                             (3, "Item not found")])
+        self.assertEqual(self.items_by_name()["Water"], ("Drinks", 6, 0.2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout, redirect_stderr
+from database import models
+from inventory import cli
+import config
+
+
+class TestCli(unittest.TestCase):
+    """Test the headless command line interface"""
+    
+    def setUp(self):
+        """Set up an empty database file and a scratch directory"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        self.original_db = config.DB_NAME
+        self.work_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test database and files"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db.name + suffix):
+                os.unlink(self.test_db.name + suffix)
+        shutil.rmtree(self.work_dir)
+    
+    def run_cli(self, *argv):
+        """Run the CLI in-process and return (exit code, stdout, stderr)"""
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = cli.main(['--db', self.test_db.name, *argv])
+        return code, out.getvalue(), err.getvalue()
+    
+    def write_csv(self, name, content):
+        """Write a CSV into the scratch directory and return its path"""
+        path = os.path.join(self.work_dir, name)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        return path
+    
+    def test_import_post_and_stats(self):
+        """Test a nightly job: import items, post movements, read the stats"""
+        code, out, _ = self.run_cli('init-db')
+        self.assertEqual(code, 0)
+        self.assertIn("applied migrations", out)
+        
+        items = self.write_csv("items.csv", "name,category,quantity,cost_price\nCola,Drinks,5,0.5\nChips,,8,1.0\n")
+        code, out, _ = self.run_cli('import', items, '--create-categories')
+        self.assertEqual((code, out.split()[:2]), (0, ["Imported", "2"]))
+        
+        movements = self.write_csv("movements.csv",
+                                   "item,transaction_type,quantity,date,selling_price\n"
+                                   "Cola,out,2,2026-01-02,1.5\n"
+                                   "Chips,OUT,99,2026-01-02,2.0\n"
+                                   "Gum,IN,1,2026-01-02,\n")
+        code, out, err = self.run_cli('post-movements', movements)
+        self.assertEqual(code, 1)
+        self.assertIn("Posted 1 rows", out)
+        self.assertIn("Skipped row 2: Insufficient inventory", err)
+        self.assertIn("Skipped row 3: Item not found", err)
+        
+        code, out, _ = self.run_cli('stats')
+        self.assertEqual(code, 0)
+        self.assertIn("transactions: 1", out)
+        self.assertIn("units in stock: 11", out)
+        self.assertIn("low stock items: 2", out)
+    
+    def test_report_and_export(self):
+        """Test printing a report summary and exporting reports"""
+        code, out, _ = self.run_cli('report', 'inventory')
+        self.assertEqual(code, 0)
+        self.assertIn("total items: 0", out)
+        
+        code, out, _ = self.run_cli('export', 'inventory', 'sales', '--threads', '--output-dir', self.work_dir)
+        self.assertEqual(code, 0)
+        self.assertIn("wall time", out)
+        self.assertEqual(len([name for name in os.listdir(self.work_dir) if name.endswith('.csv')]), 2)
+    
+    def test_no_ui_imports(self):
+        """Test that the CLI never imports tkinter or the ui package"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = ("import sys; from inventory.cli import main; main(sys.argv[1:]); "
+                  "print(sorted(m for m in sys.modules if m.split('.')[0] in ('tkinter', '_tkinter', 'ui')))")
+        result = subprocess.run([sys.executable, '-c', script, '--db', self.test_db.name, 'stats'],
+                                cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.splitlines()[-1], "[]")
+
+
+if __name__ == '__main__':
+    unittest.main()
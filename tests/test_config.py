@@ -13,6 +13,14 @@ class TestConfigConstants(unittest.TestCase):
         self.assertIsNotNone(config.DB_NAME)
         self.assertEqual(config.DB_NAME, 'inventory.db')
     
+    def test_storage_profiles_defined(self):
+        """Test storage profile configuration"""
+        self.assertIn(config.DB_PROFILE, config.DB_PROFILES)
+        for name, settings in config.DB_PROFILES.items():
+            for key in ('journal_mode', 'synchronous', 'cache_size',
+                        'mmap_size', 'temp_store', 'busy_timeout'):
+                self.assertIn(key, settings, f"{name} profile missing {key}")
+    
     def test_window_geometry_valid(self):
         """Test window geometry is valid"""
         # Should be in format "WIDTHxHEIGHT"
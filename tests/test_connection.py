@@ -0,0 +1,171 @@
+import unittest
+import os
+import tempfile
+import threading
+import sqlite3
+from database import connection as db
+import config
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test the shared connection pool"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+
+        with db.connection() as conn:
+            conn.execute('CREATE TABLE numbers (id INTEGER PRIMARY KEY, value INTEGER)')
+
+    def tearDown(self):
+        """Clean up test database"""
+        db.close_pool()
+        config.DB_NAME = self.original_db
+
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+
+    def test_connection_reused(self):
+        """Test that sequential blocks reuse the same pooled connection"""
+        with db.connection() as first:
+            pass
+        with db.connection() as second:
+            pass
+        self.assertIs(first, second)
+
+    def test_commit_and_rollback(self):
+        """Test that blocks commit on success and roll back on error"""
+        with db.connection() as conn:
+            conn.execute('INSERT INTO numbers (value) VALUES (1)')
+
+        with self.assertRaises(ValueError):
+            with db.connection() as conn:
+                conn.execute('INSERT INTO numbers (value) VALUES (2)')
+                raise ValueError("abort")
+
+        with db.connection() as conn:
+            values = [row[0] for row in conn.execute('SELECT value FROM numbers')]
+        self.assertEqual(values, [1])
+
+    def test_nested_blocks_share_connection(self):
+        """Test that nested blocks on one thread share a connection"""
+        pool = db.ConnectionPool(config.DB_NAME, max_size=1)
+        with pool.connection() as outer:
+            with pool.connection() as inner:
+                self.assertIs(outer, inner)
+        pool.close()
+
+    def test_pool_is_bounded(self):
+        """Test that checkout blocks once the pool is exhausted"""
+        pool = db.ConnectionPool(config.DB_NAME, max_size=1, timeout=0.05)
+        conn = pool.checkout()
+        with self.assertRaises(sqlite3.OperationalError):
+            pool.checkout()
+        pool.checkin(conn)
+        pool.checkin(pool.checkout())
+        pool.close()
+
+    def test_threads_get_distinct_connections(self):
+        """Test that concurrent threads never share a connection"""
+        pool = db.ConnectionPool(config.DB_NAME, max_size=2)
+        barrier = threading.Barrier(2)
+        seen = []
+
+        def worker():
+            with pool.connection() as conn:
+                seen.append(conn)
+                barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(seen), 2)
+        self.assertIsNot(seen[0], seen[1])
+        pool.close()
+
+    def test_storage_profile_applied(self):
+        """Test that connections use the configured storage profile"""
+        with db.connection() as conn:
+            journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+            busy_timeout = conn.execute('PRAGMA busy_timeout').fetchone()[0]
+        settings = config.DB_PROFILES[config.DB_PROFILE]
+        self.assertEqual(journal_mode.upper(), settings['journal_mode'])
+        self.assertEqual(busy_timeout, settings['busy_timeout'])
+
+        conn = db.get_connection('durable')
+        try:
+            self.assertEqual(conn.execute('PRAGMA synchronous').fetchone()[0], 2)  # FULL
+        finally:
+            conn.close()
+
+    def test_reader_not_blocked_by_writer(self):
+        """Test that WAL lets a reader see committed data during a write"""
+        with db.connection() as conn:
+            conn.execute('INSERT INTO numbers (value) VALUES (1)')
+
+        writer = db.get_connection()
+        reader = db.get_connection()
+        try:
+            writer.execute('BEGIN IMMEDIATE')
+            writer.execute('INSERT INTO numbers (value) VALUES (2)')
+            count = reader.execute('SELECT COUNT(*) FROM numbers').fetchone()[0]
+            self.assertEqual(count, 1)
+            writer.commit()
+        finally:
+            writer.close()
+            reader.close()
+
+    def test_next_available_id_gap_query(self):
+        """Test id reuse on a table without free-id tracking"""
+        self.assertEqual(db.get_next_available_id('numbers'), 1)
+        with db.connection() as conn:
+            conn.executemany('INSERT INTO numbers (id, value) VALUES (?, 0)', [(1,), (2,), (4,)])
+        self.assertEqual(db.get_next_available_id('numbers'), 3)
+        with db.connection() as conn:
+            conn.execute('INSERT INTO numbers (id, value) VALUES (3, 0)')
+        self.assertEqual(db.get_next_available_id('numbers'), 5)
+
+    def test_pool_follows_db_name(self):
+        """Test that changing DB_NAME switches the shared pool"""
+        pool = db.get_pool()
+        other_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        other_db.close()
+        try:
+            config.DB_NAME = other_db.name
+            self.assertIsNot(db.get_pool(), pool)
+            self.assertEqual(db.get_pool().database, other_db.name)
+        finally:
+            db.close_pool()
+            config.DB_NAME = self.test_db.name
+            os.unlink(other_db.name)
+
+
+    def test_query_stream(self):
+        """Test that a query stream fetches in batches on its own connection"""
+        with db.connection() as conn:
+            conn.executemany('INSERT INTO numbers (value) VALUES (?)', [(n,) for n in range(25)])
+
+        stream = db.QueryStream('SELECT value FROM numbers ORDER BY value', batch_size=10)
+        with db.connection() as held:
+            values = [row[0] for row in stream]
+            self.assertFalse(held.in_transaction)
+        self.assertEqual(values, list(range(25)))
+        # Re-iterable: every pass runs the query again
+        self.assertEqual(len(list(stream)), 25)
+
+        idle = len(db.get_pool()._idle)
+        partial = iter(stream)
+        next(partial)
+        partial.close()
+        self.assertEqual(len(db.get_pool()._idle), idle)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import os
+import tempfile
+from database import models
+import config
+
+
+class TestDailyRollup(unittest.TestCase):
+    """Test the daily per-item rollup and the reports built on it"""
+    
+    def setUp(self):
+        """Set up test database with a few days of movements"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+        models.add_items_bulk([("Cola", None, 100, 0.5), ("Chips", None, 100, 0.8)])
+        self.ids = {item[1]: item[0] for item in models.view_items()}
+        cola, chips = self.ids["Cola"], self.ids["Chips"]
+        
+        models.add_transactions_batch([
+            (cola, "OUT", 2, "2026-01-01 09:00", None, 1.5),
+            (chips, "OUT", 1, "2026-01-01 18:00", None, 2.0),
+            (cola, "IN", 10, "2026-01-02", None, None),
+            (cola, "OUT", 3, "2026-01-02 11:00", None, 1.5),
+            (chips, "OUT", 4, "2026-01-03 08:30", None, 2.25),
+        ])
+        models.add_transaction(cola, "OUT", 5, "2026-01-03 20:00", None, 1.0)
+    
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+    
+    def raw_sales(self, start_date=None, end_date=None):
+        """Aggregate sales straight from transactions; a date-only end covers its whole day"""
+        query = '''
+            SELECT i.name, SUM(t.quantity), SUM(t.quantity * COALESCE(t.selling_price, 0.0))
+            FROM transactions t LEFT JOIN inventory i ON t.item_id = i.id
+            WHERE t.transaction_type = 'OUT'
+        '''
+        params = []
+        if start_date:
+            query += " AND t.date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND t.date <= ?"
+            params.append(end_date if len(end_date) > 10 else end_date + " 23:59:59")
+        query += " GROUP BY i.id, i.name ORDER BY 3 DESC"
+        with models.connection() as conn:
+            return conn.execute(query, params).fetchall()
+    
+    def rollup(self):
+        """Return the rollup rows ordered by day and item"""
+        with models.connection() as conn:
+            return conn.execute('''
+                SELECT day, item_id, qty_in, qty_out, revenue, cost
+                FROM daily_item_rollup ORDER BY day, item_id
+            ''').fetchall()
+    
+    def test_rollup_maintained_on_posting(self):
+        """Test that both posting paths add to their day's row"""
+        cola, chips = self.ids["Cola"], self.ids["Chips"]
+        self.assertEqual(self.rollup(), [
+            ("2026-01-01", cola, 0, 2, 3.0, 1.0),
+            ("2026-01-01", chips, 0, 1, 2.0, 0.8),
+            ("2026-01-02", cola, 10, 3, 4.5, 1.5),
+            ("2026-01-03", cola, 0, 5, 5.0, 2.5),
+            ("2026-01-03", chips, 0, 4, 9.0, 3.2),
+        ])
+    
+    def test_rebuild_matches_incremental(self):
+        """Test that a full rebuild reproduces the trigger-maintained rows"""
+        incremental = self.rollup()
+        self.assertEqual(models.rebuild_daily_rollup(), len(incremental))
+        self.assertEqual(self.rollup(), incremental)
+    
+    def test_sales_report_matches_raw_rows(self):
+        """Test whole-day and partial-day ranges against the raw aggregation"""
+        ranges = [
+            (None, None),
+            ("2026-01-02", None),
+            (None, "2026-01-02 23:59"),
+            (None, "2026-01-02"),
+            ("2026-01-01", "2026-01-03"),
+            ("2026-01-01 12:00", "2026-01-03 12:00"),
+            ("2026-01-03 08:00", "2026-01-03 09:00"),
+        ]
+        for start_date, end_date in ranges:
+            report = models.generate_sales_report(start_date, end_date)
+            expected = self.raw_sales(start_date, end_date)
+            self.assertEqual(len(report['sales']), len(expected), (start_date, end_date))
+            for row, raw in zip(report['sales'], expected):
+                self.assertEqual(row[:2], raw[:2])
+                self.assertAlmostEqual(row[2], raw[2])
+    
+    def test_transaction_report_totals(self):
+        """Test the IN/OUT totals of the transaction report"""
+        report = models.generate_transaction_report("2026-01-02", "2026-01-03 09:00")
+        self.assertEqual(report['total_in'], 10)
+        self.assertEqual(report['total_out'], 7)
+        
+        report = models.generate_transaction_report()
+        self.assertEqual((report['total_in'], report['total_out']), (10, 15))
+    
+    def test_whole_day_end_bound(self):
+        """Test that a date-only end includes later that day in the listing, count and totals"""
+        report = models.generate_transaction_report("2026-01-03", "2026-01-03")
+        self.assertEqual(report['total_transactions'], 2)
+        self.assertEqual(sorted(row[1] for row in report['transactions']),
+                         ["2026-01-03 08:30", "2026-01-03 20:00"])
+        self.assertEqual((report['total_in'], report['total_out']), (0, 9))
+        
+        streamed = models.generate_transaction_report("2026-01-03", "2026-01-03", stream=True)
+        self.assertEqual(streamed['total_transactions'], 2)
+        self.assertEqual(len(list(streamed['transactions'])), 2)
+        
+        sales = models.generate_sales_report("2026-01-03", "2026-01-03")['sales']
+        self.assertEqual([(name, sold) for name, sold, _ in sales], [("Chips", 4), ("Cola", 5)])
+    
+    def test_rebuild_after_direct_delete(self):
+        """Test that a rebuild takes rows deleted outside the posting API back out"""
+        with models.connection() as conn:
+            conn.execute("DELETE FROM transactions WHERE date = '2026-01-02'")
+        models.rebuild_daily_rollup()
+        report = models.generate_transaction_report("2026-01-02", "2026-01-02")
+        self.assertEqual((report['total_in'], report['total_out']), (0, 3))
+
+if __name__ == '__main__':
+    unittest.main()
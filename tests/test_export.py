@@ -0,0 +1,191 @@
+import unittest
+import csv
+import gzip
+import os
+import sqlite3
+import tempfile
+from database import models
+from database.connection import QueryStream
+from database.export_helpers import (export_to_csv, export_to_columnar, read_columnar, have_pyarrow,
+                                     REPORT_COLUMNS)
+import config
+
+
+class TestReportExport(unittest.TestCase):
+    """Test streaming CSV and columnar export of reports"""
+    
+    def setUp(self):
+        """Set up test database with a few items and movements"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+        models.add_category("Drinks")
+        models.add_items_bulk([("Cola", "Drinks", 5, 0.5), ("Chips", None, 20, 1.0)])
+        cola = next(item[0] for item in models.view_items() if item[1] == "Cola")
+        models.add_transactions_batch([(cola, "IN", 1, f"2026-01-{day:02d}", None, None) for day in range(1, 26)])
+        
+        self.export_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test database and exports"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+        for name in os.listdir(self.export_dir):
+            os.unlink(os.path.join(self.export_dir, name))
+        os.rmdir(self.export_dir)
+    
+    def read_rows(self, filename, opener=open):
+        """Read an exported CSV back as lists"""
+        with opener(os.path.join(self.export_dir, filename), 'rt', newline='', encoding='utf-8') as f:
+            return list(csv.reader(f))
+    
+    def test_inventory_export(self):
+        """Test that the streamed item listing is written with its category and unit"""
+        path = os.path.join(self.export_dir, "inventory.csv")
+        success, _ = export_to_csv(models.generate_inventory_report(), path)
+        
+        self.assertTrue(success)
+        rows = self.read_rows("inventory.csv")
+        items = rows[rows.index(['INVENTORY ITEMS']) + 2:rows.index(['SUMMARY STATISTICS']) - 1]
+        self.assertEqual([(row[1], row[2], row[4]) for row in items],
+                         [("Chips", "No Category", "1.0"), ("Cola", "Drinks", "0.5")])
+        self.assertIn(['Total Items:', '2'], rows)
+    
+    def test_inventory_export_after_upgrade(self):
+        """Test that columns appended by an upgrade are exported under the right headings"""
+        models.close_pool()
+        os.unlink(self.test_db.name)
+        conn = sqlite3.connect(self.test_db.name)
+        conn.execute('''
+            CREATE TABLE inventory (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                category TEXT,
+                quantity INTEGER NOT NULL,
+                price REAL NOT NULL
+            )
+        ''')
+        conn.commit()
+        conn.close()
+        models.migrate()
+        models.add_category("Tools")
+        models.add_items_bulk([("Hammer", "Tools", 3, 7.5)])
+
+        path = os.path.join(self.export_dir, "upgraded.csv")
+        success, message = export_to_csv(models.generate_inventory_report(), path)
+
+        self.assertTrue(success, message)
+        rows = self.read_rows("upgraded.csv")
+        items = rows[rows.index(['INVENTORY ITEMS']) + 2:rows.index(['SUMMARY STATISTICS']) - 1]
+        self.assertEqual([row[1:] for row in items], [["Hammer", "Tools", "3 ", "7.5"]])
+
+    def test_streamed_transactions_gzip(self):
+        """Test that a streamed transaction report exports to a .gz file"""
+        report = models.generate_transaction_report("2026-01-01", "2026-01-10", stream=True)
+        self.assertIsInstance(report['transactions'], QueryStream)
+        self.assertEqual(report['total_transactions'], 10)
+        
+        path = os.path.join(self.export_dir, "transactions.csv.gz")
+        success, _ = export_to_csv(report, path)
+        
+        self.assertTrue(success)
+        rows = self.read_rows("transactions.csv.gz", gzip.open)
+        transactions = rows[rows.index(['TRANSACTIONS']) + 2:rows.index(['SUMMARY STATISTICS']) - 1]
+        self.assertEqual([row[1] for row in transactions], [f"2026-01-{day:02d}" for day in range(10, 0, -1)])
+        self.assertIn(['Total Transactions:', '10'], rows)
+    
+    def test_progress_callback(self):
+        """Test that progress is reported in batches and once at the end"""
+        calls = []
+        original_size = config.DB_FETCH_SIZE
+        config.DB_FETCH_SIZE = 10
+        try:
+            report = models.generate_transaction_report(stream=True)
+            export_to_csv(report, os.path.join(self.export_dir, "t.csv"),
+                          progress=lambda done, total: calls.append((done, total)))
+        finally:
+            config.DB_FETCH_SIZE = original_size
+        
+        self.assertEqual(calls, [(10, 25), (20, 25), (25, 25)])
+    
+    def test_export_error_reported(self):
+        """Test that a failing export returns an error instead of raising"""
+        success, message = export_to_csv({'items': []}, os.path.join(self.export_dir, "missing", "x.csv"))
+        self.assertFalse(success)
+        self.assertIn("Error exporting", message)
+
+    
+    def test_columnar_ndjson_round_trip(self):
+        """Test that rows come back typed, by column, in row groups"""
+        path = os.path.join(self.export_dir, "transactions.ndjson.gz")
+        original_size = config.EXPORT_ROW_GROUP_SIZE
+        config.EXPORT_ROW_GROUP_SIZE = 10
+        try:
+            success, _ = export_to_columnar(models.generate_transaction_report(stream=True), path)
+        finally:
+            config.EXPORT_ROW_GROUP_SIZE = original_size
+        
+        self.assertTrue(success)
+        metadata, groups = read_columnar(path)
+        groups = list(groups)
+        self.assertEqual(metadata['total_transactions'], 25)
+        self.assertEqual(metadata['section'], 'transactions')
+        self.assertEqual([len(group['id']) for group in groups], [10, 10, 5])
+        self.assertEqual(groups[0]['date'][0], "2026-01-25")
+        self.assertEqual(groups[0]['quantity'][0], 1)
+        self.assertEqual(groups[0]['value'][0], 0.0)
+    
+    def test_columnar_inventory_and_sales(self):
+        """Test the inventory and sales column layouts"""
+        path = os.path.join(self.export_dir, "inventory.ndjson.gz")
+        export_to_columnar(models.generate_inventory_report(), path)
+        _, groups = read_columnar(path)
+        self.assertEqual(next(groups), {
+            'id': [2, 1], 'name': ["Chips", "Cola"], 'category': [None, "Drinks"],
+            'quantity': [20, 30], 'unit_symbol': [None, None], 'cost_price': [1.0, 0.5],
+        })
+        
+        path = os.path.join(self.export_dir, "sales.ndjson.gz")
+        success, _ = export_to_columnar(models.generate_sales_report(), path)
+        self.assertTrue(success)
+        self.assertEqual(list(read_columnar(path)[1]), [])
+    
+    def test_report_columns_match_queries(self):
+        """Test that the column names the exports look rows up by are what the queries select"""
+        queries = {
+            'items': models.reports._inventory_report_query(),
+            'transactions': models.reports._transaction_report_query(),
+            'sales': models.reports._sales_report_query(),
+        }
+        with models.connection() as conn:
+            for section, (query, params) in queries.items():
+                selected = tuple(column[0] for column in conn.execute(query, params).description)
+                self.assertEqual(selected, REPORT_COLUMNS[section], section)
+    
+    def test_columnar_rejects_other_reports(self):
+        """Test that reports without a row section are refused"""
+        success, _ = export_to_columnar(models.generate_supplier_report(),
+                                        os.path.join(self.export_dir, "suppliers.ndjson.gz"))
+        self.assertFalse(success)
+    
+    @unittest.skipUnless(have_pyarrow(), "pyarrow is not installed")
+    def test_columnar_parquet_round_trip(self):
+        """Test Parquet export when pyarrow is available"""
+        path = os.path.join(self.export_dir, "transactions.parquet")
+        success, _ = export_to_columnar(models.generate_transaction_report(stream=True), path)
+        
+        self.assertTrue(success)
+        metadata, groups = read_columnar(path)
+        self.assertEqual(metadata['total_transactions'], 25)
+        self.assertEqual(sum(len(group['id']) for group in groups), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import json
+import os
+import sqlite3
+import tempfile
+from database import models
+from database import instrumentation
+from database.connection import connection
+import config
+
+
+class TestQueryInstrumentation(unittest.TestCase):
+    """Test opt-in query timing, percentiles and the slow-query log"""
+
+    def setUp(self):
+        """Set up test database with timing enabled"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+
+        self.original_db = config.DB_NAME
+        self.original_instrument = config.DB_INSTRUMENT
+        self.original_slow_ms = config.DB_SLOW_QUERY_MS
+        config.DB_NAME = self.test_db.name
+        models.migrate()
+
+        config.DB_INSTRUMENT = True
+        models.reset_query_stats()
+        models.add_items_bulk((f"Item {n:03d}", None, n, 1.0) for n in range(50))
+
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        models.reset_query_stats()
+        config.DB_NAME = self.original_db
+        config.DB_INSTRUMENT = self.original_instrument
+        config.DB_SLOW_QUERY_MS = self.original_slow_ms
+
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+
+    def stats_for(self, caller):
+        return [stats for stats in models.query_stats() if stats['caller'] == caller]
+
+    def test_disabled_by_default(self):
+        """Test that connections are plain unless timing is switched on"""
+        config.DB_INSTRUMENT = False
+        models.reset_query_stats()
+        with connection() as conn:
+            self.assertIs(type(conn), sqlite3.Connection)
+        models.view_items()
+        self.assertEqual(models.query_stats(), [])
+
+    def test_pool_follows_setting(self):
+        """Test that toggling the setting swaps the connection class"""
+        with connection() as conn:
+            self.assertIsInstance(conn, instrumentation.InstrumentedConnection)
+        config.DB_INSTRUMENT = False
+        with connection() as conn:
+            self.assertNotIsInstance(conn, instrumentation.InstrumentedConnection)
+
+    def test_toggle_inside_block(self):
+        """Test that nested blocks keep the held connection when the setting changes"""
+        with connection() as outer:
+            config.DB_INSTRUMENT = False
+            with connection() as inner:
+                self.assertIs(inner, outer)
+                models.view_items()
+        with connection() as conn:
+            self.assertNotIsInstance(conn, instrumentation.InstrumentedConnection)
+
+    def test_blank_statement_not_explained(self):
+        """Test that empty or blank SQL is timed without a query plan"""
+        config.DB_SLOW_QUERY_MS = 0
+        with connection() as conn:
+            for sql in ("", "   ", "\n"):
+                conn.execute(sql)
+                self.assertIsNone(instrumentation._explain(conn, sql, ()))
+
+    def test_select_recorded_under_model_function(self):
+        """Test that a query is charged to its model function with its row count"""
+        models.view_items()
+        models.view_items()
+        stats = self.stats_for('database.models.inventory.view_items')
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]['count'], 2)
+        self.assertEqual(stats[0]['rows'], 100)
+        self.assertTrue(stats[0]['sql'].startswith("SELECT"))
+        self.assertLessEqual(stats[0]['p50'], stats[0]['p95'])
+        self.assertLessEqual(stats[0]['p95'], stats[0]['p99'])
+        self.assertLessEqual(stats[0]['p99'], stats[0]['max_ms'])
+
+    def test_write_rows_counted(self):
+        """Test that executemany records the rows it changed"""
+        inserts = [stats for stats in models.query_stats() if stats['sql'].startswith("INSERT INTO inventory")]
+        self.assertEqual(sum(stats['rows'] for stats in inserts), 50)
+
+    def test_iteration_recorded(self):
+        """Test that a cursor consumed by iteration is recorded when exhausted"""
+        with connection() as conn:
+            rows = list(conn.execute("SELECT id FROM inventory"))
+        self.assertEqual(len(rows), 50)
+        stats = [s for s in models.query_stats() if s['sql'] == "SELECT id FROM inventory"]
+        self.assertEqual(stats[0]['rows'], 50)
+
+    def test_group_by_caller(self):
+        """Test that statements can be summed per caller"""
+        models.view_items()
+        models.get_item_by_id(1)
+        callers = {stats['caller']: stats for stats in models.query_stats('caller')}
+        self.assertIn('database.models.inventory.view_items', callers)
+        self.assertIsNone(callers['database.models.inventory.view_items']['sql'])
+        with self.assertRaises(ValueError):
+            models.query_stats('table')
+
+    def test_percentiles(self):
+        """Test that histogram percentiles stay within one bucket"""
+        histogram = instrumentation.Histogram()
+        for ms in range(1, 101):
+            histogram.add(ms)
+        self.assertAlmostEqual(histogram.percentile(50), 50, delta=50 * 0.19)
+        self.assertAlmostEqual(histogram.percentile(99), 99, delta=99 * 0.19)
+        self.assertEqual(histogram.percentile(100), 100)
+
+        models.view_items()
+        overall = models.query_percentiles()
+        self.assertGreater(overall['count'], 0)
+        self.assertEqual(models.query_percentiles('no.such.caller')['count'], 0)
+
+    def test_slow_query_log_has_plan(self):
+        """Test that statements over the threshold are logged with their query plan"""
+        config.DB_SLOW_QUERY_MS = 0
+        models.reset_query_stats()
+        models.view_items()
+
+        entries = [e for e in models.slow_queries() if e['caller'] == 'database.models.inventory.view_items']
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['rows'], 50)
+        self.assertIn("idx_inventory_name", entries[0]['plan'])
+
+        path = self.test_db.name + '.jsonl'
+        try:
+            count = models.dump_slow_queries(path)
+            with open(path, encoding='utf-8') as f:
+                dumped = [json.loads(line) for line in f]
+        finally:
+            os.unlink(path)
+        self.assertEqual(count, len(dumped))
+        self.assertIn(entries[0], dumped)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import os
+import tempfile
+from database import models
+from database.connection import QueryStream
+import config
+
+
+class TestInventoryReport(unittest.TestCase):
+    """Test the SQL-aggregated inventory report"""
+    
+    def setUp(self):
+        """Set up test database with items in two categories"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+        models.add_category("Drinks")
+        models.add_items_bulk([
+            ("Cola", "Drinks", 4, 0.5),
+            ("Water", "Drinks", 20, 0.25),
+            ("Chips", None, 12, 1.0),
+            ("Gum", None, 0, 0.1),
+        ])
+    
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+    
+    def test_totals_by_category(self):
+        """Test that counts and cost values are aggregated per category"""
+        report = models.generate_inventory_report()
+        
+        self.assertEqual(report['categories'], [("Drinks", 2, 7.0), ("Uncategorized", 2, 12.0)])
+        self.assertEqual(report['total_items'], 4)
+        self.assertEqual(report['total_value'], 19.0)
+        self.assertEqual(report['summary'], {'total_items': 4, 'total_quantity': 36, 'total_value': 19.0})
+    
+    def test_low_stock(self):
+        """Test that items under the threshold are listed, emptiest first"""
+        report = models.generate_inventory_report()
+        self.assertEqual([(item[1], item[3]) for item in report['low_stock']], [("Gum", 0), ("Cola", 4)])
+        
+        config_threshold = config.LOW_STOCK_THRESHOLD
+        config.LOW_STOCK_THRESHOLD = 15
+        try:
+            report = models.generate_inventory_report()
+        finally:
+            config.LOW_STOCK_THRESHOLD = config_threshold
+        self.assertEqual(len(report['low_stock']), 3)
+    
+    def test_items_are_streamed(self):
+        """Test that the item listing is a lazy stream ordered by name"""
+        report = models.generate_inventory_report()
+        self.assertIsInstance(report['items'], QueryStream)
+        
+        models.add_item("Apples", None, 1, 0.3)
+        names = [item[1] for item in report['items']]
+        self.assertEqual(names, ["Apples", "Chips", "Cola", "Gum", "Water"])
+        self.assertEqual(len(list(report['items'])), 5)
+    
+    def test_empty_inventory(self):
+        """Test the report of an empty inventory"""
+        with models.connection() as conn:
+            conn.execute("DELETE FROM inventory")
+        
+        report = models.generate_inventory_report()
+        self.assertEqual((report['total_items'], report['total_value'], report['categories']), (0, 0, []))
+        self.assertEqual(list(report['items']), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+from database import models
+from database.models import migrations
+import config
+
+
+class TestMigrations(unittest.TestCase):
+    """Test the versioned schema migration engine"""
+    
+    def setUp(self):
+        """Set up an empty test database"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+    
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+    
+    def table_names(self):
+        """Return the names of all tables in the test database"""
+        with models.connection() as conn:
+            return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    
+    def test_cold_start_applies_all(self):
+        """Test that a new database gets every migration"""
+        applied = models.migrate()
+        self.assertEqual(applied, [version for version, _, _ in models.MIGRATIONS])
+        self.assertEqual(models.get_schema_version(), models.SCHEMA_VERSION)
+        for table in ('inventory', 'categories', 'suppliers', 'transactions', 'users', 'measurement_units'):
+            self.assertIn(table, self.table_names())
+    
+    def test_migrations_create_only_their_own_schema(self):
+        """Test that replaying an early migration does not create what later ones add"""
+        def apply(*versions):
+            with models.connection() as conn:
+                for version, _, migration in models.MIGRATIONS:
+                    if version in versions:
+                        migration(conn)
+                return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' "
+                                                       "AND name LIKE 'idx_%'")}
+        
+        apply(1)
+        self.assertEqual(self.table_names() - {'sqlite_sequence'},
+                         {'inventory', 'categories', 'suppliers', 'transactions', 'users', 'measurement_units'})
+        self.assertEqual(len(apply(3)), 5)
+        self.assertNotIn('idx_transactions_date', apply(3))
+        self.assertEqual(apply(5, 9), {name for name, _ in models.schema.INDEXES})
+    
+    def test_warm_start_is_noop(self):
+        """Test that a current database applies nothing"""
+        models.migrate()
+        self.assertEqual(models.migrate(), [])
+    
+    def test_legacy_database_upgraded(self):
+        """Test that a pre-migration database gains the missing columns"""
+        conn = sqlite3.connect(self.test_db.name)
+        conn.execute('''
+            CREATE TABLE inventory (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                category TEXT,
+                quantity INTEGER NOT NULL,
+                price REAL NOT NULL
+            )
+        ''')
+        conn.execute("INSERT INTO inventory (name, category, quantity, price) VALUES ('Old', 'Misc', 3, 1.5)")
+        conn.commit()
+        conn.close()
+        
+        models.migrate()
+        with models.connection() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(inventory)")}
+            count = conn.execute("SELECT COUNT(*) FROM inventory").fetchone()[0]
+        self.assertTrue({'category_id', 'cost_price', 'measurement_unit_id', 'updated_at'} <= columns)
+        self.assertEqual(count, 1)
+    
+    def test_free_ids_reused(self):
+        """Test that deleted ids are tracked and handed out first"""
+        models.migrate()
+        for name in ('A', 'B', 'C', 'D'):
+            models.add_category(name)
+        self.assertEqual(models.get_next_available_id('categories'), 5)
+        
+        models.delete_category(3)
+        models.delete_category(2)
+        self.assertEqual(models.get_next_available_id('categories'), 2)
+        
+        with models.connection() as conn:
+            conn.execute("INSERT INTO categories (id, name) VALUES (2, 'B2')")
+        self.assertEqual(models.get_next_available_id('categories'), 3)
+    
+    def test_existing_gaps_seeded(self):
+        """Test that gaps present before tracking starts are recorded"""
+        models.migrate()
+        with models.connection() as conn:
+            conn.execute("DROP TRIGGER trg_categories_free_id")
+            conn.executemany("INSERT INTO categories (id, name) VALUES (?, ?)",
+                             [(2, 'B'), (3, 'C'), (6, 'F')])
+        
+        models.create_free_ids_table()
+        self.assertEqual(models.get_next_available_id('categories'), 1)
+        with models.connection() as conn:
+            free = [row[0] for row in conn.execute(
+                "SELECT id FROM free_ids WHERE table_name = 'categories' ORDER BY id")]
+        self.assertEqual(free, [1, 4, 5])
+    
+    def test_failed_migration_rolls_back(self):
+        """Test that a failing migration leaves the database untouched"""
+        def broken(conn):
+            conn.execute("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("migration failed")
+        
+        original = migrations.MIGRATIONS
+        migrations.MIGRATIONS = original + [(original[-1][0] + 1, "Broken", broken)]
+        migrations.SCHEMA_VERSION = original[-1][0] + 1
+        try:
+            with self.assertRaises(RuntimeError):
+                models.migrate()
+        finally:
+            migrations.MIGRATIONS = original
+            migrations.SCHEMA_VERSION = original[-1][0]
+        
+        self.assertEqual(models.get_schema_version(), 0)
+        self.assertNotIn('half_done', self.table_names())
+        self.assertNotIn('inventory', self.table_names())
+
+
+if __name__ == '__main__':
+    unittest.main()
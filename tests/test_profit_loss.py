@@ -0,0 +1,123 @@
+import unittest
+import os
+import tempfile
+from database import models
+import config
+
+
+class TestProfitLoss(unittest.TestCase):
+    """Test the profit & loss report and its closed-period cache"""
+    
+    def setUp(self):
+        """Set up test database with a quarter of movements"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+        models.add_items_bulk([
+            ("Cola", "Drinks", 100, 0.5),
+            ("Water", "Drinks", 100, 0.2),
+            ("Chips", "Snacks", 100, 0.8),
+        ], create_categories=True)
+        self.ids = {item[1]: item[0] for item in models.view_items()}
+        cola, water, chips = self.ids["Cola"], self.ids["Water"], self.ids["Chips"]
+        
+        models.add_transactions_batch([
+            (cola, "OUT", 10, "2025-01-10", None, 1.5),
+            (chips, "OUT", 5, "2025-01-20", None, 2.0),
+            (water, "IN", 20, "2025-02-01", None, None),
+            (water, "OUT", 30, "2025-02-14", None, 1.0),
+            (cola, "OUT", 4, "2025-03-03", None, 1.5),
+            (chips, "OUT", 2, "2025-03-31", None, 2.5),
+        ])
+    
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+    
+    def raw_totals(self, start_date, end_date):
+        """Return (revenue, cost) straight from transactions"""
+        with models.connection() as conn:
+            return conn.execute('''
+                SELECT SUM(t.quantity * t.selling_price), SUM(t.quantity * i.cost_price)
+                FROM transactions t JOIN inventory i ON t.item_id = i.id
+                WHERE t.transaction_type = 'OUT' AND t.date >= ? AND t.date <= ?
+            ''', (start_date, end_date)).fetchone()
+    
+    def cached_months(self):
+        """Return the cached (period_start, period_end) pairs"""
+        with models.connection() as conn:
+            return conn.execute(
+                "SELECT period_start, period_end FROM profit_loss_summary ORDER BY period_start").fetchall()
+    
+    def test_totals(self):
+        """Test revenue, cost of goods, profit and unit counts"""
+        report = models.generate_profit_loss_report("2025-01-01", "2025-03-31")
+        revenue, cost = self.raw_totals("2025-01-01", "2025-03-31")
+        
+        self.assertAlmostEqual(report['total_revenue'], revenue)
+        self.assertAlmostEqual(report['total_cost'], cost)
+        self.assertAlmostEqual(report['gross_profit'], revenue - cost)
+        self.assertAlmostEqual(report['net_profit'], report['gross_profit'])
+        self.assertEqual(report['items_sold'], 51)
+        self.assertEqual(report['items_purchased'], 20)
+        self.assertEqual(report['cached_periods'], 3)
+    
+    def test_breakdown_and_top_items(self):
+        """Test the category breakdown and the most profitable items"""
+        report = models.generate_profit_loss_report("2025-01-01", "2025-03-31")
+        
+        breakdown = {row[0]: row[1:4] for row in report['category_breakdown']}
+        self.assertEqual(set(breakdown), {"Drinks", "Snacks"})
+        for revenue, cost, profit in breakdown.values():
+            self.assertAlmostEqual(profit, revenue - cost)
+        self.assertAlmostEqual(breakdown["Snacks"][0], 15.0)
+        
+        top = report['top_items']
+        self.assertEqual([row[0] for row in top], ["Water", "Cola", "Chips"])
+        self.assertEqual(top[0][1:3], ("Drinks", 30))
+        self.assertAlmostEqual(top[0][4], 24.0)
+    
+    def test_closed_months_are_cached_and_reused(self):
+        """Test that a second report reads closed months from the cache"""
+        first = models.generate_profit_loss_report("2025-01-01", "2025-12-31")
+        self.assertEqual(first['cached_periods'], 12)
+        self.assertEqual(len(self.cached_months()), 12)
+        
+        # The cache, not the rollup, now answers for January
+        with models.connection() as conn:
+            conn.execute("DELETE FROM daily_item_rollup WHERE day < '2025-02-01'")
+        second = models.generate_profit_loss_report("2025-01-01", "2025-12-31")
+        self.assertAlmostEqual(second['total_revenue'], first['total_revenue'])
+        self.assertEqual(second['top_items'], first['top_items'])
+    
+    def test_partial_months_use_rollup(self):
+        """Test ranges that start and end inside a month"""
+        report = models.generate_profit_loss_report("2025-01-15", "2025-03-10")
+        revenue, cost = self.raw_totals("2025-01-15", "2025-03-10")
+        
+        self.assertEqual(report['cached_periods'], 1)
+        self.assertEqual(self.cached_months(), [("2025-02-01", "2025-02-28")])
+        self.assertAlmostEqual(report['total_revenue'], revenue)
+        self.assertAlmostEqual(report['total_cost'], cost)
+    
+    def test_backdated_movement_invalidates_cache(self):
+        """Test that posting into a closed month drops it and later months"""
+        models.generate_profit_loss_report("2025-01-01", "2025-03-31")
+        models.add_transaction(self.ids["Cola"], "OUT", 1, "2025-02-20", None, 3.0)
+        
+        self.assertEqual(self.cached_months(), [("2025-01-01", "2025-01-31")])
+        report = models.generate_profit_loss_report("2025-01-01", "2025-03-31")
+        revenue, _ = self.raw_totals("2025-01-01", "2025-03-31")
+        self.assertAlmostEqual(report['total_revenue'], revenue)
+
+
+if __name__ == '__main__':
+    unittest.main()
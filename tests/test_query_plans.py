@@ -0,0 +1,84 @@
+import unittest
+import os
+import tempfile
+from database import models
+from database.models import reports
+import config
+
+
+class TestQueryPlans(unittest.TestCase):
+    """Test that hot queries are served by secondary indexes"""
+    
+    def setUp(self):
+        """Set up test database"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+    
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+    
+    def query_plan(self, query, params):
+        """Return the EXPLAIN QUERY PLAN details for a query"""
+        with models.connection() as conn:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        return [row[-1] for row in rows]
+    
+    def assertNoFullScan(self, plan, alias):
+        """Assert the table behind alias is never scanned without an index"""
+        for detail in plan:
+            if detail.startswith(f"SCAN {alias}") and "INDEX" not in detail:
+                self.fail(f"Full scan of {alias}: {plan}")
+    
+    def test_indexes_created(self):
+        """Test that migrations create the secondary indexes"""
+        with models.connection() as conn:
+            names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        
+        for index_name, _ in models.INDEXES:
+            self.assertIn(index_name, names)
+    
+    def test_transaction_report_uses_index(self):
+        """Test the date-filtered transaction report query plan"""
+        for start_date, end_date in [("2026-01-01", "2026-01-31"), ("2026-01-01", None), (None, "2026-01-31")]:
+            plan = self.query_plan(*reports._transaction_report_query(start_date, end_date))
+            self.assertNoFullScan(plan, "t")
+            self.assertTrue(any(d.startswith("SEARCH t USING") for d in plan), plan)
+    
+    def test_sales_report_reads_rollup(self):
+        """Test that whole-day sales ranges never touch the raw transactions"""
+        plan = self.query_plan(*reports._sales_report_query("2026-01-01", "2026-01-31"))
+        self.assertIn("SEARCH daily_item_rollup USING PRIMARY KEY (day>? AND day<?)", plan)
+        self.assertFalse(any(" t " in f" {d} " for d in plan), plan)
+    
+    def test_partial_days_use_index(self):
+        """Test that partial edge days are read from transactions by index"""
+        plan = self.query_plan(*reports._sales_report_query("2026-01-01 12:00", "2026-01-31 12:00"))
+        self.assertNoFullScan(plan, "t")
+        self.assertNoFullScan(plan, "daily_item_rollup")
+        self.assertTrue(any(d.startswith("SEARCH t USING INDEX idx_transactions_date") for d in plan), plan)
+    
+    def test_inventory_listing_sorted_by_index(self):
+        """Test that name-ordered inventory listings avoid a sort"""
+        plan = self.query_plan(*reports._inventory_report_query())
+        self.assertIn("SCAN i USING INDEX idx_inventory_name", plan)
+        self.assertFalse(any("TEMP B-TREE" in d for d in plan), plan)
+
+    
+    def test_low_stock_uses_quantity_index(self):
+        """Test that the low-stock listing is a range seek on quantity"""
+        plan = self.query_plan(*reports._low_stock_query())
+        self.assertIn("SEARCH i USING INDEX idx_inventory_quantity (quantity<?)", plan)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+from database import models
+import config
+
+
+class TestReportBatch(unittest.TestCase):
+    """Test concurrent batch report generation"""
+    
+    def setUp(self):
+        """Set up test database with stock and a sale"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+        models.add_items_bulk([("Cola", None, 10, 0.5)])
+        cola = models.view_items()[0][0]
+        models.add_transaction(cola, "OUT", 2, "2026-01-02", None, 1.5)
+        
+        self.output_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test database and exports"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        config.DB_READ_ONLY = False
+        
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db.name + suffix):
+                os.unlink(self.test_db.name + suffix)
+        shutil.rmtree(self.output_dir)
+    
+    def test_process_batch_writes_every_export(self):
+        """Test that every report is exported by the worker processes"""
+        batch = models.generate_reports_batch(output_dir=self.output_dir)
+        
+        self.assertEqual([result['report'] for result in batch['reports']], list(models.reports.BATCH_REPORTS))
+        self.assertTrue(all(result['success'] for result in batch['reports']), batch)
+        self.assertEqual(len(os.listdir(self.output_dir)), len(models.reports.BATCH_REPORTS))
+        self.assertGreater(batch['wall_seconds'], 0)
+        
+        sales = next(result for result in batch['reports'] if result['report'] == 'sales')
+        with open(sales['path'], encoding='utf-8') as f:
+            self.assertIn("Cola,2,$3.00", f.read())
+    
+    def test_thread_batch_columnar(self):
+        """Test the thread pool and columnar exports, with CSV for the rest"""
+        batch = models.generate_reports_batch(['transactions', 'suppliers'], output_dir=self.output_dir,
+                                              export_format='columnar', use_threads=True)
+        
+        paths = [result['path'] for result in batch['reports']]
+        self.assertTrue(paths[0].endswith(('.ndjson.gz', '.parquet')))
+        self.assertTrue(paths[1].endswith('.csv'))
+    
+    def test_unknown_report(self):
+        """Test that unknown report names are refused up front"""
+        with self.assertRaises(ValueError):
+            models.generate_reports_batch(['inventory', 'payroll'], output_dir=self.output_dir)
+    
+    def test_workers_are_read_only(self):
+        """Test that the worker setup opens read-only connections"""
+        models.reports._init_report_worker(config.DB_NAME)
+        with self.assertRaises(sqlite3.OperationalError):
+            with models.connection() as conn:
+                conn.execute("DELETE FROM inventory")
+        with models.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM inventory").fetchone()[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+import os
+import tempfile
+from database import models
+import config
+
+
+class TestSearch(unittest.TestCase):
+    """Test full-text search over items, suppliers and transactions"""
+
+    def setUp(self):
+        """Set up test database with items, a supplier and a few movements"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+
+        self.original_db = config.DB_NAME
+        self.original_window = config.SEARCH_RANK_WINDOW
+        config.DB_NAME = self.test_db.name
+
+        models.migrate()
+        models.add_category("Paint", "Paints and coatings")
+        models.add_category("Tools")
+        models.add_items_bulk([("Paint roller", "Tools", 10, 4.0), ("Roller tray", "Paint", 10, 2.0),
+                               ("Café crème", None, 10, 1.0)])
+        self.ids = {item[1]: item[0] for item in models.view_items()}
+        with models.connection() as conn:
+            conn.execute("INSERT INTO suppliers (name, contact, email, phone) VALUES (?, ?, ?, ?)",
+                         ("Acme Supplies", "Bob Stone", "bob@acmeco.example", "555-0100"))
+        models.add_transaction(self.ids["Paint roller"], "OUT", 1, "2026-01-02", "Damaged in transit")
+        models.add_transaction(self.ids["Roller tray"], "OUT", 1, "2026-01-03", "Customer return")
+
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        config.SEARCH_RANK_WINDOW = self.original_window
+
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+
+    def found(self, query, scope=None, limit=None):
+        """Return [(scope, id)] of the matches, best first"""
+        return [(name, row[0]) for name, row in models.search(query, scope, limit)]
+
+    def assertIndexIntact(self):
+        """Check every search table against the rows it covers"""
+        with models.connection() as conn:
+            for table, _, _, _ in models.schema.SEARCH_TABLES:
+                conn.execute(f"INSERT INTO {table} ({table}, rank) VALUES ('integrity-check', 1)")
+
+    def test_prefix_matching(self):
+        """Test that every word must start a word of the row, in any indexed column"""
+        self.assertEqual(self.found("acm"), [("suppliers", 1)])
+        self.assertEqual(self.found("bob ston"), [("suppliers", 1)])
+        self.assertEqual(self.found("dam tran"), [("transactions", 1)])
+        self.assertEqual(self.found("tray", 'items'), [("items", self.ids["Roller tray"])])
+        self.assertEqual(self.found("tools", 'items'), [("items", self.ids["Paint roller"])])
+        self.assertEqual(self.found("creme cafe"), [("items", self.ids["Café crème"])])
+        self.assertEqual(self.found("oller"), [])
+        self.assertEqual(self.found("roller damaged customer"), [])
+
+    def test_rows_and_ranking(self):
+        """Test that rows come shaped like the listings and name matches rank first"""
+        self.assertEqual(self.found("paint", 'items'),
+                         [("items", self.ids["Paint roller"]), ("items", self.ids["Roller tray"])])
+
+        (_, item), = models.search("tray", 'items')
+        self.assertEqual(item, models.view_item(self.ids["Roller tray"]))
+        (_, supplier), = models.search("acme", 'suppliers')
+        self.assertEqual(supplier, models.get_suppliers()[0])
+        (_, transaction), = models.search("customer", 'transactions')
+        self.assertEqual(transaction, models.get_transactions_window(0, 1)[0])
+
+        # The transaction of "Roller tray" matches by its item name
+        self.assertEqual(self.found("tray", 'transactions'), [("transactions", 2)])
+
+    def test_scope_and_limit(self):
+        """Test that scope picks the tables searched and limit caps the matches"""
+        self.assertEqual({name for name, _ in self.found("roller")}, {"items", "transactions"})
+        self.assertEqual(len(self.found("roller", ['items', 'transactions'])), 4)
+        self.assertEqual(len(self.found("roller", limit=3)), 3)
+        self.assertEqual(self.found("roller", limit=0), [])
+        self.assertEqual(self.found("roller", 'suppliers'), [])
+        with self.assertRaises(ValueError):
+            models.search("roller", 'users')
+
+    def test_query_text_is_never_fts_syntax(self):
+        """Test that quotes, operators and column filters are searched as words"""
+        for query in ['"', 'AND', 'roller OR', 'NEAR(roller', 'name:roller', '*', '-', '', None]:
+            models.search(query)
+        self.assertEqual(self.found('"paint" -roller*'), self.found("paint roller"))
+        self.assertEqual(self.found("   "), [])
+
+    def test_triggers_follow_edits(self):
+        """Test that inserts, updates, renames and deletes reach the search tables"""
+        models.update_supplier(1, email="orders@widgets.example")
+        self.assertEqual(self.found("widgets"), [("suppliers", 1)])
+        self.assertEqual(self.found("acmeco"), [])
+
+        models.update_category(models.get_categories()[0][0], name="Coatings")
+        self.assertEqual(self.found("coat", 'items'), [("items", self.ids["Roller tray"])])
+
+        with models.connection() as conn:
+            conn.execute("UPDATE inventory SET name = 'Paint brush' WHERE id = ?", (self.ids["Paint roller"],))
+        self.assertEqual(self.found("brush"), [("items", self.ids["Paint roller"]), ("transactions", 1)])
+
+        # The deleted item's transaction keeps its notes, and a new item may reuse the id
+        models.delete_item(self.ids["Paint roller"])
+        self.assertEqual(self.found("brush"), [])
+        self.assertEqual(self.found("damaged"), [("transactions", 1)])
+        with models.connection() as conn:
+            conn.execute("INSERT INTO inventory (id, name) VALUES (?, 'Sanding block')", (self.ids["Paint roller"],))
+        self.assertEqual(self.found("sanding", 'transactions'), [("transactions", 1)])
+
+        models.delete_category(models.get_categories()[0][0])
+        self.assertEqual(self.found("coat"), [])
+        with models.connection() as conn:
+            conn.execute("DELETE FROM transactions WHERE id = 2")
+        self.assertEqual(self.found("customer"), [])
+
+        self.assertIndexIntact()
+
+    def test_rebuild(self):
+        """Test that rebuild_search_index() indexes rows the triggers missed"""
+        with models.connection() as conn:
+            for table, _, _, _ in models.schema.SEARCH_TABLES:
+                conn.execute(f"INSERT INTO {table} ({table}) VALUES ('delete-all')")
+        self.assertEqual(self.found("roller"), [])
+
+        models.rebuild_search_index()
+        self.assertEqual(len(self.found("roller")), 4)
+        self.assertIndexIntact()
+
+    def test_rank_window(self):
+        """Test that with a limit only the newest SEARCH_RANK_WINDOW matches are ranked"""
+        item = self.ids["Café crème"]
+        models.add_transactions_batch([(item, "IN", 1, "2026-02-01", f"pallet {'long ' * n}note")
+                                       for n in range(6)])
+        # Shorter notes rank higher; the shortest are the oldest
+        self.assertEqual([row_id for _, row_id in self.found("pallet", 'transactions', limit=2)], [3, 4])
+
+        config.SEARCH_RANK_WINDOW = 3
+        self.assertEqual([row_id for _, row_id in self.found("pallet", 'transactions', limit=2)], [6, 7])
+        self.assertEqual(len(self.found("pallet", 'transactions')), 6)
+        self.assertEqual(len(self.found("pallet", 'transactions', limit=5)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import random
+from utils.search_index import SearchIndex, words
+
+
+def make_index(rows, **kwargs):
+    kwargs.setdefault('order', lambda row: (row[1], row[0]))
+    return SearchIndex(fields=lambda row: (row[1], row[2]), rows=rows, **kwargs)
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test the in-memory word-prefix index behind search-as-you-type"""
+
+    def setUp(self):
+        self.rows = [
+            (1, "Blue bolt M6", "Fasteners"),
+            (2, "Red bolt M8", "Fasteners"),
+            (3, "Blue paint", "Paints"),
+            (4, "Bolt cutter", "Tools"),
+            (5, "Washer", None),
+        ]
+        self.index = make_index(self.rows)
+
+    def ids(self, query, **kwargs):
+        rows, _ = self.index.search(query, **kwargs)
+        return [row[0] for row in rows]
+
+    def test_words(self):
+        """Test that texts split into distinct lower-case words and None is skipped"""
+        self.assertEqual(words("Blue bolt-M6", None, "BLUE"), {"blue", "bolt", "m6"})
+        self.assertEqual(words(), set())
+
+    def test_every_term_is_a_word_prefix(self):
+        """Test that a row matches when each term starts one of its words"""
+        self.assertEqual(self.ids("bolt"), [1, 4, 2])
+        self.assertEqual(self.ids("blu bol"), [1])
+        self.assertEqual(self.ids("BOLT fast"), [1, 2])
+        self.assertEqual(self.ids("paint"), [3])  # "Blue paint" and its category "Paints", one row
+        self.assertEqual(self.ids("olt"), [])
+        self.assertEqual(self.ids("bolt tools washer"), [])
+
+    def test_empty_query_and_exact_key(self):
+        """Test that an empty query lists every row and a key finds its row"""
+        self.assertEqual(self.ids(""), [1, 3, 4, 2, 5])
+        self.assertEqual(self.ids("  "), [1, 3, 4, 2, 5])
+        self.assertEqual(self.ids("5"), [5])
+        self.assertEqual(self.ids("99"), [])
+
+    def test_limit_and_more(self):
+        """Test that limit caps the rows and more says whether others match"""
+        self.assertEqual(self.index.search("bolt", limit=2), ([self.rows[0], self.rows[3]], True))
+        self.assertEqual(self.index.search("bolt", limit=3)[1], False)
+        self.assertEqual(self.index.search("", limit=0), ([], True))
+
+    def test_descending_order(self):
+        """Test that descending=True lists the largest order first"""
+        index = make_index(self.rows, order=lambda row: row[0], descending=True)
+        rows, _ = index.search("bolt")
+        self.assertEqual([row[0] for row in rows], [4, 2, 1])
+
+    def test_add_replace_and_remove(self):
+        """Test that edits keep the index current without a rebuild"""
+        self.index.add((6, "Bolt anchor", "Fasteners"))
+        self.assertEqual(self.ids("bolt anc"), [6])
+        self.assertEqual(len(self.index), 6)
+
+        self.index.add((2, "Red screw M8", "Fasteners"))
+        self.assertEqual(self.ids("bolt"), [1, 6, 4])
+        self.assertEqual(self.ids("scr"), [2])
+
+        self.assertTrue(self.index.remove(4))
+        self.assertFalse(self.index.remove(4))
+        self.assertNotIn(4, self.index)
+        self.assertEqual(self.ids("cutter"), [])
+        self.assertEqual(self.index.get(1), self.rows[0])
+
+    def test_many_inserts_between_the_same_rows(self):
+        """Test that rows added where the slots have run out still come back in order"""
+        for descending in (False, True):
+            index = make_index([(1, "Aaa", ""), (2, "Zzz", "")], descending=descending)
+            names = {1: "Aaa", 2: "Zzz"}
+            # Each name sorts just before the previous one, so all land in one gap
+            for n in range(3, 200):
+                names[n] = "M" + "m" * (200 - n)
+                index.add((n, names[n], "part"))
+            index.add((3, names[3], "part"))  # replacing keeps the order too
+
+            rows, _ = index.search("")
+            expected = sorted(names, key=lambda n: (names[n], n), reverse=descending)
+            self.assertEqual([row[0] for row in rows], expected)
+            rows, more = index.search("part", limit=10)
+            self.assertEqual([row[0] for row in rows], [n for n in expected if n > 2][:10])
+            self.assertTrue(more)
+
+    def test_matches_a_scan(self):
+        """Test that every search path agrees with checking each row, with and without a limit"""
+        generator = random.Random(7)
+        vocabulary = ["bolt", "bolts", "blue", "black", "red", "nut", "washer", "m6", "m8", "steel", "brass"]
+        rows = [(n, " ".join(generator.choice(vocabulary) for _ in range(3)), generator.choice(vocabulary))
+                for n in range(2000)]
+        index = make_index(rows)
+        ordered = sorted(rows, key=lambda row: (row[1], row[0]))
+
+        for query in ["b", "bl", "bolt", "m", "b m", "bo s", "red nut", "zinc", "s b r"]:
+            terms = words(query)
+            expected = [row for row in ordered
+                        if all(any(word.startswith(term) for word in words(row[1], row[2])) for term in terms)]
+            self.assertEqual(index.search(query)[0], expected, query)
+            self.assertEqual(index.search(query, limit=50), (expected[:50], len(expected) > 50), query)
+
+        for n in range(0, 2000, 3):
+            index.remove(n)
+        expected = [row for row in ordered if row[0] % 3 and "blue" in words(row[1], row[2])]
+        self.assertEqual(index.search("blue")[0], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
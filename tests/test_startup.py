@@ -0,0 +1,89 @@
+import unittest
+import builtins
+import io
+import os
+import subprocess
+import sys
+from contextlib import redirect_stderr
+import main
+
+original_import = builtins.__import__
+
+
+class TestStartup(unittest.TestCase):
+    """Test that application startup stays lazy and can be profiled"""
+    
+    def test_main_imports_nothing_heavy(self):
+        """Test that importing main loads neither tkinter, the UI nor the models"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = ("import sys, main; "
+                  "print(sorted(m for m in sys.modules if m.split('.')[0] in ('tkinter', 'ui', 'database', 'auth')))")
+        result = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+    
+    def test_tab_modules_load_on_demand(self):
+        """Test that the tabs package does not import every tab up front"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = ("import sys, ui.tabs; "
+                  "print(sorted(m for m in sys.modules if m.startswith('ui.tabs.')))")
+        result = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_export_helpers_load_on_export(self):
+        """Test that building the Reports tab does not import the export code"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = ("import sys, ui.tabs.reports_tab; "
+                  "print('database.export_helpers' in sys.modules)")
+        result = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_model_modules_load_on_demand(self):
+        """Test that the models package imports a module only when one of its names is used"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = ("import sys; from database import models; "
+                  "loaded = lambda: sorted(m for m in sys.modules if m.startswith('database.models.')); "
+                  "print(loaded()); models.get_categories; print(loaded()); "
+                  "models.migrate; print(callable(models.search), models.reports.__name__)")
+        result = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.splitlines(),
+                         ["[]", "['database.models.categories']", "True database.models.reports"])
+
+    def test_models_export_only_public_report_names(self):
+        """Test that the reports module's imports and helpers are not re-exported"""
+        from database import models
+        self.assertIs(models.print_batch_summary, models.reports.print_batch_summary)
+        for name in ('main', 'QueryStream', 'timedelta', '_post_to_rollup'):
+            self.assertFalse(hasattr(models, name), name)
+
+    def test_profile_report(self):
+        """Test that phases are printed only when profiling is enabled"""
+        for enabled in (False, True):
+            profile = main.StartupProfile(enabled)
+            with profile.phase("import something"):
+                pass
+            err = io.StringIO()
+            with redirect_stderr(err):
+                profile.report("login window ready")
+            self.assertEqual("import something" in err.getvalue(), enabled)
+            self.assertEqual("total since launch" in err.getvalue(), enabled)
+
+    def test_profile_times_imports(self):
+        """Test that imports loading new modules are listed under their phase"""
+        profile = main.StartupProfile(True)
+        profile.IMPORT_THRESHOLD_MS = 0
+        sys.modules.pop('colorsys', None)
+        with profile.phase("import something"):
+            import colorsys  # noqa: F401
+            import os.path  # noqa: F401  (already loaded, so not listed)
+        self.assertIs(builtins.__import__, original_import)
+        
+        (name, _, imports), = profile.phases
+        self.assertEqual([(depth, module) for depth, module, _ in imports], [(0, 'colorsys')])
+        err = io.StringIO()
+        with redirect_stderr(err):
+            profile.report("login window ready")
+        self.assertIn("    colorsys", err.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import multiprocessing
+import os
+import tempfile
+from database import models
+import config
+
+PROCESSES = 4
+POSTS_PER_PROCESS = 50
+OPENING_STOCK = 120
+
+
+def _post_movements(db_name, item_id, count):
+    """Worker: post count OUT movements of one unit, return successes"""
+    config.DB_NAME = db_name
+    successes = 0
+    for _ in range(count):
+        success, _, new_quantity = models.add_transaction(
+            item_id, config.TRANSACTION_TYPE_OUT, 1, "2026-01-01", "stress")
+        if success:
+            assert new_quantity >= 0
+            successes += 1
+    models.close_pool()
+    return successes
+
+
+class TestStockConcurrency(unittest.TestCase):
+    """Test that concurrent stock movements never oversell or lose updates"""
+    
+    def setUp(self):
+        """Set up test database with one item"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+        models.add_item("Hot SKU", None, OPENING_STOCK, 1.0)
+        self.item_id = models.get_items()[0][0]
+    
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+    
+    def test_add_transaction_returns_balance(self):
+        """Test the new balance and rejection messages"""
+        self.assertEqual(models.add_transaction(self.item_id, "IN", 5, "2026-01-01"),
+                         (True, "Transaction added successfully", OPENING_STOCK + 5))
+        self.assertEqual(models.add_transaction(self.item_id, "OUT", OPENING_STOCK + 6, "2026-01-01"),
+                         (False, "Insufficient inventory", None))
+        self.assertEqual(models.add_transaction(9999, "OUT", 1, "2026-01-01"),
+                         (False, "Item not found", None))
+
+    def test_add_transaction_validates_like_batch(self):
+        """Test that the single-row path rejects what add_transactions_batch() rejects"""
+        for movement, message in [((self.item_id, "IN", -3, "2026-01-01"), "Invalid quantity"),
+                                  ((self.item_id, "IN", 0, "2026-01-01"), "Invalid quantity"),
+                                  ((self.item_id, "BOGUS", 5, "2026-01-01"), "Invalid transaction type")]:
+            self.assertEqual(models.add_transaction(*movement), (False, message, None))
+            self.assertEqual(models.add_transactions_batch([movement]), [(False, message, None)])
+        self.assertEqual(models.get_item_by_id(self.item_id)[3], OPENING_STOCK)
+        self.assertEqual(models.count_transactions(), 0)
+
+    def test_concurrent_out_movements(self):
+        """Hammer one SKU from several processes"""
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(PROCESSES) as pool:
+            results = pool.starmap(
+                _post_movements,
+                [(self.test_db.name, self.item_id, POSTS_PER_PROCESS)] * PROCESSES,
+            )
+        
+        successes = sum(results)
+        with models.connection() as conn:
+            quantity = conn.execute("SELECT quantity FROM inventory WHERE id = ?", (self.item_id,)).fetchone()[0]
+            posted = conn.execute("SELECT COUNT(*) FROM transactions WHERE item_id = ?", (self.item_id,)).fetchone()[0]
+        
+        # Demand exceeds stock, so exactly the opening stock is sold
+        self.assertEqual(successes, OPENING_STOCK)
+        self.assertEqual(quantity, 0)
+        self.assertEqual(posted, successes)
+
+
+if __name__ == '__main__':
+    unittest.main()
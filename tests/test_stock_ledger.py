@@ -0,0 +1,156 @@
+import unittest
+import os
+import tempfile
+from database import models
+import config
+
+
+class TestStockLedger(unittest.TestCase):
+    """Test the materialized stock ledger"""
+    
+    def setUp(self):
+        """Set up test database with one item holding opening stock"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+        models.add_items_bulk([("Cola", None, 10, 0.5), ("Chips", None, 0, 0.8)])
+        self.ids = {item[1]: item[0] for item in models.view_items()}
+        self.cola = self.ids["Cola"]
+    
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+    
+    def balances(self, item_id):
+        """Return [(date, balance)] from the ledger, oldest first"""
+        return [(row[1], row[3]) for row in models.get_stock_ledger(item_id)]
+    
+    def test_running_balance(self):
+        """Test that each movement records the stock after it"""
+        models.add_transaction(self.cola, "IN", 5, "2026-01-02")
+        models.add_transaction(self.cola, "OUT", 8, "2026-01-03")
+        
+        self.assertEqual(self.balances(self.cola), [("2026-01-02", 15), ("2026-01-03", 7)])
+        self.assertEqual(models.check_stock_ledger(), [])
+    
+    def test_stock_as_of(self):
+        """Test stock lookups before, between and after movements"""
+        models.add_transaction(self.cola, "IN", 5, "2026-01-02")
+        models.add_transaction(self.cola, "OUT", 8, "2026-01-04")
+        
+        self.assertEqual(models.stock_as_of(self.cola, "2026-01-01"), 10)
+        self.assertEqual(models.stock_as_of(self.cola, "2026-01-02"), 15)
+        self.assertEqual(models.stock_as_of(self.cola, "2026-01-03"), 15)
+        self.assertEqual(models.stock_as_of(self.cola, "2026-12-31"), 7)
+        self.assertEqual(models.stock_as_of(self.ids["Chips"], "2026-01-01"), 0)
+        self.assertIsNone(models.stock_as_of(9999, "2026-01-01"))
+    
+    def test_backdated_movement_shifts_later_balances(self):
+        """Test that a movement dated before existing rows is slotted in"""
+        models.add_transaction(self.cola, "IN", 5, "2026-01-05")
+        models.add_transaction(self.cola, "OUT", 3, "2026-01-02")
+        
+        self.assertEqual(self.balances(self.cola), [("2026-01-02", 7), ("2026-01-05", 12)])
+        self.assertEqual(models.stock_as_of(self.cola, "2026-01-03"), 7)
+        self.assertEqual(models.check_stock_ledger(), [])
+    
+    def test_backdated_batch_rebuilds_item(self):
+        """Test that several back-dated movements in one batch are placed correctly"""
+        models.add_transaction(self.cola, "IN", 5, "2026-01-05")
+        models.add_transactions_batch([
+            (self.cola, "OUT", 2, "2026-01-04", None, 1.0),
+            (self.cola, "IN", 1, "2026-01-06", None, None),
+            (self.cola, "OUT", 3, "2026-01-01", None, 1.0),
+        ])
+
+        self.assertEqual(self.balances(self.cola),
+                         [("2026-01-01", 7), ("2026-01-04", 5), ("2026-01-05", 10), ("2026-01-06", 11)])
+        self.assertEqual(models.check_stock_ledger(), [])
+
+    def test_batch_posting(self):
+        """Test that batched movements land in the ledger in date order"""
+        chips = self.ids["Chips"]
+        models.add_transactions_batch([
+            (self.cola, "OUT", 2, "2026-01-03", None, 1.0),
+            (chips, "IN", 4, "2026-01-01", None, None),
+            (self.cola, "IN", 1, "2026-01-01", None, None),
+        ])
+        
+        self.assertEqual(self.balances(self.cola), [("2026-01-01", 11), ("2026-01-03", 9)])
+        self.assertEqual(self.balances(chips), [("2026-01-01", 4)])
+        self.assertEqual(models.check_stock_ledger(), [])
+    
+    def test_check_and_repair(self):
+        """Test that drift is detected and repaired in bulk"""
+        models.add_transaction(self.cola, "IN", 5, "2026-01-02")
+        models.update_item(self.cola, quantity=20)
+        with models.connection() as conn:
+            conn.execute("DELETE FROM stock_ledger")
+            conn.execute("INSERT INTO stock_ledger VALUES (999, ?, '2026-01-01', 1, 1)", (self.ids["Chips"],))
+        
+        self.assertEqual(models.check_stock_ledger(repair=True), sorted(self.ids.values()))
+        self.assertEqual(models.check_stock_ledger(), [])
+        # The edit to 20 is kept as an adjustment, not read as opening stock
+        self.assertEqual([balance for _, balance in self.balances(self.cola)], [15, 20])
+        self.assertEqual(self.balances(self.ids["Chips"]), [])
+    
+    def test_quantity_edits_are_adjustments(self):
+        """Test that setting an item's quantity posts the difference to the ledger"""
+        models.add_transaction(self.cola, "IN", 5, "2026-01-02")
+        models.update_item(self.cola, quantity=20)
+        models.add_transaction(self.cola, "IN", 1, "2099-01-01")
+        models.update_items_bulk([{'id': self.cola, 'quantity': 30}, {'id': self.ids["Chips"], 'quantity': 4}])
+        
+        self.assertEqual([(row[2], row[3]) for row in models.get_stock_ledger(self.cola)],
+                         [(5, 15), (5, 20), (9, 29), (1, 30)])
+        self.assertEqual(models.stock_as_of(self.cola, "2026-01-02"), 15)
+        self.assertEqual(models.stock_as_of(self.cola, models.get_stock_ledger(self.cola)[1][1][:10]), 29)
+        self.assertEqual(models.stock_as_of(self.ids["Chips"], "2026-01-01"), 0)
+        self.assertEqual(models.check_stock_ledger(), [])
+        
+        # A rebuild keeps the history instead of moving the edits to opening stock
+        ledger = models.get_stock_ledger(self.cola)
+        models.rebuild_stock_ledger()
+        self.assertEqual(models.get_stock_ledger(self.cola), ledger)
+    
+    def test_deleted_item_leaves_no_ledger(self):
+        """Test that deleting an item drops its ledger rows and adjustments"""
+        models.add_transaction(self.cola, "IN", 5, "2026-01-02")
+        models.update_item(self.cola, quantity=3)
+        models.delete_item(self.cola)
+        
+        self.assertEqual(models.get_stock_ledger(self.cola), [])
+        self.assertEqual(models.check_stock_ledger(), [])
+    
+    def test_migration_fills_ledger_from_history(self):
+        """Test that a full rebuild matches incremental posting"""
+        models.add_transaction(self.cola, "IN", 5, "2026-01-02")
+        models.add_transaction(self.cola, "OUT", 1, "2026-01-01")
+        posted = self.balances(self.cola)
+        
+        self.assertEqual(models.rebuild_stock_ledger(), 2)
+        self.assertEqual(self.balances(self.cola), posted)
+    
+    def test_stock_as_of_is_index_seek(self):
+        """Test that stock_as_of() seeks the ledger index"""
+        with models.connection() as conn:
+            plan = conn.execute('''
+                EXPLAIN QUERY PLAN SELECT balance FROM stock_ledger
+                WHERE item_id = ? AND date <= ?
+                ORDER BY date DESC, transaction_id DESC LIMIT 1
+            ''', (1, "2026-01-01")).fetchall()
+        details = " ".join(row[3] for row in plan)
+        self.assertIn("SEARCH stock_ledger USING INDEX idx_stock_ledger_item_date (item_id=? AND date<?)", details)
+        self.assertNotIn("TEMP B-TREE", details)
+
+
+if __name__ == '__main__':
+    unittest.main()
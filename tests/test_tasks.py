@@ -0,0 +1,144 @@
+import unittest
+import threading
+import time
+from ui.tasks import TaskRunner, TaskCancelled, current_task
+
+
+class FakeRoot:
+    """Stands in for the Tk root: after() callbacks run when the test pumps them"""
+
+    def __init__(self):
+        self.scheduled = []
+        self.errors = []
+
+    def after(self, ms, func):
+        self.scheduled.append(func)
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        self.errors.append(exc)
+
+    def pump(self, until, timeout=5.0):
+        """Run scheduled callbacks on this thread until until() is true"""
+        deadline = time.monotonic() + timeout
+        while not until():
+            if time.monotonic() > deadline:
+                raise AssertionError("timed out waiting for tasks")
+            scheduled, self.scheduled = self.scheduled, []
+            for func in scheduled:
+                func()
+            time.sleep(0.005)
+
+
+class TestTaskRunner(unittest.TestCase):
+    """Test the background task runner behind the tabs"""
+
+    def setUp(self):
+        self.root = FakeRoot()
+        self.busy = []
+        self.runner = TaskRunner(self.root, workers=2, poll_ms=1, on_busy=self.busy.append)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_results_come_back_on_the_main_thread(self):
+        """Test that work runs on a worker and on_done runs on the polling thread"""
+        results = []
+        self.runner.submit(lambda a, b: (a + b, threading.get_ident()), 2, 3,
+                           on_done=lambda result: results.append((result, threading.get_ident())))
+        self.root.pump(lambda: results)
+
+        (total, worker), caller = results[0]
+        self.assertEqual(total, 5)
+        self.assertNotEqual(worker, threading.get_ident())
+        self.assertEqual(caller, threading.get_ident())
+
+    def test_errors_go_to_on_error_or_the_root(self):
+        """Test that a failing task reports its exception on the main thread"""
+        errors = []
+        self.runner.submit(lambda: 1 / 0, on_error=errors.append)
+        self.runner.submit(lambda: {}['missing'])
+        self.root.pump(lambda: errors and self.root.errors)
+
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+        self.assertIsInstance(self.root.errors[0], KeyError)
+
+    def test_busy_labels_follow_outstanding_tasks(self):
+        """Test that on_busy sees the label while the task runs and an empty list after"""
+        release = threading.Event()
+        self.runner.submit(release.wait, label="Loading inventory")
+        self.assertEqual(self.busy[-1], ["Loading inventory"])
+
+        release.set()
+        self.root.pump(lambda: not self.runner.busy())
+        self.assertEqual(self.busy[-1], [])
+
+    def test_repeated_requests_are_coalesced(self):
+        """Test that requests for a busy key collapse into one follow-up, run after the first"""
+        release = threading.Event()
+        calls = []
+        done = []
+
+        def refresh(n):
+            calls.append(n)
+            if n == 0:
+                release.wait()
+            return n
+
+        for n in range(5):
+            self.runner.submit(refresh, n, key='inventory.refresh', on_done=done.append)
+        release.set()
+        self.root.pump(lambda: not self.runner.busy())
+
+        self.assertEqual(calls, [0, 4])
+        self.assertEqual(done, [0, 4])
+
+    def test_cancel_drops_results_and_stops_checked_work(self):
+        """Test that a cancelled task neither delivers a result nor keeps running past check()"""
+        started = threading.Event()
+        stopped = []
+        cancelled = []
+
+        def export():
+            started.set()
+            try:
+                while True:
+                    current_task().check()
+                    time.sleep(0.001)
+            except TaskCancelled:
+                stopped.append(True)
+                raise
+
+        done = []
+        self.runner.submit(export, key='reports.export', on_done=done.append, on_error=done.append,
+                           on_cancel=lambda: cancelled.append(True))
+        started.wait(5)
+        self.runner.cancel('reports.export')
+        self.root.pump(lambda: stopped and not self.runner._pending)
+
+        self.assertEqual(cancelled, [True])
+        self.assertEqual(done, [])
+        self.assertEqual(self.busy[-1], [])
+
+    def test_call_soon_runs_on_the_main_thread(self):
+        """Test that progress posted from a worker is delivered by the poll"""
+        progress = []
+
+        def work():
+            for n in range(3):
+                self.runner.call_soon(lambda n=n: progress.append((n, threading.get_ident())))
+            return "done"
+
+        done = []
+        self.runner.submit(work, on_done=done.append)
+        self.root.pump(lambda: done)
+
+        self.assertEqual([n for n, _ in progress], [0, 1, 2])
+        self.assertEqual({ident for _, ident in progress}, {threading.get_ident()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import json
+import os
+import tempfile
+import threading
+from utils import telemetry
+
+
+class TestTelemetry(unittest.TestCase):
+    """Test the buffered structured telemetry log"""
+
+    def setUp(self):
+        """Set up a throwaway telemetry log"""
+        handle = tempfile.NamedTemporaryFile(delete=False, suffix='.log')
+        handle.close()
+        os.unlink(handle.name)
+        self.path = handle.name
+
+    def tearDown(self):
+        """Restore the configured telemetry settings"""
+        telemetry.configure()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def read_events(self):
+        """Read the records written so far"""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding='utf-8') as log:
+            return [json.loads(line) for line in log]
+
+    def test_disabled_writes_nothing(self):
+        """Test that no file is created and no thread runs while disabled"""
+        telemetry.configure(enabled=False, path=self.path)
+        telemetry.event("test.disabled", telemetry.ERROR)
+        telemetry.flush()
+        self.assertFalse(telemetry.enabled_for(telemetry.ERROR))
+        self.assertFalse(any(t.name == "telemetry-writer" for t in threading.enumerate()))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_events_written_as_json_lines(self):
+        """Test that flushed events carry their name, level and fields"""
+        telemetry.configure(enabled=True, level='DEBUG', path=self.path)
+        telemetry.event("test.first", telemetry.DEBUG, rows=3)
+        telemetry.event("test.second", note="ok")
+        telemetry.flush()
+
+        events = self.read_events()
+        self.assertEqual([e['event'] for e in events], ["test.first", "test.second"])
+        self.assertEqual(events[0]['level'], "DEBUG")
+        self.assertEqual(events[0]['rows'], 3)
+        self.assertEqual(events[1]['level'], "INFO")
+        self.assertEqual(events[1]['note'], "ok")
+        self.assertIn('ts', events[0])
+        self.assertIn('thread', events[0])
+
+    def test_level_filter(self):
+        """Test that events below the configured level are not recorded"""
+        telemetry.configure(enabled=True, level='WARNING', path=self.path)
+        self.assertFalse(telemetry.enabled_for(telemetry.INFO))
+        telemetry.event("test.info", telemetry.INFO)
+        telemetry.event("test.warning", telemetry.WARNING)
+        telemetry.flush()
+        self.assertEqual([e['event'] for e in self.read_events()], ["test.warning"])
+
+    def test_sampling_keeps_warnings(self):
+        """Test that sampling drops routine events but never warnings"""
+        telemetry.configure(enabled=True, level='DEBUG', sample_rate=0.0, path=self.path)
+        before = telemetry.stats()['sampled_out']
+        telemetry.event("test.sampled", telemetry.INFO)
+        telemetry.event("test.kept", telemetry.WARNING)
+        telemetry.flush()
+        self.assertEqual([e['event'] for e in self.read_events()], ["test.kept"])
+        self.assertEqual(telemetry.stats()['sampled_out'], before + 1)
+
+    def test_full_queue_drops(self):
+        """Test that a full queue drops and counts events instead of blocking"""
+        telemetry.configure(enabled=True, level='DEBUG', path=self.path, queue_size=5, flush_interval=60)
+        before = telemetry.stats()['dropped']
+        for n in range(20):
+            telemetry.event("test.burst", telemetry.DEBUG, n=n)
+        telemetry.flush()
+        written = len(self.read_events())
+        dropped = telemetry.stats()['dropped'] - before
+        self.assertEqual(written, 5)
+        self.assertEqual(written + dropped, 20)
+        self.assertGreater(dropped, 0)
+
+    def test_shutdown_writes_queued_events(self):
+        """Test that shutdown() writes out events still in the queue"""
+        telemetry.configure(enabled=True, path=self.path, flush_interval=60)
+        telemetry.event("test.pending")
+        telemetry.shutdown()
+        self.assertEqual([e['event'] for e in self.read_events()], ["test.pending"])
+        telemetry.event("test.after_shutdown", telemetry.ERROR)
+        self.assertEqual(len(self.read_events()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
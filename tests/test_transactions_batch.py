@@ -0,0 +1,86 @@
+import unittest
+import os
+import tempfile
+from database import models
+import config
+
+
+class TestTransactionsBatch(unittest.TestCase):
+    """Test batched stock movement posting"""
+    
+    def setUp(self):
+        """Set up test database with two items"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+        models.add_items_bulk([("Cola", None, 10, 0.5), ("Chips", None, 3, 0.8)])
+        self.ids = {item[1]: item[0] for item in models.view_items()}
+    
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+    
+    def stock(self):
+        """Return {name: quantity}"""
+        return {item[1]: item[3] for item in models.view_items()}
+    
+    def transaction_count(self):
+        """Return the number of posted transactions"""
+        with models.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+    
+    def test_batch_aggregates_per_item(self):
+        """Test that lines are applied in order with running balances"""
+        cola, chips = self.ids["Cola"], self.ids["Chips"]
+        results = models.add_transactions_batch([
+            (cola, "OUT", 4, "2026-01-01", None, 1.0),
+            {'item_id': chips, 'transaction_type': "IN", 'quantity': 2, 'date': "2026-01-01"},
+            (cola, "OUT", 6, "2026-01-01"),
+            (chips, "OUT", 5, "2026-01-01"),
+        ])
+        self.assertEqual([r[2] for r in results], [6, 5, 0, 0])
+        self.assertTrue(all(r[0] for r in results))
+        self.assertEqual(self.stock(), {"Cola": 0, "Chips": 0})
+        self.assertEqual(self.transaction_count(), 4)
+    
+    def test_all_or_nothing_rejects_batch(self):
+        """Test that one bad line rejects every line"""
+        results = models.add_transactions_batch([
+            (self.ids["Cola"], "OUT", 4, "2026-01-01"),
+            (self.ids["Chips"], "OUT", 4, "2026-01-01"),
+            (9999, "IN", 1, "2026-01-01"),
+        ])
+        self.assertEqual(results, [
+            (False, "Batch rejected", None),
+            (False, "Insufficient inventory", None),
+            (False, "Item not found", None),
+        ])
+        self.assertEqual(self.stock(), {"Cola": 10, "Chips": 3})
+        self.assertEqual(self.transaction_count(), 0)
+    
+    def test_best_effort_posts_valid_lines(self):
+        """Test that best-effort mode posts what it can"""
+        results = models.add_transactions_batch([
+            (self.ids["Cola"], "OUT", 4, "2026-01-01"),
+            (self.ids["Chips"], "OUT", 4, "2026-01-01"),
+            (self.ids["Chips"], "OUT", 0, "2026-01-01"),
+        ], all_or_nothing=False)
+        self.assertEqual(results, [
+            (True, "Transaction added successfully", 6),
+            (False, "Insufficient inventory", None),
+            (False, "Invalid quantity", None),
+        ])
+        self.assertEqual(self.stock(), {"Cola": 6, "Chips": 3})
+        self.assertEqual(self.transaction_count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
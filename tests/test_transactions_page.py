@@ -0,0 +1,101 @@
+import unittest
+import os
+import tempfile
+from database import models
+import config
+
+
+class TestTransactionsPage(unittest.TestCase):
+    """Test keyset-paginated transaction history"""
+    
+    def setUp(self):
+        """Set up test database with movements spread over a few dates"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        
+        models.migrate()
+        models.add_items_bulk([("Cola", None, 1000, 0.5), ("Chips", None, 1000, 0.8)])
+        self.ids = {item[1]: item[0] for item in models.view_items()}
+        
+        # Many movements share a date so pages must split inside one day
+        movements = []
+        for n in range(25):
+            item_id = self.ids["Cola"] if n % 2 else self.ids["Chips"]
+            trans_type = "IN" if n % 3 else "OUT"
+            movements.append((item_id, trans_type, 1, f"2026-01-0{1 + n % 3}", f"line {n}", None))
+        models.add_transactions_batch(movements)
+    
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+        
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+    
+    def all_pages(self, limit, filters=None):
+        """Follow cursors until the last page and return every row"""
+        rows, cursor = models.get_transactions_page(limit=limit, filters=filters)
+        while cursor:
+            self.assertEqual(len(rows) % limit, 0)
+            page, cursor = models.get_transactions_page(after=cursor, limit=limit, filters=filters)
+            rows += page
+        return rows
+    
+    def expected(self, where="", params=()):
+        """Return the ids of matching transactions, newest first"""
+        with models.connection() as conn:
+            return [row[0] for row in conn.execute(
+                f"SELECT id FROM transactions t {where} ORDER BY date DESC, id DESC", params)]
+    
+    def test_pages_cover_history_in_order(self):
+        """Test that pages neither skip nor repeat rows within a date"""
+        rows = self.all_pages(limit=4)
+        self.assertEqual([row[0] for row in rows], self.expected())
+    
+    def test_last_page_has_no_cursor(self):
+        """Test that a page holding the remaining rows ends the history"""
+        rows, cursor = models.get_transactions_page(limit=25)
+        self.assertEqual(len(rows), 25)
+        self.assertIsNone(cursor)
+        
+        rows, cursor = models.get_transactions_page(limit=24)
+        self.assertEqual(cursor, (rows[-1][4], rows[-1][0]))
+    
+    def test_filters(self):
+        """Test paging by item, type and date range"""
+        cola = self.ids["Cola"]
+        rows = self.all_pages(limit=3, filters={'item_id': cola})
+        self.assertEqual([row[0] for row in rows], self.expected("WHERE item_id = ?", (cola,)))
+        
+        rows = self.all_pages(limit=3, filters={'transaction_type': 'OUT', 'start_date': '2026-01-02'})
+        self.assertEqual([row[0] for row in rows],
+                         self.expected("WHERE transaction_type = 'OUT' AND date >= '2026-01-02'"))
+        
+        rows = self.all_pages(limit=3, filters={'end_date': '2026-01-01'})
+        self.assertEqual([row[0] for row in rows], self.expected("WHERE date <= '2026-01-01'"))
+    
+    def test_rows_include_item_name(self):
+        """Test that rows keep the get_transactions() shape"""
+        rows, _ = models.get_transactions_page(limit=1)
+        self.assertIn(rows[0][-1], ("Cola", "Chips"))
+        self.assertEqual(models.get_transactions()[0], rows[0])
+    
+    def test_cursor_pages_seek_the_date_index(self):
+        """Test that both halves of a cursor page are index range seeks"""
+        with models.connection() as conn:
+            for condition in ("date = ? AND id < ?", "date < ?"):
+                plan = conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT * FROM transactions WHERE {condition} "
+                    "ORDER BY date DESC, id DESC LIMIT 10", ("2026-01-02", 5)[:condition.count("?")]
+                ).fetchall()
+                details = " ".join(row[3] for row in plan)
+                self.assertIn("SEARCH transactions USING INDEX idx_transactions_date", details)
+                self.assertNotIn("TEMP B-TREE", details)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,287 @@
+import unittest
+import os
+import random
+import tempfile
+from database import models
+from ui.virtual_tree import ListSource, QuerySource, KeysetSource, Viewport, TreeReconciler
+import config
+
+
+class TestVirtualTable(unittest.TestCase):
+    """Test the windowed model queries and row sources behind the virtual tables"""
+
+    def setUp(self):
+        """Set up test database with a few hundred items and movements"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+
+        self.original_db = config.DB_NAME
+        config.DB_NAME = self.test_db.name
+        models.migrate()
+
+        # Duplicate names check that windows break ties by id
+        models.add_items_bulk((f"Item {n % 150:03d}", None, 100, 1.0) for n in range(300))
+        models.add_transactions_batch(
+            (1 + n % 300, config.TRANSACTION_TYPE_OUT, 1, f"2024-01-{1 + n % 28:02d}", f"note {n}", 2.0)
+            for n in range(500)
+        )
+
+    def tearDown(self):
+        """Clean up test database"""
+        models.close_pool()
+        config.DB_NAME = self.original_db
+
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+
+    def test_items_window_matches_full_listing(self):
+        """Test that consecutive item windows add up to the full listing"""
+        self.assertEqual(models.count_items(), 300)
+        windows = []
+        for offset in range(0, 300, 64):
+            windows.extend(models.view_items_window(offset, 64))
+        full = sorted(models.view_items(), key=lambda item: (item[1], item[0]))
+        self.assertEqual(windows, full)
+        self.assertEqual(models.view_items_window(300, 64), [])
+
+    def test_transactions_window_matches_pages(self):
+        """Test that transaction windows return the same rows as keyset pages"""
+        self.assertEqual(models.count_transactions(), 500)
+        pages = []
+        after = None
+        while True:
+            page, after = models.get_transactions_page(after=after, limit=70)
+            pages.extend(page)
+            if after is None:
+                break
+        self.assertEqual(models.get_transactions_window(0, 500), pages)
+        self.assertEqual(models.get_transactions_window(123, 10), pages[123:133])
+
+        filters = {'start_date': '2024-01-10', 'end_date': '2024-01-12'}
+        filtered, _ = models.get_transactions_page(limit=500, filters=filters)
+        self.assertEqual(models.count_transactions(filters), len(filtered))
+        self.assertEqual(models.get_transactions_window(5, 20, filters), filtered[5:25])
+
+    def test_query_source_reads_blocks(self):
+        """Test that a query source serves windows across block edges from a small cache"""
+        calls = []
+
+        def fetch(offset, limit):
+            calls.append(offset)
+            return models.view_items_window(offset, limit)
+
+        source = QuerySource(models.count_items, fetch, format=lambda item: (item[0], item[1]), block_size=50)
+        self.assertEqual(len(source), 300)
+
+        rows = source.rows(40, 20)
+        self.assertEqual(rows, [(item[0], item[1]) for item in models.view_items_window(40, 20)])
+        self.assertEqual(calls, [0, 50])
+
+        source.rows(45, 10)
+        self.assertEqual(calls, [0, 50])
+        self.assertEqual(len(source.rows(290, 20)), 10)
+
+        models.add_item("Item 999", None, 1, 1.0)
+        self.assertEqual(len(source), 300)
+        source.refresh()
+        self.assertEqual(len(source), 301)
+
+    def test_query_source_loads_off_the_main_thread(self):
+        """Test that load() reads a window's blocks without touching the cache until install()"""
+        calls = []
+
+        def fetch(offset, limit):
+            calls.append(offset)
+            return models.view_items_window(offset, limit)
+
+        source = QuerySource(models.count_items, fetch, block_size=50)
+        source.rows(0, 10)
+        loaded = source.load(290, 20)  # clamped to the last 20 rows
+        self.assertEqual(calls, [0, 250])
+        self.assertEqual(list(source._blocks), [0])
+
+        source.install(loaded)
+        self.assertEqual(source.rows(280, 20), models.view_items_window(280, 20))
+        self.assertEqual(calls, [0, 250])
+
+        empty = QuerySource(lambda: 0, fetch)
+        self.assertEqual(empty.load(0, 20), (0, {}))
+
+    def test_keyset_source_follows_cursors(self):
+        """Test that a keyset source pages from cached block cursors and locates far jumps once"""
+        pages, located = [], []
+
+        def page(after, limit):
+            pages.append(after)
+            return models.get_transactions_page(after, limit)
+
+        def locate(offset):
+            located.append(offset)
+            return models.get_transactions_cursor(offset)
+
+        source = KeysetSource(models.count_transactions, page, locate, block_size=50)
+        self.assertEqual(len(source), 500)
+        self.assertEqual(source.rows(40, 20), models.get_transactions_window(40, 20))
+        self.assertEqual(source.rows(140, 20), models.get_transactions_window(140, 20))
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(located, [])
+
+        # Far past every known cursor: one positional lookup, then cursors again
+        self.assertEqual(source.rows(450, 60), models.get_transactions_window(450, 50))
+        self.assertEqual(located, [450])
+        self.assertEqual(source.rows(390, 20), models.get_transactions_window(390, 20))
+        self.assertEqual(located, [450])
+
+        loaded = KeysetSource(models.count_transactions, page, locate, block_size=50).load(230, 40)
+        self.assertEqual(loaded[0], 500)
+        self.assertEqual(loaded[1][4] + loaded[1][5], models.get_transactions_window(200, 100))
+        self.assertEqual(models.get_transactions_cursor(0), None)
+        self.assertEqual(models.get_transactions_cursor(501), None)
+
+    def test_viewport_scrolling(self):
+        """Test that the viewport stays in range and reports scrollbar fractions"""
+        viewport = Viewport(ListSource(range(1000)), 20, key=lambda row: row)
+        self.assertEqual(viewport.rows(), list(range(20)))
+        self.assertEqual(viewport.fractions(), (0.0, 0.02))
+
+        viewport.scroll_to(0.5)
+        self.assertEqual(viewport.rows()[0], 500)
+        viewport.scroll(10000)
+        self.assertEqual(viewport.rows(), list(range(980, 1000)))
+        self.assertEqual(viewport.fractions()[1], 1.0)
+        viewport.scroll(-10000)
+        self.assertEqual(viewport.first, 0)
+
+        viewport.source = ListSource(range(5))
+        viewport.clamp()
+        self.assertEqual(viewport.rows(), list(range(5)))
+        self.assertEqual(Viewport(ListSource(), 20).fractions(), (0.0, 1.0))
+
+
+class RecordingTree:
+    """Top-level Treeview item calls, applied to a list and counted"""
+
+    def __init__(self):
+        self.children = []
+        self.values = {}
+        self.calls = 0
+
+    def insert(self, parent, index, iid, values):
+        self.calls += 1
+        self.children.insert(index, iid)
+        self.values[iid] = values
+
+    def delete(self, *iids):
+        self.calls += 1
+        for iid in iids:
+            self.children.remove(iid)
+            del self.values[iid]
+
+    def move(self, iid, parent, index):
+        self.calls += 1
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def item(self, iid, values):
+        self.calls += 1
+        self.values[iid] = values
+
+    def rows(self):
+        return [self.values[iid] for iid in self.children]
+
+
+class TestTreeReconciler(unittest.TestCase):
+    """Test that keyed reconciliation shows the new rows with few item calls"""
+
+    def setUp(self):
+        self.tree = RecordingTree()
+        self.reconciler = TreeReconciler(self.tree)
+        self.rows = [(n, f"Item {n}", n * 10) for n in range(1000)]
+        self.reconciler.reconcile(self.rows)
+        self.tree.calls = 0
+
+    def reconcile(self, rows):
+        changes = self.reconciler.reconcile(rows)
+        self.assertEqual(self.tree.rows(), [tuple(row) for row in rows])
+        return changes
+
+    def test_unchanged_rows_cost_nothing(self):
+        """Test that reconciling the same rows makes no calls"""
+        self.reconcile(self.rows)
+        self.assertEqual(self.tree.calls, 0)
+
+    def test_single_edits(self):
+        """Test that one update, insert or delete is one call"""
+        rows = list(self.rows)
+        rows[500] = (500, "Renamed", 1)
+        self.assertEqual(self.reconcile(rows)['updated'], 1)
+        self.assertEqual(self.tree.calls, 1)
+
+        rows.insert(250, (5000, "New", 0))
+        self.assertEqual(self.reconcile(rows)['inserted'], 1)
+        self.assertEqual(self.tree.calls, 2)
+
+        del rows[10]
+        self.assertEqual(self.reconcile(rows)['deleted'], 1)
+        self.assertEqual(self.tree.calls, 3)
+
+    def test_moves_are_minimal(self):
+        """Test that only rows out of order are moved"""
+        rows = self.rows[1:] + self.rows[:1]
+        self.assertEqual(self.reconcile(rows)['moved'], 1)
+
+        rows = rows[-1:] + rows[:-1]
+        self.assertEqual(self.reconcile(rows)['moved'], 1)
+
+        # A renamed item sorting elsewhere: one move plus one update
+        rows = list(self.rows)
+        renamed = (3, "Item 7a", 30)
+        rows.remove(self.rows[3])
+        rows.insert(7, renamed)
+        changes = self.reconcile(rows)
+        self.assertEqual((changes['moved'], changes['updated']), (1, 1))
+
+    def test_scrolled_window(self):
+        """Test that scrolling a window by one row is one delete and one insert"""
+        tree = RecordingTree()
+        reconciler = TreeReconciler(tree)
+        reconciler.reconcile(self.rows[0:30])
+        tree.calls = 0
+        changes = reconciler.reconcile(self.rows[1:31])
+        self.assertEqual(tree.rows(), self.rows[1:31])
+        self.assertEqual((changes['deleted'], changes['inserted'], changes['moved']), (1, 1, 0))
+        self.assertEqual(tree.calls, 2)
+
+    def test_random_changes(self):
+        """Test that any mix of edits ends with the rows in order"""
+        generator = random.Random(42)
+        rows = list(self.rows)
+        for _ in range(50):
+            if generator.random() < 0.2:
+                generator.shuffle(rows)
+            for _ in range(generator.randint(0, 20)):
+                n = generator.randrange(len(rows))
+                action = generator.choice(('move', 'delete', 'insert', 'update'))
+                if action == 'move':
+                    rows.insert(generator.randrange(len(rows)), rows.pop(n))
+                elif action == 'delete' and len(rows) > 1:
+                    del rows[n]
+                elif action == 'insert':
+                    key = generator.randrange(10 ** 6)
+                    if all(row[0] != key for row in rows):
+                        rows.insert(n, (key, "New", 0))
+                else:
+                    rows[n] = (rows[n][0], rows[n][1], generator.random())
+            self.reconcile(rows)
+
+    def test_repeated_keys(self):
+        """Test that rows sharing a key are still shown separately"""
+        rows = [("12:00:01", "slow"), ("12:00:01", "slow"), ("12:00:02", "slow")]
+        tree = RecordingTree()
+        TreeReconciler(tree, key=tuple).reconcile(rows)
+        self.assertEqual(tree.rows(), rows)
+        self.assertEqual(len(set(tree.children)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,19 @@
-"""UI tabs package - modular tab implementations"""
-from ui.tabs.inventory_tab import InventoryTab
-from ui.tabs.categories_tab import CategoriesTab
-from ui.tabs.suppliers_tab import SuppliersTab
-from ui.tabs.transactions_tab import TransactionsTab
-from ui.tabs.users_tab import UsersTab
-from ui.tabs.reports_tab import ReportsTab
+"""UI tabs package - modular tab implementations.
+
+Tab classes are imported on first access, so importing one tab does not
+load the others.
+"""
+import importlib
+
+_TAB_MODULES = {
+    'InventoryTab': 'ui.tabs.inventory_tab',
+    'CategoriesTab': 'ui.tabs.categories_tab',
+    'SuppliersTab': 'ui.tabs.suppliers_tab',
+    'TransactionsTab': 'ui.tabs.transactions_tab',
+    'UsersTab': 'ui.tabs.users_tab',
+    'ReportsTab': 'ui.tabs.reports_tab',
+    'DiagnosticsTab': 'ui.tabs.diagnostics_tab',
+}
 
 __all__ = [
     'InventoryTab',
@@ -12,5 +21,12 @@ __all__ = [
     'SuppliersTab',
     'TransactionsTab',
     'UsersTab',
-    'ReportsTab'
+    'ReportsTab',
+    'DiagnosticsTab'
 ]
+
+
+def __getattr__(name):
+    if name in _TAB_MODULES:
+        return getattr(importlib.import_module(_TAB_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
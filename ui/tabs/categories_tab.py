@@ -4,15 +4,20 @@ from tkinter import ttk, messagebox
 import config
 from database import models
 from ui.theme import SearchBar, Tooltip, ValidationFrame, StatusBadge
+from ui.virtual_tree import VirtualTreeview, ListSource
+from utils.search_index import SearchIndex
 
 
 class CategoriesTab:
     """Categories management tab class"""
     
-    def __init__(self, notebook, status_bar_updater):
+    def __init__(self, notebook, status_bar_updater, tasks):
         self.notebook = notebook
         self.update_status_bar = status_bar_updater
+        self.tasks = tasks
         self.all_categories = []  # Store all categories for filtering
+        self.index = self._index([])
+        self.search_term = ""
         
         # Create frame and add to notebook
         self.frame = ttk.Frame(notebook)
@@ -33,6 +38,9 @@ class CategoriesTab:
         ttk.Button(toolbar, text="➕ New Category", command=self._on_new_category, width=18).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="🔄 Refresh", command=self.refresh_categories, width=15).pack(side=tk.LEFT, padx=2)
         
+        self.search_bar = SearchBar(toolbar, placeholder="Search categories...", search_callback=self._on_search_change)
+        self.search_bar.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=2)
+        
         # Left panel for form
         left_frame = ttk.LabelFrame(self.frame, text="📝 Category Details", padding=10)
         left_frame.pack(side=tk.LEFT, fill=tk.Y, padx=10, pady=10)
@@ -73,7 +81,7 @@ class CategoriesTab:
         
         # Treeview for categories
         columns = ('ID', 'Name', 'Description')
-        self.categories_tree = ttk.Treeview(right_frame, columns=columns, show='headings', height=20)
+        self.categories_tree = VirtualTreeview(right_frame, columns=columns, show='headings', height=20)
         
         self.categories_tree.heading('ID', text='ID')
         self.categories_tree.heading('Name', text='Name')
@@ -115,24 +123,20 @@ class CategoriesTab:
     
     def _on_search_change(self, search_term):
         """Handle search input change"""
-        if not search_term:
-            self.refresh_categories()
-            return
-        
-        for item in self.categories_tree.get_children():
-            self.categories_tree.delete(item)
-        
-        search_term = search_term.lower()
-        for category in self.all_categories:
-            cat_id, name, description = category
-            
-            if (search_term in str(name).lower() or 
-                search_term in str(description).lower() or
-                search_term in str(cat_id)):
-                
-                self.categories_tree.insert('', 'end', values=category)
-        
-        self.category_count_label.config(text=f"Categories: {len(self.categories_tree.get_children())}")
+        self.search_term = search_term
+        self._show_matches()
+    
+    def _show_matches(self, keep_position=False):
+        """Show the categories matching search_term, looked up in the index"""
+        if self.search_term:
+            categories, _ = self.index.search(self.search_term)
+        else:
+            categories = self.all_categories
+        if keep_position:
+            self.categories_tree.show_rows(categories)
+        else:
+            self.categories_tree.set_source(ListSource(categories))
+        self.category_count_label.config(text=f"Categories: {len(categories)}")
     
     def _show_context_menu(self, event):
         """Show right-click context menu"""
@@ -216,18 +220,30 @@ class CategoriesTab:
         self.name_status.config(text="")
     
     def refresh_categories(self):
-        """Refresh categories display"""
-        # Clear existing categories
-        for item in self.categories_tree.get_children():
-            self.categories_tree.delete(item)
-            
+        """Refresh categories display; they are read and indexed in the background"""
+        self.tasks.submit(self._load, key='categories.refresh', label="Loading categories",
+                          on_done=self._show_categories, on_error=self._on_load_error)
+    
+    @classmethod
+    def _load(cls):
+        """Worker thread: read the categories and index them for search"""
         categories = models.get_categories()
-        self.all_categories = categories
-        
-        for category in categories:
-            self.categories_tree.insert('', 'end', values=category)
-        
-        self.category_count_label.config(text=f"Categories: {len(self.categories_tree.get_children())}")
+        return categories, cls._index(categories)
+    
+    @staticmethod
+    def _index(categories):
+        """Word-prefix index over category names and descriptions"""
+        return SearchIndex(fields=lambda category: (category[1], category[2]), order=lambda category: (category[1], category[0]),
+                           rows=categories)
+    
+    def _show_categories(self, loaded):
+        """Show what refresh_categories() read"""
+        self.all_categories, self.index = loaded
+        self._show_matches(keep_position=True)
+    
+    def _on_load_error(self, error):
+        self.update_status_bar(f"❌ Failed to load categories: {error}")
+        messagebox.showerror("Error", f"Failed to load categories: {error}")
     
     def on_double_click(self, event):
         """Handle double click on category"""
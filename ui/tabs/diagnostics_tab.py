@@ -0,0 +1,146 @@
+"""Query diagnostics tab module"""
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from datetime import datetime
+import config
+from database import models
+from ui.virtual_tree import VirtualTreeview
+
+
+class DiagnosticsTab:
+    """Query timing diagnostics tab class (admin only)"""
+
+    def __init__(self, notebook, status_bar_updater, tasks):
+        self.notebook = notebook
+        self.update_status_bar = status_bar_updater
+        self.tasks = tasks
+        self.slow_entries = []
+
+        # Create frame and add to notebook
+        self.frame = ttk.Frame(notebook)
+        notebook.add(self.frame, text="🩺 Diagnostics")
+
+        # Create UI
+        self.create_ui()
+
+        # Load initial data
+        self.refresh_diagnostics()
+
+    def create_ui(self):
+        """Create diagnostics tab UI"""
+        # Toolbar
+        toolbar = ttk.Frame(self.frame)
+        toolbar.pack(fill=tk.X, padx=10, pady=5)
+
+        self.instrument_var = tk.BooleanVar(value=config.DB_INSTRUMENT)
+        ttk.Checkbutton(toolbar, text="⏱️ Time queries", variable=self.instrument_var,
+                        command=self._on_toggle_instrumentation).pack(side=tk.LEFT, padx=2)
+
+        ttk.Label(toolbar, text="Group by:").pack(side=tk.LEFT, padx=(15, 5))
+        self.group_by_var = tk.StringVar(value='statement')
+        group_combo = ttk.Combobox(toolbar, textvariable=self.group_by_var, values=['statement', 'caller'],
+                                   state='readonly', width=12)
+        group_combo.pack(side=tk.LEFT, padx=2)
+        group_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh_diagnostics())
+
+        ttk.Button(toolbar, text="🔄 Refresh", command=self.refresh_diagnostics, width=15).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="🗑️ Reset", command=self._on_reset, width=12).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="💾 Save Slow Log", command=self._on_save_slow_log, width=18).pack(side=tk.LEFT, padx=2)
+
+        self.summary_label = ttk.Label(toolbar, text="", font=config.DEFAULT_FONT_BODY)
+        self.summary_label.pack(side=tk.RIGHT)
+
+        # Timings per statement or caller
+        stats_frame = ttk.LabelFrame(self.frame, text="📈 Query Timings (ms)", padding=10)
+        stats_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        columns = ('Caller', 'Statement', 'Calls', 'Rows', 'Total', 'p50', 'p95', 'p99', 'Max')
+        self.stats_tree = VirtualTreeview(stats_frame, columns=columns, show='headings', height=12,
+                                          key=lambda row: (row[0], row[1]))
+        for column in columns:
+            self.stats_tree.heading(column, text=column)
+        self.stats_tree.column('Caller', width=220)
+        self.stats_tree.column('Statement', width=360)
+        for column in columns[2:]:
+            self.stats_tree.column(column, width=70, anchor='e')
+
+        scrollbar = ttk.Scrollbar(stats_frame, orient=tk.VERTICAL, command=self.stats_tree.yview)
+        self.stats_tree.configure(yscrollcommand=scrollbar.set)
+        self.stats_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Slow-query log with the plan of the selected entry
+        slow_frame = ttk.LabelFrame(self.frame, text=f"🐢 Slow Queries (over {config.DB_SLOW_QUERY_MS} ms)",
+                                    padding=10)
+        slow_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        columns = ('Time', 'ms', 'Rows', 'Caller', 'Statement')
+        self.slow_tree = VirtualTreeview(slow_frame, columns=columns, show='headings', height=8, key=tuple)
+        for column in columns:
+            self.slow_tree.heading(column, text=column)
+        self.slow_tree.column('Time', width=80, anchor='center')
+        self.slow_tree.column('ms', width=70, anchor='e')
+        self.slow_tree.column('Rows', width=70, anchor='e')
+        self.slow_tree.column('Caller', width=220)
+        self.slow_tree.column('Statement', width=360)
+        self.slow_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.slow_tree.bind('<<TreeviewSelect>>', self._on_slow_select)
+
+        self.plan_text = tk.Text(slow_frame, height=8, width=50, wrap=tk.NONE)
+        self.plan_text.pack(side=tk.RIGHT, fill=tk.BOTH, padx=(10, 0))
+
+    def _on_toggle_instrumentation(self):
+        """Turn query timing on or off for connections opened from now on"""
+        config.DB_INSTRUMENT = self.instrument_var.get()
+        state = "enabled" if config.DB_INSTRUMENT else "disabled"
+        self.update_status_bar(f"⏱️ Query timing {state}")
+
+    def _on_reset(self):
+        """Forget all timings"""
+        models.reset_query_stats()
+        self.refresh_diagnostics()
+        self.update_status_bar("🗑️ Query timings cleared")
+
+    def _on_save_slow_log(self):
+        """Save the slow-query log as JSON lines"""
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".jsonl",
+            filetypes=[("JSON lines", "*.jsonl"), ("All files", "*.*")],
+            initialfile=f"slow_queries_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        )
+        if filepath:
+            self.tasks.submit(
+                models.dump_slow_queries, filepath, key=f'diagnostics.save:{filepath}', label="Saving slow-query log",
+                on_done=lambda count: self.update_status_bar(f"💾 {count} slow queries saved to {filepath}"),
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to save slow-query log: {e}"))
+
+    def _on_slow_select(self, event=None):
+        """Show the query plan of the selected slow query"""
+        self.plan_text.delete(1.0, tk.END)
+        selected = self.slow_tree.selection()
+        if selected:
+            entry = self.slow_entries[self.slow_tree.row_index(selected[0])]
+            self.plan_text.insert(tk.END, f"{entry['sql']}\n\nparams: {entry['params']}\n\n")
+            self.plan_text.insert(tk.END, entry['plan'] or "(no query plan)")
+
+    def refresh_diagnostics(self):
+        """Refresh timings and the slow-query log"""
+        self.plan_text.delete(1.0, tk.END)
+
+        self.stats_tree.show_rows([
+            (stats['caller'], stats['sql'] or "", stats['count'], stats['rows'],
+             f"{stats['total_ms']:.1f}", f"{stats['p50']:.2f}", f"{stats['p95']:.2f}",
+             f"{stats['p99']:.2f}", f"{stats['max_ms']:.2f}")
+            for stats in models.query_stats(self.group_by_var.get())])
+
+        # Newest first
+        self.slow_entries = models.slow_queries()[::-1]
+        self.slow_tree.show_rows([
+            (datetime.fromtimestamp(entry['ts']).strftime('%H:%M:%S'), f"{entry['ms']:.1f}",
+             entry['rows'], entry['caller'], entry['sql'])
+            for entry in self.slow_entries])
+
+        overall = models.query_percentiles()
+        self.summary_label.config(
+            text=f"{overall['count']} statements · p50 {overall['p50']:.2f} · "
+                 f"p95 {overall['p95']:.2f} · p99 {overall['p99']:.2f} ms")
@@ -4,15 +4,22 @@ from tkinter import ttk, messagebox
 import config
 from database import models
 from ui.theme import SearchBar, Tooltip, ValidationFrame, StatusBadge
+from ui.virtual_tree import VirtualTreeview, QuerySource, ListSource
+from utils.search_index import SearchIndex
 
 
 class InventoryTab:
     """Inventory management tab class"""
     
-    def __init__(self, notebook, status_bar_updater):
+    def __init__(self, notebook, status_bar_updater, tasks):
         self.notebook = notebook
         self.update_status_bar = status_bar_updater
-        self.all_items = []  # Store all items for filtering
+        self.tasks = tasks
+        self.items = QuerySource(models.count_items, models.view_items_window, format=self._display_values)
+        self.index = None  # SearchIndex over all items, built by refresh_inventory()
+        self._reindex_pending = False
+        self.search_term = ""
+        self._more_matches = False
         
         # Create frame and add to notebook
         self.frame = ttk.Frame(notebook)
@@ -33,6 +40,9 @@ class InventoryTab:
         ttk.Button(toolbar, text="➕ New Item", command=self._on_new_item, width=18).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="🔄 Refresh", command=self.refresh_inventory, width=15).pack(side=tk.LEFT, padx=2)
         
+        self.search_bar = SearchBar(toolbar, placeholder="Search items...", search_callback=self._on_search_change)
+        self.search_bar.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=2)
+        
         # Left panel for form
         left_frame = ttk.LabelFrame(self.frame, text="📝 Item Details", padding=10)
         left_frame.pack(side=tk.LEFT, fill=tk.Y, padx=10, pady=10)
@@ -89,7 +99,8 @@ class InventoryTab:
         
         # Treeview for inventory
         columns = ('ID', 'Name', 'Category', 'Quantity', 'Cost Price')
-        self.inventory_tree = ttk.Treeview(right_frame, columns=columns, show='headings', height=20)
+        self.inventory_tree = VirtualTreeview(right_frame, columns=columns, show='headings', height=20,
+                                              source=self.items)
         
         self.inventory_tree.heading('ID', text='ID')
         self.inventory_tree.heading('Name', text='Name')
@@ -207,9 +218,9 @@ class InventoryTab:
                 messagebox.showerror("Error", "Category not found!")
                 return
                 
-            models.add_item(name, category_id, quantity, cost_price)
+            item_id = models.add_item(name, category_id, quantity, cost_price)
             self.clear_form()
-            self.refresh_inventory()
+            self._item_changed(item_id)
             self.update_status_bar(f"✓ Item '{name}' added successfully!")
             
         except ValueError:
@@ -242,7 +253,7 @@ class InventoryTab:
             
             models.update_item(item_id, name, category_id, quantity, cost_price)
             self.clear_form()
-            self.refresh_inventory()
+            self._item_changed(item_id)
             self.update_status_bar(f"✓ Item ID {item_id} updated successfully!")
             
         except ValueError:
@@ -264,7 +275,7 @@ class InventoryTab:
         if messagebox.askyesno("Confirm Delete", f"Delete '{item_name}'? This cannot be undone."):
             models.delete_item(item_id)
             self.clear_form()
-            self.refresh_inventory()
+            self._item_changed(item_id)
             self.update_status_bar(f"✓ Item '{item_name}' deleted successfully!")
     
     def clear_form(self):
@@ -279,46 +290,107 @@ class InventoryTab:
         self.quantity_status.config(text="")
         self.cost_price_status.config(text="")
     
+    @staticmethod
+    def _display_values(item):
+        """Turn a view_items() row into [id, name, category, quantity with unit, cost price]"""
+        # [id, name, category_id, quantity, price, measurement_unit_id, category_name, unit_name, unit_symbol, cost_price]
+        item_id, item_name, quantity = item[0], item[1], item[3]
+        category_name = item[6] if item[6] else "No Category"
+        unit_symbol = item[8] if item[8] else ""
+        cost_price = item[9] if len(item) > 9 else 0.0
+        return [
+            item_id,
+            item_name,
+            category_name,
+            f"{quantity} {unit_symbol}" if unit_symbol else str(quantity),
+            cost_price
+        ]
+    
     def refresh_inventory(self):
-        """Refresh inventory display"""
-        # Clear existing items
-        for item in self.inventory_tree.get_children():
-            self.inventory_tree.delete(item)
-            
-        items = models.view_items()
-        self.all_items = []
-        
-        for item in items:
-            # Data structure from SELECT i.*, c.name, mu.unit_name, mu.unit_symbol:
-            # [id, name, category_id, quantity, price, measurement_unit_id, category_name, unit_name, unit_symbol, cost_price]
-            
-            # Extract values with correct indices
-            item_id = item[0]
-            item_name = item[1]
-            category_name = item[6] if item[6] else "No Category"  # category_name at index 6
-            quantity = item[3]
-            unit_symbol = item[8] if item[8] else ""  # unit_symbol at index 8
-            cost_price = item[9] if len(item) > 9 else 0.0  # cost_price at index 9
-            
-            # Store for search functionality
-            self.all_items.append([item_id, item_name, category_name, quantity, cost_price])
-            
-            # Create display values: [id, name, category_name, quantity_with_unit, cost_price]
-            display_values = [
-                item_id,  # ID
-                item_name,  # Name
-                category_name,  # Category name
-                f"{quantity} {unit_symbol}" if unit_symbol else str(quantity),  # Quantity with unit
-                cost_price  # Cost Price
-            ]
-            self.inventory_tree.insert('', 'end', values=display_values)
-        
-        self.item_count_label.config(text=f"Items: {len(self.inventory_tree.get_children())}")
-        
-        # Update categories combo
-        categories = models.get_categories()
-        category_names = [cat[1] for cat in categories]
+        """Refresh inventory display and rebuild the search index in the background.
+
+        Only the rows on screen are read for display; the index needs every item.
+        """
+        self._reindex_pending = True
+        self._reload()
+    
+    def _reload(self):
+        """Read the rows on screen in the background, and all items if the index is due"""
+        viewport = self.inventory_tree.viewport
+        # While search results are shown, the listing is reloaded from the top
+        first = viewport.first if viewport.source is self.items else 0
+        # Stays set until a rebuilt index arrives, so a coalesced reload still rebuilds it
+        self.tasks.submit(self._load, self.items, first, viewport.height, self._reindex_pending,
+                          key='inventory.refresh', label="Loading inventory",
+                          on_done=self._show_loaded, on_error=self._on_load_error)
+    
+    @classmethod
+    def _load(cls, source, first, height, reindex):
+        """Worker thread: read the rows on screen, the category names and, if asked, the search index"""
+        index = None
+        if reindex:
+            index = SearchIndex(fields=lambda row: (row[1], row[2]), order=lambda row: (row[1], row[0]),
+                                rows=[cls._display_values(item) for item in models.view_items()])
+        return source.load(first, height), [cat[1] for cat in models.get_categories()], index
+    
+    def _show_loaded(self, loaded):
+        """Show what refresh_inventory() read"""
+        rows, category_names, index = loaded
+        if self.inventory_tree.viewport.source is self.items:
+            self.inventory_tree.install(rows)
+        else:
+            self.items.install(rows)
         self.category_combo['values'] = category_names
+        if index is not None:
+            self.index = index
+            self._reindex_pending = False
+            if self.search_term:
+                self._show_matches(keep_position=True)
+        self._update_count()
+    
+    def _item_changed(self, item_id):
+        """Bring the index and the table up to date after one item was added, updated or deleted"""
+        if self.index is not None:
+            item = models.view_item(item_id)
+            if item is None:
+                self.index.remove(item_id)
+            else:
+                self.index.add(self._display_values(item))
+        if self.search_term:
+            self._show_matches(keep_position=True)
+        self._reload()
+    
+    def _on_search_change(self, search_term):
+        """Show the items matching search_term, or the whole inventory when it is empty"""
+        self.search_term = search_term
+        if search_term:
+            self._show_matches()
+        elif self.inventory_tree.viewport.source is not self.items:
+            self.inventory_tree.set_source(self.items)
+        self._update_count()
+    
+    def _show_matches(self, keep_position=False):
+        """Look search_term up in the index; the first SEARCH_RESULT_LIMIT matches are shown"""
+        if self.index is None:
+            self.update_status_bar("⏳ Search runs once the inventory has loaded")
+            return
+        rows, self._more_matches = self.index.search(self.search_term, limit=config.SEARCH_RESULT_LIMIT)
+        if keep_position:
+            self.inventory_tree.show_rows(rows)
+        else:
+            self.inventory_tree.set_source(ListSource(rows))
+    
+    def _update_count(self):
+        if self.inventory_tree.viewport.source is self.items:
+            self.item_count_label.config(text=f"Items: {len(self.items)}")
+        elif self._more_matches:
+            self.item_count_label.config(text=f"Items: first {len(self.inventory_tree):,} matches")
+        else:
+            self.item_count_label.config(text=f"Items: {len(self.inventory_tree)} matching")
+    
+    def _on_load_error(self, error):
+        self.update_status_bar(f"❌ Failed to load inventory: {error}")
+        messagebox.showerror("Error", f"Failed to load inventory: {error}")
     
     def on_double_click(self, event):
         """Handle double click on inventory item"""
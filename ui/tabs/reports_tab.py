@@ -5,15 +5,26 @@ from datetime import datetime, timedelta
 import os
 import config
 from database import models
-from database.export_helpers import export_to_csv, export_to_txt, generate_filename
+from ui.tasks import current_task
 
 
 class ReportsTab:
     """Reports generation tab class (admin only)"""
     
-    def __init__(self, notebook, status_bar_updater):
+    # Report type -> name of its models.generate_*_report and display_*_report methods
+    REPORTS = {
+        'inventory': 'inventory',
+        'transactions': 'transaction',
+        'sales': 'sales',
+        'profit_loss': 'profit_loss',
+        'users': 'user_activity',
+        'suppliers': 'supplier',
+    }
+    
+    def __init__(self, notebook, status_bar_updater, tasks):
         self.notebook = notebook
         self.update_status_bar = status_bar_updater
+        self.tasks = tasks
         
         # Create frame and add to notebook
         self.frame = ttk.Frame(notebook)
@@ -32,6 +43,7 @@ class ReportsTab:
         ttk.Radiobutton(type_frame, text="📦 Inventory Report", variable=self.report_type_var, value="inventory").pack(anchor=tk.W, padx=10, pady=2)
         ttk.Radiobutton(type_frame, text="💳 Transaction Report", variable=self.report_type_var, value="transactions").pack(anchor=tk.W, padx=10, pady=2)
         ttk.Radiobutton(type_frame, text="💰 Sales Report", variable=self.report_type_var, value="sales").pack(anchor=tk.W, padx=10, pady=2)
+        ttk.Radiobutton(type_frame, text="📈 Profit & Loss Report", variable=self.report_type_var, value="profit_loss").pack(anchor=tk.W, padx=10, pady=2)
         ttk.Radiobutton(type_frame, text="👥 User Activity Report", variable=self.report_type_var, value="users").pack(anchor=tk.W, padx=10, pady=2)
         ttk.Radiobutton(type_frame, text="🏭 Supplier Report", variable=self.report_type_var, value="suppliers").pack(anchor=tk.W, padx=10, pady=2)
         
@@ -75,6 +87,7 @@ class ReportsTab:
         ttk.Button(button_frame, text="📊 Generate Report", command=self.generate_report, width=20).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="📄 Export to CSV", command=self.export_csv, width=15).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="📄 Export to TXT", command=self.export_txt, width=15).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="📦 Export Columnar", command=self.export_columnar, width=18).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="🔄 Clear", command=self.clear_report, width=10).pack(side=tk.LEFT, padx=5)
         
         # Report display
@@ -129,41 +142,37 @@ class ReportsTab:
         self.update_status_bar(f"📅 Applied date range: {self.start_date_var.get()} to {self.end_date_var.get()}")
     
     def generate_report(self):
-        """Generate selected report"""
-        try:
-            report_type = self.report_type_var.get()
-            start_date = self.start_date_var.get()
-            end_date = self.end_date_var.get()
-            
-            self.status_label.config(text="🔄 Generating report...", foreground=config.COLOR_INFO)
-            self.update_status_bar("🔄 Generating report...")
-            
-            if report_type == "inventory":
-                data = models.generate_inventory_report(start_date, end_date)
-                self.display_inventory_report(data)
-            elif report_type == "transactions":
-                data = models.generate_transaction_report(start_date, end_date)
-                self.display_transaction_report(data)
-            elif report_type == "sales":
-                data = models.generate_sales_report(start_date, end_date)
-                self.display_sales_report(data)
-            elif report_type == "users":
-                data = models.generate_user_activity_report(start_date, end_date)
-                self.display_user_activity_report(data)
-            elif report_type == "suppliers":
-                data = models.generate_supplier_report(start_date, end_date)
-                self.display_supplier_report(data)
-            else:
-                messagebox.showerror("Error", "Invalid report type!")
-                return
-                
-            self.status_label.config(text="✅ Report generated successfully!", foreground=config.COLOR_SUCCESS)
-            self.update_status_bar(f"✅ {report_type.title()} report generated successfully!")
-                
-        except Exception as e:
-            self.status_label.config(text=f"❌ Error: {str(e)}", foreground=config.COLOR_DANGER)
-            self.update_status_bar(f"❌ Failed to generate report: {e}")
-            messagebox.showerror("Error", f"Failed to generate report: {e}")
+        """Generate the selected report in the background"""
+        report_type = self.report_type_var.get()
+        if report_type not in self.REPORTS:
+            messagebox.showerror("Error", "Invalid report type!")
+            return
+        
+        self.status_label.config(text="🔄 Generating report...", foreground=config.COLOR_INFO)
+        self.update_status_bar("🔄 Generating report...")
+        self.tasks.submit(self._generate, report_type, self.start_date_var.get(), self.end_date_var.get(),
+                          key='reports.generate', label=f"Generating {report_type} report",
+                          on_done=lambda data: self._show_report(report_type, data),
+                          on_error=self._on_report_error, on_cancel=self._on_report_cancelled)
+    
+    @classmethod
+    def _generate(cls, report_type, start_date, end_date):
+        """Worker thread: run the report's model function"""
+        return getattr(models, f"generate_{cls.REPORTS[report_type]}_report")(start_date, end_date)
+    
+    def _show_report(self, report_type, data):
+        """Display a report generated by generate_report()"""
+        getattr(self, f"display_{self.REPORTS[report_type]}_report")(data)
+        self.status_label.config(text="✅ Report generated successfully!", foreground=config.COLOR_SUCCESS)
+        self.update_status_bar(f"✅ {report_type.title()} report generated successfully!")
+    
+    def _on_report_error(self, error):
+        self.status_label.config(text=f"❌ Error: {str(error)}", foreground=config.COLOR_DANGER)
+        self.update_status_bar(f"❌ Failed to generate report: {error}")
+        messagebox.showerror("Error", f"Failed to generate report: {error}")
+    
+    def _on_report_cancelled(self):
+        self.status_label.config(text="Report cancelled", foreground='gray')
     
     def display_inventory_report(self, data):
         """Display inventory report"""
@@ -236,6 +245,38 @@ class ReportsTab:
             self.report_text.insert(tk.END, f"  {item[0]:<15} | {item[1]:<20} | "
                                      f"{item[2]} units | ${item[3]:.2f}\n")
     
+    def display_profit_loss_report(self, data):
+        """Display profit and loss report"""
+        self.report_text.delete(1.0, tk.END)
+        
+        self.report_text.insert(tk.END, f"📈 PROFIT & LOSS REPORT\n")
+        self.report_text.insert(tk.END, f"Generated: {data.get('generated_at', 'N/A')}\n")
+        if data.get('filter_period'):
+            self.report_text.insert(tk.END, f"Period: {data['filter_period']}\n")
+        self.report_text.insert(tk.END, f"\n")
+        
+        self.report_text.insert(tk.END, f"📊 Summary:\n")
+        self.report_text.insert(tk.END, f"Total Revenue: ${data.get('total_revenue', 0):.2f}\n")
+        self.report_text.insert(tk.END, f"Cost of Goods: ${data.get('total_cost', 0):.2f}\n")
+        self.report_text.insert(tk.END, f"Gross Profit: ${data.get('gross_profit', 0):.2f}\n")
+        self.report_text.insert(tk.END, f"Net Profit: ${data.get('net_profit', 0):.2f}\n")
+        self.report_text.insert(tk.END, f"Items Sold: {data.get('items_sold', 0)}\n")
+        self.report_text.insert(tk.END, f"Items Purchased: {data.get('items_purchased', 0)}\n")
+        self.report_text.insert(tk.END, f"\n")
+        
+        self.report_text.insert(tk.END, f"📂 By Category:\n")
+        self.report_text.insert(tk.END, "-" * 50 + "\n")
+        for category in data.get('category_breakdown', []):
+            self.report_text.insert(tk.END, f"  {category[0]:<20} | ${category[1]:.2f} revenue | "
+                                 f"${category[2]:.2f} cost | ${category[3]:.2f} profit\n")
+        
+        self.report_text.insert(tk.END, f"\n")
+        self.report_text.insert(tk.END, f"🏆 Most Profitable Items:\n")
+        self.report_text.insert(tk.END, "-" * 50 + "\n")
+        for item in data.get('top_items', []):
+            self.report_text.insert(tk.END, f"  {item[0]:<20} | {item[1]:<15} | "
+                                 f"{item[2]} units | ${item[4]:.2f} profit\n")
+    
     def display_user_activity_report(self, data):
         """Display user activity report"""
         self.report_text.delete(1.0, tk.END)
@@ -277,67 +318,119 @@ class ReportsTab:
             self.report_text.insert(tk.END, f"  {supplier[0]:<5} | {supplier[1]:<25} | "
                                  f"{supplier[2] or 'N/A':<20} | {supplier[3] or 'N/A':<15}\n")
     
+    @staticmethod
+    def _export_data(report_type, start_date, end_date):
+        """Generate a report for export, streaming its rows where supported"""
+        data = {
+            'report_type': report_type,
+            'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'filter_period': f"{start_date} to {end_date}"
+        }
+        
+        # Get actual report data based on type
+        if report_type == "inventory":
+            data.update(models.generate_inventory_report(start_date, end_date))
+        elif report_type == "transactions":
+            data.update(models.generate_transaction_report(start_date, end_date, stream=True))
+        elif report_type == "sales":
+            data.update(models.generate_sales_report(start_date, end_date))
+        elif report_type == "profit_loss":
+            data.update(models.generate_profit_loss_report(start_date, end_date))
+        elif report_type == "users":
+            data.update(models.generate_user_activity_report(start_date, end_date))
+        elif report_type == "suppliers":
+            data.update(models.generate_supplier_report(start_date, end_date))
+        return data
+    
+    def _start_export(self, filepath, icon, work, *args):
+        """Run work(*args), which writes filepath, in the background and report the outcome"""
+        self.update_status_bar(f"{icon} Exporting...")
+        self.tasks.submit(self._run_export, filepath, work, *args,
+                          key=f'reports.export:{filepath}', label=f"Exporting {os.path.basename(filepath)}",
+                          on_done=lambda result: self._on_exported(icon, filepath, result),
+                          on_error=lambda e: messagebox.showerror("Export Error", f"Failed to export: {e}"),
+                          on_cancel=lambda: self.update_status_bar("✕ Export cancelled"))
+    
+    @staticmethod
+    def _run_export(filepath, work, *args):
+        """Worker thread: write the export; a cancelled export leaves no file behind"""
+        result = work(*args)
+        if current_task().cancelled and os.path.exists(filepath):
+            os.remove(filepath)
+        return result
+    
+    def _write_report(self, export, filepath, report_type, start_date, end_date):
+        """Worker thread: generate a report and write it with export_to_csv or export_to_columnar"""
+        return export(self._export_data(report_type, start_date, end_date), filepath,
+                      progress=self._export_progress)
+    
+    def _on_exported(self, icon, filepath, result):
+        success, message = result
+        if success:
+            self.update_status_bar(f"{icon} Report exported to {filepath}")
+            messagebox.showinfo("Export Successful", message)
+        else:
+            messagebox.showerror("Export Failed", message)
+    
     def export_csv(self):
         """Export report to CSV"""
-        try:
-            report_type = self.report_type_var.get()
-            data = {
-                'report_type': report_type,
-                'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'filter_period': f"{self.start_date_var.get()} to {self.end_date_var.get()}"
-            }
-            
-            # Get actual report data based on type
-            if report_type == "inventory":
-                data.update(models.generate_inventory_report(self.start_date_var.get(), self.end_date_var.get()))
-            elif report_type == "transactions":
-                data.update(models.generate_transaction_report(self.start_date_var.get(), self.end_date_var.get()))
-            elif report_type == "sales":
-                data.update(models.generate_sales_report(self.start_date_var.get(), self.end_date_var.get()))
-            elif report_type == "users":
-                data.update(models.generate_user_activity_report(self.start_date_var.get(), self.end_date_var.get()))
-            elif report_type == "suppliers":
-                data.update(models.generate_supplier_report(self.start_date_var.get(), self.end_date_var.get()))
-            
-            filename = generate_filename(f"{report_type}_report", "csv")
-            filepath = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                initialfile=filename
-            )
-            
-            if filepath:
-                success, message = export_to_csv(data, filepath)
-                if success:
-                    self.update_status_bar(f"📄 Report exported to {filepath}")
-                    messagebox.showinfo("Export Successful", message)
-                else:
-                    messagebox.showerror("Export Failed", message)
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export: {e}")
+        from database.export_helpers import export_to_csv, generate_filename
+        report_type = self.report_type_var.get()
+        filename = generate_filename(f"{report_type}_report", "csv")
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz"), ("All files", "*.*")],
+            initialfile=filename
+        )
+        
+        if filepath:
+            self._start_export(filepath, "📄", self._write_report, export_to_csv, filepath,
+                               report_type, self.start_date_var.get(), self.end_date_var.get())
+    
+    def export_columnar(self):
+        """Export report rows to a typed columnar file for analysis tools"""
+        from database.export_helpers import export_to_columnar, columnar_extension, generate_filename
+        report_type = self.report_type_var.get()
+        if report_type not in ("inventory", "transactions", "sales"):
+            messagebox.showwarning("Export", "Columnar export is available for the inventory, transaction and sales reports.")
+            return
+        
+        extension = columnar_extension()
+        filename = generate_filename(f"{report_type}_report", extension)
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=f".{extension}",
+            filetypes=[("Parquet files", "*.parquet"), ("Columnar NDJSON files", "*.ndjson.gz"), ("All files", "*.*")],
+            initialfile=filename
+        )
+        
+        if filepath:
+            self._start_export(filepath, "📦", self._write_report, export_to_columnar, filepath,
+                               report_type, self.start_date_var.get(), self.end_date_var.get())
+    
+    def _export_progress(self, rows_written, total_rows):
+        """Show export progress in the status bar; stops the export once it is cancelled"""
+        current_task().check()
+        if total_rows:
+            message = f"📄 Exporting... {rows_written:,} of {total_rows:,} rows"
+        else:
+            message = f"📄 Exporting... {rows_written:,} rows"
+        self.tasks.call_soon(self.update_status_bar, message)
     
     def export_txt(self):
         """Export report to TXT"""
-        try:
-            report_content = self.report_text.get(1.0, tk.END)
-            report_type = self.report_type_var.get()
-            filename = generate_filename(f"{report_type}_report", "txt")
-            
-            filepath = filedialog.asksaveasfilename(
-                defaultextension=".txt",
-                filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
-                initialfile=filename
-            )
-            
-            if filepath:
-                success, message = export_to_txt(report_content, filepath)
-                if success:
-                    self.update_status_bar(f"📄 Report exported to {filepath}")
-                    messagebox.showinfo("Export Successful", message)
-                else:
-                    messagebox.showerror("Export Failed", message)
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export: {e}")
+        from database.export_helpers import export_to_txt, generate_filename
+        report_content = self.report_text.get(1.0, tk.END)
+        report_type = self.report_type_var.get()
+        filename = generate_filename(f"{report_type}_report", "txt")
+        
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            initialfile=filename
+        )
+        
+        if filepath:
+            self._start_export(filepath, "📄", export_to_txt, report_content, filepath)
     
     def clear_report(self):
         """Clear report display"""
@@ -4,15 +4,20 @@ from tkinter import ttk, messagebox
 import config
 from database import models
 from ui.theme import SearchBar, Tooltip
+from ui.virtual_tree import VirtualTreeview, ListSource
+from utils.search_index import SearchIndex
 
 
 class SuppliersTab:
     """Suppliers management tab class"""
     
-    def __init__(self, notebook, status_bar_updater):
+    def __init__(self, notebook, status_bar_updater, tasks):
         self.notebook = notebook
         self.update_status_bar = status_bar_updater
+        self.tasks = tasks
         self.all_suppliers = []  # Store all suppliers for filtering
+        self.index = self._index([])
+        self.search_term = ""
         
         # Create frame and add to notebook
         self.frame = ttk.Frame(notebook)
@@ -33,6 +38,9 @@ class SuppliersTab:
         ttk.Button(toolbar, text="➕ New Supplier", command=self._on_new_supplier, width=18).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="🔄 Refresh", command=self.refresh_suppliers, width=15).pack(side=tk.LEFT, padx=2)
         
+        self.search_bar = SearchBar(toolbar, placeholder="Search suppliers...", search_callback=self._on_search_change)
+        self.search_bar.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=2)
+        
         # Left panel for form
         left_frame = ttk.LabelFrame(self.frame, text="📝 Supplier Details", padding=10)
         left_frame.pack(side=tk.LEFT, fill=tk.Y, padx=10, pady=10)
@@ -80,7 +88,7 @@ class SuppliersTab:
         
         # Treeview for suppliers
         columns = ('ID', 'Name', 'Contact', 'Email', 'Phone')
-        self.suppliers_tree = ttk.Treeview(right_frame, columns=columns, show='headings', height=20)
+        self.suppliers_tree = VirtualTreeview(right_frame, columns=columns, show='headings', height=20)
         
         self.suppliers_tree.heading('ID', text='ID')
         self.suppliers_tree.heading('Name', text='Name')
@@ -118,26 +126,20 @@ class SuppliersTab:
     
     def _on_search_change(self, search_term):
         """Handle search input change"""
-        if not search_term:
-            self.refresh_suppliers()
-            return
-        
-        for item in self.suppliers_tree.get_children():
-            self.suppliers_tree.delete(item)
-        
-        search_term = search_term.lower()
-        for supplier in self.all_suppliers:
-            supplier_id, name, contact, email, phone = supplier
-            
-            if (search_term in str(name).lower() or 
-                search_term in str(contact).lower() or
-                search_term in str(email).lower() or
-                search_term in str(phone).lower() or
-                search_term in str(supplier_id)):
-                
-                self.suppliers_tree.insert('', 'end', values=supplier)
-        
-        self.supplier_count_label.config(text=f"Suppliers: {len(self.suppliers_tree.get_children())}")
+        self.search_term = search_term
+        self._show_matches()
+    
+    def _show_matches(self, keep_position=False):
+        """Show the suppliers matching search_term, looked up in the index"""
+        if self.search_term:
+            suppliers, _ = self.index.search(self.search_term)
+        else:
+            suppliers = self.all_suppliers
+        if keep_position:
+            self.suppliers_tree.show_rows(suppliers)
+        else:
+            self.suppliers_tree.set_source(ListSource(suppliers))
+        self.supplier_count_label.config(text=f"Suppliers: {len(suppliers)}")
     
     def _show_context_menu(self, event):
         """Show right-click context menu"""
@@ -226,18 +228,30 @@ class SuppliersTab:
         self.supplier_phone_var.set("")
     
     def refresh_suppliers(self):
-        """Refresh suppliers display"""
-        # Clear existing suppliers
-        for item in self.suppliers_tree.get_children():
-            self.suppliers_tree.delete(item)
-            
+        """Refresh suppliers display; they are read and indexed in the background"""
+        self.tasks.submit(self._load, key='suppliers.refresh', label="Loading suppliers",
+                          on_done=self._show_suppliers, on_error=self._on_load_error)
+    
+    @classmethod
+    def _load(cls):
+        """Worker thread: read the suppliers and index them for search"""
         suppliers = models.get_suppliers()
-        self.all_suppliers = suppliers
-        
-        for supplier in suppliers:
-            self.suppliers_tree.insert('', 'end', values=supplier)
-        
-        self.supplier_count_label.config(text=f"Suppliers: {len(self.suppliers_tree.get_children())}")
+        return suppliers, cls._index(suppliers)
+    
+    @staticmethod
+    def _index(suppliers):
+        """Word-prefix index over supplier names, contacts, emails and phones"""
+        return SearchIndex(fields=lambda supplier: supplier[1:5], order=lambda supplier: (supplier[1], supplier[0]),
+                           rows=suppliers)
+    
+    def _show_suppliers(self, loaded):
+        """Show what refresh_suppliers() read"""
+        self.all_suppliers, self.index = loaded
+        self._show_matches(keep_position=True)
+    
+    def _on_load_error(self, error):
+        self.update_status_bar(f"❌ Failed to load suppliers: {error}")
+        messagebox.showerror("Error", f"Failed to load suppliers: {error}")
     
     def on_double_click(self, event):
         """Handle double click on supplier"""
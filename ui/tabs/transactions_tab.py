@@ -5,15 +5,21 @@ from datetime import datetime
 import config
 from database import models
 from ui.theme import SearchBar, Tooltip
+from ui.virtual_tree import VirtualTreeview, ListSource, KeysetSource
 
 
 class TransactionsTab:
     """Transactions management tab class"""
     
-    def __init__(self, notebook, status_bar_updater):
+    def __init__(self, notebook, status_bar_updater, tasks):
         self.notebook = notebook
         self.update_status_bar = status_bar_updater
-        self.all_transactions = []  # Store all transactions for filtering
+        self.tasks = tasks
+        self.history = KeysetSource(models.count_transactions, models.get_transactions_page,
+                                    models.get_transactions_cursor, format=self._display_values)
+        self.item_ids = {}  # item name -> id, for the item combo
+        self.search_term = ""
+        self._more_matches = False
         
         # Create frame and add to notebook
         self.frame = ttk.Frame(notebook)
@@ -34,6 +40,9 @@ class TransactionsTab:
         ttk.Button(toolbar, text="➕ New Transaction", command=self._on_new_transaction, width=18).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="🔄 Refresh", command=self.refresh_transactions, width=15).pack(side=tk.LEFT, padx=2)
         
+        self.search_bar = SearchBar(toolbar, placeholder="Search transactions...", search_callback=self._on_search_change)
+        self.search_bar.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=2)
+        
         # Left panel for form
         left_frame = ttk.LabelFrame(self.frame, text="📝 Transaction Details", padding=10)
         left_frame.pack(side=tk.LEFT, fill=tk.Y, padx=10, pady=10)
@@ -93,7 +102,8 @@ class TransactionsTab:
         
         # Treeview for transactions
         columns = ('ID', 'Item', 'Type', 'Quantity', 'Date', 'Notes')
-        self.transactions_tree = ttk.Treeview(right_frame, columns=columns, show='headings', height=20)
+        self.transactions_tree = VirtualTreeview(right_frame, columns=columns, show='headings', height=20,
+                                                 source=self.history)
         
         self.transactions_tree.heading('ID', text='ID')
         self.transactions_tree.heading('Item', text='Item')
@@ -129,27 +139,46 @@ class TransactionsTab:
         self.update_status_bar("✎ Ready to add new transaction")
     
     def _on_search_change(self, search_term):
-        """Handle search input change"""
-        if not search_term:
-            self.refresh_transactions()
+        """Handle search input change; the whole history is searched in the database"""
+        self.search_term = search_term
+        if search_term:
+            self._search()
+        else:
+            if self.transactions_tree.viewport.source is not self.history:
+                self.transactions_tree.set_source(self.history)
+            self._update_count()
+    
+    def _search(self, keep_position=False):
+        self.tasks.submit(self._find, self.search_term, keep_position, key='transactions.search',
+                          label="Searching transactions", on_done=self._show_matches,
+                          on_error=self._on_load_error)
+    
+    @classmethod
+    def _find(cls, search_term, keep_position):
+        """Worker thread: the best SEARCH_RESULT_LIMIT matches by item name and notes"""
+        found = models.search(search_term, 'transactions', config.SEARCH_RESULT_LIMIT + 1)
+        rows = [cls._display_values(transaction) for _, transaction in found]
+        return search_term, rows[:config.SEARCH_RESULT_LIMIT], len(rows) > config.SEARCH_RESULT_LIMIT, keep_position
+    
+    def _show_matches(self, found):
+        """Show what _find() found, unless the search has changed since"""
+        search_term, matches, more, keep_position = found
+        if search_term != self.search_term:
             return
-        
-        for item in self.transactions_tree.get_children():
-            self.transactions_tree.delete(item)
-        
-        search_term = search_term.lower()
-        for transaction in self.all_transactions:
-            trans_id, item_name, trans_type, quantity, date, notes = transaction
-            
-            if (search_term in str(item_name).lower() or 
-                search_term in str(trans_type).lower() or
-                search_term in str(date).lower() or
-                search_term in str(notes).lower() or
-                search_term in str(trans_id)):
-                
-                self.transactions_tree.insert('', 'end', values=transaction)
-        
-        self.transaction_count_label.config(text=f"Transactions: {len(self.transactions_tree.get_children())}")
+        self._more_matches = more
+        if keep_position:
+            self.transactions_tree.show_rows(matches)
+        else:
+            self.transactions_tree.set_source(ListSource(matches))
+        self._update_count()
+    
+    def _update_count(self):
+        if self.transactions_tree.viewport.source is self.history:
+            self.transaction_count_label.config(text=f"Transactions: {len(self.transactions_tree)}")
+        elif self._more_matches:
+            self.transaction_count_label.config(text=f"Transactions: first {len(self.transactions_tree):,} matches")
+        else:
+            self.transaction_count_label.config(text=f"Transactions: {len(self.transactions_tree)} matching")
     
     def _show_context_menu(self, event):
         """Show right-click context menu"""
@@ -172,15 +201,12 @@ class TransactionsTab:
     
     def on_item_selected(self, event):
         """Handle item selection change"""
-        item_name = self.transaction_item_var.get()
-        if item_name:
+        item_id = self.item_ids.get(self.transaction_item_var.get())
+        if item_id is not None:
             # Update current quantity display
-            items = models.view_items()
-            for item in items:
-                if item[1] == item_name:
-                    current_quantity = item[3]
-                    self.update_status_bar(f"📊 Current stock: {current_quantity} units")
-                    break
+            item = models.get_item_by_id(item_id)
+            if item:
+                self.update_status_bar(f"📊 Current stock: {item[3]} units")
     
     def on_type_changed(self, event):
         """Handle transaction type change"""
@@ -208,16 +234,10 @@ class TransactionsTab:
                 return
                 
             # Get item ID from name
-            items = models.view_items()
-            item_id = None
-            item_data = None
-            for item in items:
-                if item[1] == item_name:
-                    item_id = item[0]
-                    item_data = item
-                    break
+            item_id = self.item_ids.get(item_name)
+            item_data = models.get_item_by_id(item_id) if item_id is not None else None
                     
-            if not item_id:
+            if not item_data:
                 messagebox.showerror("Error", "Item not found!")
                 return
             
@@ -232,22 +252,15 @@ class TransactionsTab:
                     return
                 
             # Add transaction
-            success, message = models.add_transaction(item_id, trans_type, quantity, date, notes, selling_price)
+            success, message, new_quantity = models.add_transaction(item_id, trans_type, quantity, date, notes, selling_price)
             
             if success:
                 self.clear_form()
-                self.refresh_transactions()
-                
-                # Update current quantity display if item is still selected
-                if self.transaction_item_var.get() == item_name:
-                    items = models.view_items()
-                    for item in items:
-                        if item[1] == item_name:
-                            current_quantity = item[3]
-                            self.update_status_bar(f"📊 Current stock: {current_quantity} units")
-                            break
+                self._reload()
+                if self.search_term:
+                    self._search(keep_position=True)
                 
-                self.update_status_bar(f"✓ Transaction added successfully! {message}")
+                self.update_status_bar(f"✓ Transaction added successfully! 📊 Current stock: {new_quantity} units")
             else:
                 messagebox.showerror("Error", message)
                 
@@ -268,24 +281,47 @@ class TransactionsTab:
         self.selling_price_entry.config(state='normal')
         self.update_status_bar("📝 Form cleared")
     
+    @staticmethod
+    def _display_values(transaction):
+        """Turn a get_transactions_page() row into [id, item, type, quantity, date, notes]"""
+        # [id, item_id, transaction_type, quantity, date, notes, selling_price, created_at, item_name]
+        return [transaction[0], transaction[-1], transaction[2], transaction[3], transaction[4], transaction[5] or ""]
+    
     def refresh_transactions(self):
-        """Refresh transactions display"""
-        # Clear existing transactions
-        for item in self.transactions_tree.get_children():
-            self.transactions_tree.delete(item)
-            
-        transactions = models.get_transactions()
-        self.all_transactions = transactions
-        
-        for transaction in transactions:
-            self.transactions_tree.insert('', 'end', values=transaction)
-        
-        self.transaction_count_label.config(text=f"Transactions: {len(self.transactions_tree.get_children())}")
-        
-        # Update items combo
-        items = models.view_items()
-        item_names = [item[1] for item in items]
-        self.item_combo['values'] = item_names
+        """Refresh transactions display in the background; only the rows on screen are read"""
+        if self.search_term:
+            self._search(keep_position=True)
+        self._reload()
+    
+    def _reload(self):
+        viewport = self.transactions_tree.viewport
+        first = viewport.first if viewport.source is self.history else 0
+        self.tasks.submit(self._load, self.history, first, viewport.height,
+                          key='transactions.refresh', label="Loading transactions",
+                          on_done=self._show_loaded, on_error=self._on_load_error)
+    
+    @staticmethod
+    def _load(history, first, height):
+        """Worker thread: read the rows on screen and the item names"""
+        item_ids = {}
+        for item in models.view_items():
+            item_ids.setdefault(item[1], item[0])
+        return history.load(first, height), item_ids
+    
+    def _show_loaded(self, loaded):
+        """Show what refresh_transactions() read"""
+        rows, self.item_ids = loaded
+        if self.transactions_tree.viewport.source is self.history:
+            self.transactions_tree.install(rows)
+            self._update_count()
+        else:
+            # A search is shown; keep the rows for when it is cleared
+            self.history.install(rows)
+        self.item_combo['values'] = list(self.item_ids)
+    
+    def _on_load_error(self, error):
+        self.update_status_bar(f"❌ Failed to load transactions: {error}")
+        messagebox.showerror("Error", f"Failed to load transactions: {error}")
     
     def on_double_click(self, event):
         """Handle double click on transaction"""
@@ -6,14 +6,16 @@ from auth import auth
 from database import models
 from ui.dialogs import AddUserDialog
 from ui.theme import SearchBar, Tooltip
+from ui.virtual_tree import VirtualTreeview, ListSource
 
 
 class UsersTab:
     """Users management tab class (admin only)"""
     
-    def __init__(self, notebook, status_bar_updater, current_user, root):
+    def __init__(self, notebook, status_bar_updater, tasks, current_user, root):
         self.notebook = notebook
         self.update_status_bar = status_bar_updater
+        self.tasks = tasks
         self.current_user = current_user
         self.root = root
         self.all_users = []  # Store all users for filtering
@@ -77,7 +79,7 @@ class UsersTab:
         
         # Treeview for users
         columns = ('ID', 'Username', 'Email', 'Role', 'Created At')
-        self.users_tree = ttk.Treeview(right_frame, columns=columns, show='headings', height=20)
+        self.users_tree = VirtualTreeview(right_frame, columns=columns, show='headings', height=20)
         
         self.users_tree.heading('ID', text='ID')
         self.users_tree.heading('Username', text='Username')
@@ -119,9 +121,7 @@ class UsersTab:
             self.refresh_users()
             return
         
-        for item in self.users_tree.get_children():
-            self.users_tree.delete(item)
-        
+        matches = []
         for user in self.all_users:
             user_id, username, email, role, created_at = user
             
@@ -131,9 +131,10 @@ class UsersTab:
                 search_term in str(created_at).lower() or
                 search_term in str(user_id)):
                 
-                self.users_tree.insert('', 'end', values=user)
+                matches.append(user)
         
-        self.user_count_label.config(text=f"Users: {len(self.users_tree.get_children())}")
+        self.users_tree.set_source(ListSource(matches))
+        self.user_count_label.config(text=f"Users: {len(matches)}")
     
     def _clear_search(self):
         """Clear search and refresh users"""
@@ -208,18 +209,20 @@ class UsersTab:
         self.update_status_bar("✓ User management refreshed")
     
     def refresh_users(self):
-        """Refresh users display"""
-        # Clear existing users
-        for item in self.users_tree.get_children():
-            self.users_tree.delete(item)
-            
-        users = auth.get_all_users()
+        """Refresh users display; they are read in the background"""
+        self.tasks.submit(auth.get_all_users, key='users.refresh', label="Loading users",
+                          on_done=self._show_users, on_error=self._on_load_error)
+    
+    def _show_users(self, users):
+        """Show what refresh_users() read"""
         self.all_users = users
+        self.users_tree.show_rows(users)
         
-        for user in users:
-            self.users_tree.insert('', 'end', values=user)
-        
-        self.user_count_label.config(text=f"Users: {len(self.users_tree.get_children())}")
+        self.user_count_label.config(text=f"Users: {len(users)}")
+    
+    def _on_load_error(self, error):
+        self.update_status_bar(f"❌ Failed to load users: {error}")
+        messagebox.showerror("Error", f"Failed to load users: {error}")
     
     def on_double_click(self, event):
         """Handle double click on user"""
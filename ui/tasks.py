@@ -0,0 +1,233 @@
+"""Background tasks for the UI.
+
+Tk may only be used from the main thread, so database work started by a
+tab (loading a table, generating a report, exporting) runs on a small
+thread pool, and its result comes back through a queue that the main
+loop polls with after(). on_done and on_error callbacks always run on
+the main thread and may update widgets.
+
+Tasks submitted with a key are coalesced: while a task with that key is
+running, a new request for the same key waits behind it, replacing any
+request already waiting. A double-clicked Refresh therefore reads the
+table at most twice, and the last read always starts after the last
+click. Usage::
+
+    self.tasks.submit(models.get_suppliers, key='suppliers.refresh',
+                      label="Loading suppliers", on_done=self.show_suppliers)
+"""
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import config
+from utils import telemetry
+
+_local = threading.local()
+
+
+class TaskCancelled(Exception):
+    """Raised by Task.check() once the task was cancelled"""
+
+
+def current_task():
+    """The Task running on this worker thread, or None elsewhere"""
+    return getattr(_local, 'task', None)
+
+
+class Task:
+    """One piece of background work and what to do with its result"""
+
+    def __init__(self, func, args=(), kwargs=None, key=None, label=None, on_done=None, on_error=None,
+                 on_cancel=None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.key = key
+        self.label = label
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Drop the result; work that calls check() stops at its next check"""
+        self._cancelled.set()
+
+    def check(self):
+        """Raise TaskCancelled if the task was cancelled; call it from long loops"""
+        if self.cancelled:
+            raise TaskCancelled(self.label or self.key or "task")
+
+    def run(self):
+        """Run the work on the calling thread"""
+        _local.task = self
+        try:
+            return self.func(*self.args, **self.kwargs)
+        finally:
+            _local.task = None
+
+
+class TaskRunner:
+    """Runs Tasks on a thread pool and hands their results to the Tk main loop.
+
+    root is any widget with after(); the results queue is only polled while
+    tasks are outstanding. on_busy, if given, is called on the main thread
+    with the labels of the tasks still to finish whenever they change, e.g.
+    to show a busy indicator in the status bar.
+    """
+
+    def __init__(self, root, workers=None, poll_ms=None, on_busy=None):
+        self.root = root
+        self.workers = workers or config.TASK_WORKERS
+        self.poll_ms = poll_ms or config.TASK_POLL_MS
+        self.on_busy = on_busy
+        self._executor = None
+        self._results = queue.Queue()
+        self._pending = {}  # Task -> None, in submission order
+        self._running = {}  # key -> Task on the pool
+        self._waiting = {}  # key -> Task to start when the running one is done
+        self._poll_id = None
+
+    def submit(self, func, *args, key=None, label=None, on_done=None, on_error=None, on_cancel=None, **kwargs):
+        """Run func(*args, **kwargs) on a worker thread.
+
+        on_done(result) or on_error(exception) is then called on the main
+        thread, unless the task was cancelled; cancel() calls on_cancel()
+        instead. Without on_error, failures are recorded as telemetry and
+        reported like any Tk callback error. Returns the Task.
+        """
+        task = Task(func, args, kwargs, key=key, label=label, on_done=on_done, on_error=on_error,
+                    on_cancel=on_cancel)
+        if key is not None and key in self._running:
+            replaced = self._waiting.pop(key, None)
+            if replaced is not None:
+                replaced.cancel()
+                self._pending.pop(replaced, None)
+            self._waiting[key] = task
+        else:
+            self._start(task)
+        self._pending[task] = None
+        self._busy_changed()
+        self._schedule_poll()
+        return task
+
+    def call_soon(self, func, *args):
+        """Run func(*args) on the main thread; safe to call from worker threads.
+
+        Calls made by a task, e.g. progress updates, are dropped once it is
+        cancelled.
+        """
+        self._results.put((None, func, (current_task(), args)))
+
+    def cancel(self, key=None):
+        """Cancel the tasks with a key, or every task when key is None"""
+        for task in list(self._pending):
+            if task.cancelled or (key is not None and task.key != key):
+                continue
+            task.cancel()
+            if self._waiting.get(task.key) is task:
+                del self._waiting[task.key]
+                del self._pending[task]
+            if task.on_cancel:
+                self._call(task.on_cancel)
+        self._busy_changed()
+
+    def busy(self):
+        """Labels of the tasks still to finish, oldest first"""
+        return [task.label or task.key or "Working" for task in self._pending if not task.cancelled]
+
+    def shutdown(self):
+        """Cancel everything and stop the workers without waiting for them"""
+        self.cancel()
+        if self._poll_id is not None:
+            try:
+                self.root.after_cancel(self._poll_id)
+            except Exception:
+                pass  # root already destroyed
+            self._poll_id = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _start(self, task):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ui-task")
+        if task.key is not None:
+            self._running[task.key] = task
+        self._executor.submit(self._work, task)
+
+    def _work(self, task):
+        """Worker thread: run the task and queue its outcome"""
+        if task.cancelled:
+            self._results.put((task, None, TaskCancelled(task.label or task.key or "task")))
+            return
+        try:
+            result = task.run()
+        except BaseException as e:
+            self._results.put((task, None, e))
+        else:
+            self._results.put((task, result, None))
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        """Main thread: deliver finished tasks and queued calls"""
+        self._poll_id = None
+        finished = False
+        while True:
+            try:
+                task, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if task is None:
+                # call_soon(): result is the function, error the calling task and arguments
+                caller, args = error
+                if caller is None or not caller.cancelled:
+                    self._call(result, *args)
+                continue
+
+            finished = True
+            self._pending.pop(task, None)
+            if task.key is not None and self._running.get(task.key) is task:
+                del self._running[task.key]
+                follow_up = self._waiting.pop(task.key, None)
+                if follow_up is not None:
+                    self._start(follow_up)
+
+            if task.cancelled:
+                continue
+            if error is None:
+                if task.on_done:
+                    self._call(task.on_done, result)
+            elif task.on_error:
+                self._call(task.on_error, error)
+            else:
+                self._report(task, error)
+
+        if finished:
+            self._busy_changed()
+        if self._pending:
+            self._schedule_poll()
+
+    def _call(self, func, *args):
+        """Run a callback, reporting its errors without stopping the poll"""
+        try:
+            func(*args)
+        except Exception:
+            self.root.report_callback_exception(*sys.exc_info())
+
+    def _report(self, task, error):
+        telemetry.event("ui.task_failed", telemetry.ERROR, key=task.key, label=task.label,
+                        type=type(error).__name__, message=str(error))
+        self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+    def _busy_changed(self):
+        if self.on_busy:
+            self._call(self.on_busy, self.busy())
@@ -101,10 +101,18 @@ class StatusBadge:
 
 
 class SearchBar:
-    """Search bar widget with clear button"""
+    """Search bar widget with clear button.
+
+    search_callback(term) runs once typing pauses for delay_ms
+    (config.SEARCH_DEBOUNCE_MS by default), not on every key.
+    """
     
-    def __init__(self, parent, placeholder="Search...", search_callback=None):
+    def __init__(self, parent, placeholder="Search...", search_callback=None, delay_ms=None):
         self.frame = ttk.Frame(parent)
+        self.placeholder = placeholder
+        self.delay_ms = config.SEARCH_DEBOUNCE_MS if delay_ms is None else delay_ms
+        self._pending = None
+        self._searched = ""
         
         self.search_var = tk.StringVar()
         self.search_var.set(placeholder)
@@ -125,28 +133,45 @@ class SearchBar:
         self.search_entry.bind("<FocusIn>", self.clear_placeholder)
         self.search_entry.bind("<FocusOut>", self.restore_placeholder)
     
+    def get(self):
+        """The search term, without the placeholder"""
+        value = self.search_var.get()
+        return "" if value == self.placeholder else value.strip()
+    
     def on_search(self, event=None):
-        if self.search_callback:
-            self.search_callback(self.search_var.get())
+        """Search once typing pauses"""
+        if self._pending is not None:
+            self.frame.after_cancel(self._pending)
+        self._pending = self.frame.after(self.delay_ms, self._run_search)
+    
+    def _run_search(self):
+        self._pending = None
+        term = self.get()
+        # Keys that do not change the text (arrows, Shift) start no search
+        if term != self._searched:
+            self._searched = term
+            if self.search_callback:
+                self.search_callback(term)
     
     def clear_search(self):
+        if self._pending is not None:
+            self.frame.after_cancel(self._pending)
+            self._pending = None
         self.search_var.set("")
+        self._searched = ""
         if self.search_callback:
             self.search_callback("")
     
     def clear_placeholder(self, event=None):
-        if self.search_var.get() == self.search_var.get():  # placeholder text
+        if self.search_var.get() == self.placeholder:
             self.search_var.set("")
     
     def restore_placeholder(self, event=None):
         if not self.search_var.get():
-            self.search_var.set("Search...")
+            self.search_var.set(self.placeholder)
     
     def pack(self, **kwargs):
         self.frame.pack(**kwargs)
     
-    def get(self):
-        return self.search_var.get()
-    
     def set(self, value):
         self.search_var.set(value)
@@ -0,0 +1,478 @@
+"""Virtual-scrolling table shared by the tabs.
+
+A VirtualTreeview only holds the rows that fit on screen and swaps their
+values as it scrolls. Rows come from a source: ListSource wraps rows
+already in memory, QuerySource reads them by position from a model
+function such as models.view_items_window, and KeysetSource follows page
+cursors such as those of models.get_transactions_page. Refreshing or scrolling costs
+one screenful of rows, whatever the size of the table, and TreeReconciler
+only touches the items whose row appeared, changed, moved or went away.
+"""
+from bisect import bisect_left
+from collections import OrderedDict
+from tkinter import ttk
+import config
+
+
+class ListSource:
+    """Rows held in memory, e.g. a small table or search results"""
+
+    def __init__(self, rows=()):
+        self.data = list(rows)
+
+    def __len__(self):
+        return len(self.data)
+
+    def refresh(self):
+        """Nothing to reload; replace the source to change its rows"""
+
+    def rows(self, offset, limit):
+        """Get up to limit rows starting at position offset"""
+        return self.data[offset:offset + limit]
+
+
+class QuerySource:
+    """Rows read from the database a block at a time.
+
+    count() returns the number of rows and fetch(offset, limit) the rows at
+    those positions. The last few blocks of config.TABLE_BLOCK_SIZE rows are
+    cached, so scrolling line by line does not query for every line.
+    format, if given, turns a fetched row into display values.
+    """
+
+    CACHED_BLOCKS = 4
+
+    def __init__(self, count, fetch, format=None, block_size=None):
+        self.count = count
+        self.fetch = fetch
+        self.format = format
+        self.block_size = block_size or config.TABLE_BLOCK_SIZE
+        self._blocks = OrderedDict()
+        self._total = None
+
+    def __len__(self):
+        if self._total is None:
+            self._total = self.count()
+        return self._total
+
+    def refresh(self):
+        """Recount and drop cached rows, e.g. after the table changed"""
+        self._total = None
+        self._blocks.clear()
+
+    def load(self, offset, limit):
+        """Read the row count and the blocks around a window, leaving the cache alone.
+
+        Safe to call on a worker thread; hand the result to install() on
+        the main thread to show it without touching the database there.
+        """
+        return self._load_blocks(offset, limit, self._read)
+
+    def _load_blocks(self, offset, limit, read):
+        total = self.count()
+        offset = max(0, min(offset, total - limit))
+        end = min(offset + limit, total)
+        numbers = range(offset // self.block_size, (end - 1) // self.block_size + 1) if end else ()
+        return total, {number: read(number) for number in numbers}
+
+    def install(self, loaded):
+        """Replace the count and cached rows with what load() read"""
+        self._total, blocks = loaded
+        self._blocks = OrderedDict(blocks)
+
+    def _read(self, number):
+        block = self.fetch(number * self.block_size, self.block_size)
+        if self.format:
+            block = [self.format(row) for row in block]
+        return block
+
+    def _block(self, number):
+        block = self._blocks.get(number)
+        if block is None:
+            block = self._read(number)
+            self._blocks[number] = block
+            if len(self._blocks) > self.CACHED_BLOCKS:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(number)
+        return block
+
+    def rows(self, offset, limit):
+        """Get up to limit rows starting at position offset"""
+        rows = []
+        number, start = divmod(offset, self.block_size)
+        while len(rows) < limit:
+            block = self._block(number)
+            rows.extend(block[start:start + limit - len(rows)])
+            if len(block) < self.block_size:
+                break
+            number += 1
+            start = 0
+        return rows
+
+
+class KeysetSource(QuerySource):
+    """Rows read a block at a time by following keyset page cursors.
+
+    page(after, limit) returns (rows, next_after) like
+    models.get_transactions_page(), and locate(offset) the cursor of the
+    page starting at that position, like models.get_transactions_cursor().
+    The cursor at every block boundary reached is kept, so a block next to
+    one already read is a single index seek however deep it is. Only a jump
+    more than MAX_WALK blocks past every known boundary locates its cursor
+    by position.
+    """
+
+    MAX_WALK = 4
+
+    def __init__(self, count, page, locate, format=None, block_size=None):
+        super().__init__(count, None, format, block_size)
+        self.page = page
+        self.locate = locate
+        self._cursors = {0: None}
+
+    def refresh(self):
+        """Recount and drop cached rows and cursors, e.g. after the table changed"""
+        super().refresh()
+        self._cursors = {0: None}
+
+    def load(self, offset, limit):
+        """Like QuerySource.load(); the cursors found are kept by install()"""
+        cursors = dict(self._cursors)
+        total, blocks = self._load_blocks(offset, limit, lambda number: self._walk(number, cursors))
+        return total, blocks, cursors
+
+    def install(self, loaded):
+        """Replace the count, cached rows and cursors with what load() read"""
+        total, blocks, cursors = loaded
+        super().install((total, blocks))
+        self._cursors = cursors
+
+    def _read(self, number):
+        return self._walk(number, self._cursors)
+
+    def _walk(self, number, cursors):
+        """Read a block, paging forward from the nearest known cursor before it"""
+        start = next((n for n in range(number, max(number - self.MAX_WALK, 0) - 1, -1) if n in cursors), None)
+        if start is None:
+            after = self.locate(number * self.block_size)
+            if after is None:
+                return []
+            start = number
+        else:
+            after = cursors[start]
+
+        block = []
+        for n in range(start, number + 1):
+            if n and after is None:
+                # The history ended before this block
+                return []
+            cursors[n] = after
+            block, after = self.page(after, self.block_size)
+        if after is not None:
+            cursors[number + 1] = after
+        if self.format:
+            block = [self.format(row) for row in block]
+        return block
+
+
+def _increasing_run(values):
+    """One longest strictly increasing subsequence of values"""
+    tails = []
+    tail_index = []
+    previous = [None] * len(values)
+    for i, value in enumerate(values):
+        n = bisect_left(tails, value)
+        if n == len(tails):
+            tails.append(value)
+            tail_index.append(i)
+        else:
+            tails[n] = value
+            tail_index[n] = i
+        previous[i] = tail_index[n - 1] if n else None
+
+    run = []
+    i = tail_index[-1] if tail_index else None
+    while i is not None:
+        run.append(values[i])
+        i = previous[i]
+    return run[::-1]
+
+
+class TreeReconciler:
+    """Brings a Treeview's top-level rows to a new list with the fewest Tk calls.
+
+    Each item's iid is its row key, so rows that stay keep their item and
+    with it their selection and focus. reconcile() deletes the rows that
+    are gone in one call, inserts new rows, updates changed values, and
+    moves only rows outside the longest run already in order. The values
+    last shown are kept here, so nothing is read back from Tk.
+    """
+
+    def __init__(self, tree, key=None):
+        self.tree = tree
+        self.key = key or (lambda row: row[0])
+        self.order = []
+        self.shown = {}
+
+    def _iids(self, rows):
+        """Item ids for rows; repeated keys get a #n suffix"""
+        iids = []
+        seen = {}
+        for row in rows:
+            iid = str(self.key(row))
+            if iid in seen:
+                seen[iid] += 1
+                iid = f"{iid}#{seen[iid]}"
+            else:
+                seen[iid] = 0
+            iids.append(iid)
+        return iids
+
+    def reconcile(self, rows):
+        """Show rows in order; returns counts of the Tk changes made"""
+        rows = [tuple(row) for row in rows]
+        iids = self._iids(rows)
+        changes = {'inserted': 0, 'updated': 0, 'moved': 0, 'deleted': 0}
+
+        wanted = set(iids)
+        gone = [iid for iid in self.order if iid not in wanted]
+        if gone:
+            self.tree.delete(*gone)
+            for iid in gone:
+                del self.shown[iid]
+            changes['deleted'] = len(gone)
+
+        # Rows that keep their relative order stay put; the rest are placed
+        # from the end backwards, each just before its successor
+        current = [iid for iid in self.order if iid in wanted]
+        position = {iid: n for n, iid in enumerate(current)}
+        stay = {current[n] for n in _increasing_run([position[iid] for iid in iids if iid in position])}
+
+        placed_at = None  # index of the row placed in the previous step, if any
+        for i in range(len(iids) - 1, -1, -1):
+            iid, values = iids[i], rows[i]
+            if iid in stay:
+                placed_at = None
+            else:
+                if iid in self.shown:
+                    old = current.index(iid)
+                    current.pop(old)
+                    if placed_at is not None and old < placed_at:
+                        placed_at -= 1
+                if i == len(iids) - 1:
+                    target = len(current)
+                elif placed_at is not None:
+                    target = placed_at
+                else:
+                    target = current.index(iids[i + 1])
+                current.insert(target, iid)
+                placed_at = target
+
+                if iid in self.shown:
+                    self.tree.move(iid, '', target)
+                    changes['moved'] += 1
+                else:
+                    self.tree.insert('', target, iid=iid, values=values)
+                    self.shown[iid] = values
+                    changes['inserted'] += 1
+                    continue
+
+            if self.shown[iid] != values:
+                self.tree.item(iid, values=values)
+                self.shown[iid] = values
+                changes['updated'] += 1
+
+        self.order = iids
+        return changes
+
+
+class Viewport:
+    """The rows of a source that are on screen, and which rows are selected.
+
+    This is the Tk-free half of VirtualTreeview. Selection is kept by row
+    key (the first value, normally the id), so it survives scrolling and
+    refreshes that move rows around.
+    """
+
+    def __init__(self, source, height, key=None):
+        self.source = source
+        self.height = max(1, height)
+        self.first = 0
+        self.key = key or (lambda row: row[0])
+        self.selected = set()
+
+    @property
+    def total(self):
+        return len(self.source)
+
+    def clamp(self):
+        """Keep the window inside the rows the source has"""
+        self.first = max(0, min(self.first, self.total - self.height))
+
+    def scroll(self, lines):
+        """Move the window by a number of rows"""
+        self.first += lines
+        self.clamp()
+
+    def scroll_to(self, fraction):
+        """Move the window to a position given as a fraction of all rows"""
+        self.first = int(float(fraction) * self.total)
+        self.clamp()
+
+    def rows(self):
+        """Get the rows on screen"""
+        return self.source.rows(self.first, self.height)
+
+    def fractions(self):
+        """(first, last) visible fractions, as a scrollbar's set() expects"""
+        total = self.total
+        if not total:
+            return 0.0, 1.0
+        return self.first / total, min(1.0, (self.first + self.height) / total)
+
+
+class VirtualTreeview(ttk.Treeview):
+    """Treeview that only materializes the visible rows of a source.
+
+    Use it like a Treeview with show='headings': selection(), item() and
+    bindings work on the visible rows, whose iids are their row keys. Give
+    it rows with set_source() or show_rows(), and call refresh() after the
+    data changed; the scroll position and the selection are kept, and only
+    the rows that differ are touched. Attach a scrollbar as usual, through
+    yview and yscrollcommand.
+    """
+
+    def __init__(self, master, source=None, key=None, yscrollcommand=None, **kwargs):
+        kwargs.setdefault('show', 'headings')
+        super().__init__(master, **kwargs)
+        self.viewport = Viewport(source or ListSource(), int(self.cget('height')), key)
+        self._yscrollcommand = yscrollcommand
+        self.reconciler = TreeReconciler(self, self.viewport.key)
+        self.last_changes = {}
+        self._rows = {}
+        self._rendered_selection = ()
+
+        self.bind('<Configure>', self._on_resize, add='+')
+        self.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.bind(sequence, self._on_wheel)
+        self.bind('<Up>', lambda e: self._on_arrow(-1))
+        self.bind('<Down>', lambda e: self._on_arrow(1))
+        self.bind('<Prior>', lambda e: self._scroll(-self.viewport.height))
+        self.bind('<Next>', lambda e: self._scroll(self.viewport.height))
+        self.bind('<Home>', lambda e: self._scroll(-self.viewport.total))
+        self.bind('<End>', lambda e: self._scroll(self.viewport.total))
+
+    def configure(self, cnf=None, **kw):
+        if 'yscrollcommand' in kw:
+            self._yscrollcommand = kw.pop('yscrollcommand')
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def __len__(self):
+        return self.viewport.total
+
+    def row_index(self, iid):
+        """Position in the source of the row shown by a visible item"""
+        return self.viewport.first + self.reconciler.order.index(iid)
+
+    def set_source(self, source):
+        """Show another source's rows from the top"""
+        self.viewport.source = source
+        self.viewport.first = 0
+        self.viewport.selected = set()
+        self.render()
+
+    def show_rows(self, rows):
+        """Show rows held in memory, keeping the scroll position and selection"""
+        self.viewport.source = ListSource(rows)
+        self.refresh()
+
+    def refresh(self):
+        """Reload the source, keeping the scroll position and selection"""
+        self.viewport.source.refresh()
+        self.viewport.clamp()
+        self.render()
+
+    def install(self, loaded):
+        """Show rows a QuerySource's load() read in the background"""
+        self.viewport.source.install(loaded)
+        self.viewport.clamp()
+        self.render()
+
+    def render(self):
+        """Put the rows of the current window into the visible items"""
+        rows = self.viewport.rows()
+        self.last_changes = self.reconciler.reconcile(rows)
+        self._rows = dict(zip(self.reconciler.order, rows))
+
+        selected = tuple(iid for iid, row in self._rows.items() if self.viewport.key(row) in self.viewport.selected)
+        if selected != self.selection():
+            self._rendered_selection = selected
+            self.selection_set(selected)
+
+        if self._yscrollcommand:
+            self._yscrollcommand(*self.viewport.fractions())
+
+    def yview(self, *args):
+        if not args:
+            return self.viewport.fractions()
+        if args[0] == 'moveto':
+            self.viewport.scroll_to(args[1])
+        elif args[0] == 'scroll':
+            lines = int(args[1])
+            if args[2] == 'pages':
+                lines *= self.viewport.height
+            self.viewport.scroll(lines)
+        self.render()
+
+    def yview_moveto(self, fraction):
+        self.yview('moveto', fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview('scroll', number, what)
+
+    def _scroll(self, lines):
+        self.viewport.scroll(lines)
+        self.render()
+        return "break"
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            return self._scroll(-3)
+        return self._scroll(3)
+
+    def _on_arrow(self, step):
+        """Scroll when the arrow keys move past the first or last visible row"""
+        order = self.reconciler.order
+        if not order or self.focus() != order[0 if step < 0 else -1]:
+            return None
+
+        self.viewport.scroll(step)
+        self.render()
+        edge = self.reconciler.order[0 if step < 0 else -1]
+        self.viewport.selected = {self.viewport.key(self._rows[edge])}
+        self.selection_set(edge)
+        self.focus(edge)
+        return "break"
+
+    def _on_select(self, event=None):
+        """Remember the selected rows by key"""
+        current = self.selection()
+        if current == self._rendered_selection:
+            # Selection set by render(), not by the user
+            return
+        self._rendered_selection = current
+        self.viewport.selected = {self.viewport.key(self._rows[iid]) for iid in current}
+
+    def _on_resize(self, event):
+        """Show as many rows as fit in the new height"""
+        row_height = int(ttk.Style(self).lookup('Treeview', 'rowheight') or 20)
+        # One row's worth of space goes to the headings
+        height = max(1, event.height // row_height - 1)
+        if height != self.viewport.height:
+            self.viewport.height = height
+            self.viewport.clamp()
+            self.render()
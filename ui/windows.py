@@ -1,4 +1,5 @@
 """Main application window for Inventory Management System"""
+import importlib
 from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, messagebox
@@ -7,34 +8,21 @@ import config
 from database import models
 from ui.dialogs import AddUserDialog
 from ui.menu import MenuManager
-from ui.tabs.inventory_tab import InventoryTab
-from ui.tabs.categories_tab import CategoriesTab
-from ui.tabs.suppliers_tab import SuppliersTab
-from ui.tabs.transactions_tab import TransactionsTab
-from ui.tabs.users_tab import UsersTab
-from ui.tabs.reports_tab import ReportsTab
+from ui.tasks import TaskRunner
+from utils import telemetry
 
-# region agent log
-import os as _agent_os
-_DEBUG_LOG_PATH = _agent_os.path.join(_agent_os.path.dirname(_agent_os.path.abspath(__file__)), "..", "debug-31c49c.log")
 
-def _agent_log(hypothesisId: str, location: str, message: str, data: dict | None = None, runId: str = "pre-fix"):
-    try:
-        import json, time
-        payload = {
-            "sessionId": "31c49c",
-            "runId": runId,
-            "hypothesisId": hypothesisId,
-            "location": location,
-            "message": message,
-            "data": data or {},
-            "timestamp": int(time.time() * 1000),
-        }
-        with open(_DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
-    except Exception:
-        pass
-# endregion
+# Notebook tabs in display order: (module, class, label, admin only).
+# Each tab module is imported and built the first time its tab is shown.
+TABS = [
+    ('ui.tabs.inventory_tab', 'InventoryTab', "📦 Inventory", False),
+    ('ui.tabs.categories_tab', 'CategoriesTab', "📂 Categories", False),
+    ('ui.tabs.suppliers_tab', 'SuppliersTab', "🏭 Suppliers", False),
+    ('ui.tabs.transactions_tab', 'TransactionsTab', "💳 Transactions", False),
+    ('ui.tabs.users_tab', 'UsersTab', "👥 Users", True),
+    ('ui.tabs.reports_tab', 'ReportsTab', "📊 Reports", True),
+    ('ui.tabs.diagnostics_tab', 'DiagnosticsTab', "🩺 Diagnostics", True),
+]
 
 
 class InventoryManagementGUI:
@@ -63,33 +51,65 @@ class InventoryManagementGUI:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
         
-        # Create status bar
+        # Create status bar, with a busy indicator for background work
+        status_frame = tk.Frame(self.root, bd=1, relief=tk.SUNKEN)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
         self.status_bar = tk.Label(
-            self.root, 
+            status_frame, 
             text=f"Logged in as: {user['username']} ({user['role']})", 
-            bd=1, 
-            relief=tk.SUNKEN, 
             anchor=tk.W
         )
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.cancel_button = ttk.Button(status_frame, text="✕ Cancel", width=10, command=self._cancel_tasks)
+        self.busy_label = tk.Label(status_frame, text="", anchor=tk.E, fg=config.COLOR_INFO)
+        
+        # Database work started by the tabs runs in the background
+        self.tasks = TaskRunner(self.root, on_busy=self._show_busy)
+        self.root.bind('<Destroy>', self._on_destroy, add='+')
         
         # Create tabs
         self._create_tabs(user)
     
     def _create_tabs(self, user):
-        """Create all application tabs based on user role"""
-        _agent_log("H-tabs", "ui/windows.py:_create_tabs", "Creating tabs", {"role": user.get("role")})
-        # Standard tabs available to all users
-        InventoryTab(self.notebook, self._update_status)
-        CategoriesTab(self.notebook, self._update_status)
-        SuppliersTab(self.notebook, self._update_status)
-        TransactionsTab(self.notebook, self._update_status)
-        
-        # Admin-only tabs
-        if user['role'] == config.ROLE_ADMIN:
-            _agent_log("H-tabs", "ui/windows.py:_create_tabs", "Creating admin tabs")
-            UsersTab(self.notebook, self._update_status, current_user=user, root=self.root)
-            ReportsTab(self.notebook, self._update_status)
+        """Add a placeholder for every tab the user's role may see.
+
+        Only the first tab is built right away; the others are imported and
+        built when first selected, see _on_tab_changed().
+        """
+        telemetry.event("ui.create_tabs", role=user.get("role"))
+        self.tabs = {}
+        self._pending_tabs = {}
+        for module_name, class_name, label, admin_only in TABS:
+            if admin_only and user['role'] != config.ROLE_ADMIN:
+                continue
+            placeholder = ttk.Frame(self.notebook)
+            self.notebook.add(placeholder, text=label)
+            self._pending_tabs[str(placeholder)] = (module_name, class_name)
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._on_tab_changed()
+    
+    def _on_tab_changed(self, event=None):
+        """Build the selected tab the first time it is shown"""
+        placeholder = self.notebook.select()
+        spec = self._pending_tabs.pop(placeholder, None)
+        if spec is None:
+            return
+        
+        module_name, class_name = spec
+        tab_class = getattr(importlib.import_module(module_name), class_name)
+        kwargs = {'tasks': self.tasks}
+        if class_name == 'UsersTab':
+            kwargs.update(current_user=self.current_user, root=self.root)
+        index = self.notebook.index(placeholder)
+        
+        # The tab adds itself at the end; move it into the placeholder's slot
+        tab = tab_class(self.notebook, self._update_status, **kwargs)
+        self.notebook.insert(index, tab.frame)
+        self.notebook.select(tab.frame)
+        self.notebook.forget(placeholder)
+        self.root.nametowidget(placeholder).destroy()
+        self.tabs[class_name] = tab
     
     def _update_status(self, message):
         """Update status bar message
@@ -99,6 +119,27 @@ class InventoryManagementGUI:
         """
         self.status_bar.config(text=message)
     
+    def _show_busy(self, labels):
+        """Show what is running in the background, with a button to cancel it"""
+        if labels:
+            more = f" (+{len(labels) - 1} more)" if len(labels) > 1 else ""
+            self.busy_label.config(text=f"⏳ {labels[0]}...{more}")
+            self.cancel_button.pack(side=tk.RIGHT, padx=2)
+            self.busy_label.pack(side=tk.RIGHT, padx=5)
+        else:
+            self.busy_label.pack_forget()
+            self.cancel_button.pack_forget()
+    
+    def _cancel_tasks(self):
+        """Cancel all background work"""
+        self.tasks.cancel()
+        self._update_status("✕ Cancelled")
+    
+    def _on_destroy(self, event):
+        """Stop background work when the window closes"""
+        if event.widget is self.root:
+            self.tasks.shutdown()
+    
     def _logout(self):
         """Handle logout"""
         self.root.destroy()
@@ -923,7 +964,7 @@ Features:
                     return
                 
             # Add transaction (this will automatically update inventory)
-            success, message = models.add_transaction(item_id, trans_type, quantity, date, notes, selling_price)
+            success, message, new_quantity = models.add_transaction(item_id, trans_type, quantity, date, notes, selling_price)
             
             if success:
                 self.clear_transaction_form()
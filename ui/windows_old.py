@@ -895,7 +895,7 @@ Features:
                     return
                 
             # Add transaction (this will automatically update inventory)
-            success, message = models.add_transaction(item_id, trans_type, quantity, date, notes, selling_price)
+            success, message, new_quantity = models.add_transaction(item_id, trans_type, quantity, date, notes, selling_price)
             
             if success:
                 self.clear_transaction_form()
@@ -0,0 +1,286 @@
+"""In-memory word-prefix search over table rows.
+
+SearchIndex splits a few text fields of each row into lower-case words.
+The distinct words are kept sorted, so all words starting with a search
+term are one bisect away, and each word maps to the rows that contain
+it. A query matches the rows that have, for every term, a word starting
+with that term: "blu bol" finds "Blue bolt M6". A query equal to a row's
+key (e.g. an id) finds that row as well.
+
+Build the index once from a full listing, then keep it current with
+add() and remove() as rows change. search() returns the matching rows in
+the table's order; a search that matches many rows stops once it has
+found enough to show.
+
+Internally each row has a slot, a small int whose order is the result
+order, so ordering matches is sorting ints. Slots are spaced out; a new
+row takes the midpoint between its neighbours, and when there is no
+room left the rows around it are spread out again.
+"""
+import re
+from bisect import bisect_left
+from itertools import islice
+
+_WORD = re.compile(r'\w+')
+
+
+def words(*texts):
+    """Distinct lower-case words of texts; None is skipped"""
+    return set(_WORD.findall(" ".join(str(text) for text in texts if text is not None).lower()))
+
+
+class SearchIndex:
+    """Word-prefix index over rows.
+
+    fields(row) gives the texts to search, key(row) identifies a row
+    (default row[0]) and order(row) sorts the results (default the key),
+    largest first with descending=True.
+    """
+
+    # Distance between the slots of consecutive rows after a build
+    SLOT_GAP = 1 << 10
+    # Matches are sorted when there are fewer than 1/SORT_FRACTION of all
+    # rows; more are picked by walking the rows in order, which stops early
+    SORT_FRACTION = 16
+    # Testing one row's words costs about WALK_COST times handling one slot
+    # in a set operation. When the first limit matches should turn up
+    # sooner than collecting every match would take, search() tests the
+    # rows in order instead, and gives up once that took as long
+    WALK_COST = 8
+
+    def __init__(self, fields, key=None, order=None, descending=False, rows=()):
+        self.fields = fields
+        self.key = key or (lambda row: row[0])
+        self.order = order or self.key
+        self.descending = descending
+        self._slots = {}  # key -> slot
+        self._rows = {}  # slot -> row
+        self._words = {}  # slot -> words of the row
+        self._postings = {}  # word -> slots of the rows containing it
+        self._vocabulary = []  # distinct words, sorted
+        self._ordered = []  # (order(row), key), in result order
+        self._slot_order = []  # slots, ascending; parallel to _ordered
+
+        by_key = {self.key(row): row for row in rows}
+        self._ordered = sorted(((self.order(row), key) for key, row in by_key.items()), reverse=descending)
+        postings = self._postings
+        for n, (_, key) in enumerate(self._ordered):
+            slot = n * self.SLOT_GAP
+            row = by_key[key]
+            self._slots[key] = slot
+            self._rows[slot] = row
+            row_words = self._words[slot] = words(*fields(row))
+            for word in row_words:
+                slots = postings.get(word)
+                if slots is None:
+                    postings[word] = {slot}
+                else:
+                    slots.add(slot)
+        self._slot_order = list(range(0, len(self._ordered) * self.SLOT_GAP, self.SLOT_GAP))
+        self._vocabulary = sorted(postings)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def get(self, key):
+        """The row with this key, or None"""
+        slot = self._slots.get(key)
+        return None if slot is None else self._rows[slot]
+
+    def _position(self, order, key):
+        """Where (order, key) goes in _ordered"""
+        if not self.descending:
+            return bisect_left(self._ordered, (order, key))
+        # _ordered is descending; bisect its ascending mirror
+        low, high = 0, len(self._ordered)
+        while low < high:
+            middle = (low + high) // 2
+            if self._ordered[middle] > (order, key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def add(self, row):
+        """Add a row, replacing the row with the same key"""
+        key = self.key(row)
+        self.remove(key)
+        order = self.order(row)
+        position = self._position(order, key)
+        slot = self._free_slot(position)
+        self._ordered.insert(position, (order, key))
+        self._slot_order.insert(position, slot)
+        self._slots[key] = slot
+        self._rows[slot] = row
+        self._words[slot] = words(*self.fields(row))
+        for word in self._words[slot]:
+            slots = self._postings.get(word)
+            if slots is None:
+                self._postings[word] = {slot}
+                self._vocabulary.insert(bisect_left(self._vocabulary, word), word)
+            else:
+                slots.add(slot)
+
+    def _free_slot(self, position):
+        """An unused slot between the rows before and at position"""
+        slot_order = self._slot_order
+        if not slot_order:
+            return 0
+        if position == 0:
+            return slot_order[0] - self.SLOT_GAP
+        if position == len(slot_order):
+            return slot_order[-1] + self.SLOT_GAP
+        low, high = slot_order[position - 1], slot_order[position]
+        if high - low < 2:
+            self._spread(position)
+            low, high = slot_order[position - 1], slot_order[position]
+        return (low + high) // 2
+
+    def _spread(self, position):
+        """Give the rows around position evenly spaced slots, leaving room at position"""
+        slot_order = self._slot_order
+        size = 2
+        while True:
+            start = max(0, position - size)
+            end = min(len(slot_order), position + size)
+            # Slots below and above the rows being moved, exclusive
+            low = slot_order[start - 1] if start > 0 else slot_order[0] - self.SLOT_GAP * size
+            high = slot_order[end] if end < len(slot_order) else slot_order[-1] + self.SLOT_GAP * size
+            # The rows and the new one need two slots of room each
+            if high - low >= 2 * (end - start + 2):
+                break
+            size *= 2
+        step = (high - low) // (end - start + 2)
+        moved = [(slot_order[n], low + step * (n - start + 1 + (n >= position))) for n in range(start, end)]
+        # Take the rows out first, so no new slot lands on one still taken
+        taken = [(self._rows.pop(old), self._words.pop(old)) for old, _ in moved]
+        for (old, _), (_, row_words) in zip(moved, taken):
+            for word in row_words:
+                self._postings[word].discard(old)
+        for (_, new), (row, row_words) in zip(moved, taken):
+            self._rows[new] = row
+            self._words[new] = row_words
+            self._slots[self.key(row)] = new
+            for word in row_words:
+                self._postings[word].add(new)
+        slot_order[start:end] = [new for _, new in moved]
+
+    def remove(self, key):
+        """Remove the row with this key; returns False if there was none"""
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+        del self._rows[slot]
+        for word in self._words.pop(slot):
+            slots = self._postings[word]
+            slots.discard(slot)
+            if not slots:
+                del self._postings[word]
+                del self._vocabulary[bisect_left(self._vocabulary, word)]
+        position = bisect_left(self._slot_order, slot)
+        del self._slot_order[position]
+        del self._ordered[position]
+        return True
+
+    def _span(self, term):
+        """(start, end) of the vocabulary words starting with term"""
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, term)
+        # Words starting with term sort below term with its last character bumped
+        return start, bisect_left(vocabulary, term[:-1] + chr(ord(term[-1]) + 1), start)
+
+    def _matching(self, start, end):
+        """Slots of the rows containing any of the vocabulary words in [start, end)"""
+        if end - start == 1:
+            return self._postings[self._vocabulary[start]]
+        return set().union(*(self._postings[word] for word in self._vocabulary[start:end]))
+
+    def _narrow(self, slots, start, end):
+        """The slots whose rows also contain one of the vocabulary words in [start, end)"""
+        postings = [self._postings[word] for word in self._vocabulary[start:end]]
+        # Intersecting touches the smaller set of each pair; filtering tests each row
+        if sum(min(len(slots), len(found)) for found in postings) < self.WALK_COST * len(slots):
+            return set().union(*(slots & found for found in postings))
+        found = set(self._vocabulary[start:end])
+        return {slot for slot in slots if not self._words[slot].isdisjoint(found)}
+
+    def _in_order(self, slots, limit):
+        """Up to limit + 1 of slots in result order"""
+        if limit is None or len(slots) <= limit or len(slots) * self.SORT_FRACTION < len(self._rows):
+            return sorted(slots)
+        # Many matches: the first ones turn up early in the ordered slots
+        return list(islice(filter(slots.__contains__, self._slot_order), limit + 1))
+
+    def _walk(self, spans, limit, budget):
+        """The first limit + 1 matching slots, found by testing the rows in order.
+
+        Returns None when budget rows were tested without finding them all.
+        """
+        vocabulary = self._vocabulary
+        row_words = self._words
+        _, start, end = spans[0]
+        # A one-word term is tested by set membership
+        members = self._postings[vocabulary[start]] if end - start == 1 else None
+        word_sets = [set(vocabulary[start:end]) for _, start, end in spans[members is not None:]]
+
+        def test(slot):
+            return ((members is None or slot in members)
+                    and all(not row_words[slot].isdisjoint(found) for found in word_sets))
+
+        found = list(islice(filter(test, islice(self._slot_order, budget)), limit + 1))
+        if len(found) <= limit and budget < len(self._slot_order):
+            return None
+        return found
+
+    def search(self, query, limit=None):
+        """Find the rows with, for every word of query, a word starting with it.
+
+        Returns (rows, more): the matching rows in order, at most limit of
+        them, and whether more rows match. An empty query matches every row.
+        """
+        vocabulary = self._vocabulary
+        # Narrowest term first, by an upper bound on the rows it matches
+        spans = []
+        for term in words(query):
+            start, end = self._span(term)
+            spans.append((sum(len(self._postings[word]) for word in vocabulary[start:end]), start, end))
+        spans.sort()
+
+        exact = self._slots.get(self._exact_key(query.strip()))
+
+        # Rows expected to match, taking the terms as independent
+        total = len(self._rows)
+        expected = total
+        for count, _, _ in spans:
+            expected *= min(1, count / total)
+
+        # Set elements touched collecting the matches, in rows tested instead
+        budget = sum(count for count, _, _ in spans) // self.WALK_COST
+
+        slots = None
+        if not spans:
+            slots = self._slot_order if limit is None else self._slot_order[:limit + 1]
+        elif limit is not None and expected and limit * total / expected < budget:
+            slots = self._walk(spans, limit, budget)
+            if slots is not None and exact is not None and exact not in slots:
+                slots.insert(0, exact)
+        if slots is None:
+            matches = self._matching(*spans[0][1:])
+            for _, start, end in spans[1:]:
+                matches = self._narrow(matches, start, end)
+            if exact is not None and exact not in matches:
+                matches = matches | {exact}
+            slots = self._in_order(matches, limit)
+
+        more = limit is not None and len(slots) > limit
+        return [self._rows[slot] for slot in slots[:limit]], more
+
+    def _exact_key(self, text):
+        """The key written as text, if a row has it"""
+        for key in (text, int(text) if text.isdigit() else None):
+            if key is not None and key in self._slots:
+                return key
+        return None
@@ -0,0 +1,161 @@
+"""Buffered structured telemetry.
+
+Events are dicts written as JSON lines to config.TELEMETRY_PATH. event()
+only appends to a bounded in-memory queue; a daemon thread drains the
+queue and writes every config.TELEMETRY_FLUSH_INTERVAL seconds, so
+callers never wait on the disk. When the queue is full, events are
+dropped and counted rather than blocking.
+
+Level, sampling and the on/off switch come from config and are applied
+by configure(). While disabled (the default) or below the level,
+event() returns after one comparison; guard any costly field
+computation with enabled_for()::
+
+    from utils import telemetry
+
+    telemetry.event("inventory.view_items", telemetry.DEBUG, rows=len(items))
+"""
+import atexit
+import json
+import queue
+import random
+import threading
+import time
+import config
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR}
+_LEVEL_NAMES = {number: name for name, number in LEVELS.items()}
+
+# Lowest level that is recorded; above every level while disabled
+_threshold = ERROR + 1
+_sample_rate = 1.0
+_queue = None
+_writer = None
+_stats = {'written': 0, 'dropped': 0, 'sampled_out': 0}
+
+
+def enabled_for(level):
+    """Check whether events of this level are recorded"""
+    return level >= _threshold
+
+
+def event(name, level=INFO, **fields):
+    """Record an event with JSON-serialisable fields"""
+    if level < _threshold:
+        return
+    if level < WARNING and _sample_rate < 1.0 and random.random() >= _sample_rate:
+        _stats['sampled_out'] += 1
+        return
+
+    record = {
+        'ts': round(time.time() * 1000),
+        'level': _LEVEL_NAMES.get(level, str(level)),
+        'event': name,
+        'thread': threading.current_thread().name,
+    }
+    record.update(fields)
+    try:
+        _queue.put_nowait(record)
+    except queue.Full:
+        _stats['dropped'] += 1
+    except AttributeError:
+        # Disabled by another thread since the level check
+        pass
+
+
+class _Writer(threading.Thread):
+    """Drains the event queue to the log file every interval, or when woken"""
+
+    def __init__(self, events, path, interval):
+        super().__init__(name="telemetry-writer", daemon=True)
+        self.events = events
+        self.path = path
+        self.interval = interval
+        self.wake = threading.Event()
+        self.stopping = False
+
+    def run(self):
+        with open(self.path, 'a', encoding='utf-8') as log:
+            while True:
+                self.wake.wait(self.interval)
+                self.wake.clear()
+                stopping = self.stopping
+
+                batch = []
+                try:
+                    while True:
+                        batch.append(self.events.get_nowait())
+                except queue.Empty:
+                    pass
+
+                if batch:
+                    log.write("".join(json.dumps(record, ensure_ascii=False, default=str) + "\n"
+                                      for record in batch))
+                    log.flush()
+                    _stats['written'] += len(batch)
+                    for _ in batch:
+                        self.events.task_done()
+                if stopping:
+                    return
+
+
+def configure(enabled=None, level=None, sample_rate=None, path=None, queue_size=None, flush_interval=None):
+    """Apply telemetry settings; arguments left as None are read from config.
+
+    Restarts the writer thread, after writing out anything still queued.
+    """
+    global _threshold, _sample_rate, _queue, _writer
+
+    enabled = config.TELEMETRY_ENABLED if enabled is None else enabled
+    level = config.TELEMETRY_LEVEL if level is None else level
+    sample_rate = config.TELEMETRY_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    _threshold = ERROR + 1
+    shutdown()
+    if not enabled:
+        return
+
+    _sample_rate = sample_rate
+    _queue = queue.Queue(maxsize=config.TELEMETRY_QUEUE_SIZE if queue_size is None else queue_size)
+    _writer = _Writer(
+        _queue,
+        config.TELEMETRY_PATH if path is None else path,
+        config.TELEMETRY_FLUSH_INTERVAL if flush_interval is None else flush_interval,
+    )
+    _writer.start()
+    _threshold = LEVELS[level] if isinstance(level, str) else level
+
+
+def flush():
+    """Block until every queued event has been written"""
+    events, writer = _queue, _writer
+    if events is not None and writer is not None and writer.is_alive():
+        writer.wake.set()
+        events.join()
+
+
+def shutdown():
+    """Stop recording, write out queued events and stop the writer thread"""
+    global _threshold, _queue, _writer
+
+    _threshold = ERROR + 1
+    if _writer is not None:
+        _writer.stopping = True
+        _writer.wake.set()
+        _writer.join()
+    _queue = None
+    _writer = None
+
+
+def stats():
+    """Counts of events written, dropped on a full queue and sampled out"""
+    return dict(_stats)
+
+
+atexit.register(shutdown)
+configure()